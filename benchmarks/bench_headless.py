@@ -0,0 +1,73 @@
+"""Headless end-to-end benchmark of VirtualPiano.update_loop.
+
+Replays a recorded video through MediaPipe, or a synthetic strike script
+through scripted hands, with no camera, window or audio device. Reports
+sustained FPS, per-stage timings and the notes triggered; ``--output`` writes
+the report as JSON so results can be compared across releases.
+``--allocations`` traces memory allocated per frame with ``tracemalloc``.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_headless                 # synthetic
+    python -m benchmarks.bench_headless --video hands.mp4
+    python -m benchmarks.bench_headless --allocations
+"""
+
+import argparse
+import json
+
+from playground.headless import (
+    ScriptedHands,
+    SyntheticFrameSource,
+    VideoFileSource,
+    run_headless,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--video", help="video file to replay instead of synthetic")
+    parser.add_argument("--frames", type=int, default=600, help="synthetic frames")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument(
+        "--allocations", action="store_true", help="report allocations per frame"
+    )
+    parser.add_argument("--output", help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    if args.video:
+        source = VideoFileSource(args.video)
+        report = run_headless(source, trace_allocations=args.allocations)
+    else:
+        source = SyntheticFrameSource(args.width, args.height, args.frames)
+        report = run_headless(
+            source, ScriptedHands(), trace_allocations=args.allocations
+        )
+
+    print(f"frames: {report['frames']}  fps: {report['fps']:.1f}")
+    print(f"{'stage':>16} {'p50':>8} {'p95':>8} {'p99':>8}  (ms)")
+    for stage, stats in report["stages"].items():
+        print(
+            f"{stage:>16} {stats['p50_ms']:8.3f} {stats['p95_ms']:8.3f} "
+            f"{stats['p99_ms']:8.3f}"
+        )
+    print(f"notes ({len(report['notes'])}):", " ".join(n for _, n in report["notes"]))
+    if "allocations" in report:
+        a = report["allocations"]
+        print(
+            f"allocated per frame (KB): p50 {a['p50_kb']:.1f}  p95 {a['p95_kb']:.1f}"
+            f"  p99 {a['p99_kb']:.1f}  max {a['max_kb']:.1f}"
+        )
+        print(
+            f"frames allocating a full image: {a['frames_allocating_images']} of "
+            f"{a['frames']}  retained: {a['retained_kb']:.1f} KB  "
+            f"gc collections: {a['gc_collections']}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark KeyLayout hit testing against the original per-key Python loop.
+
+The "config" row is the keyboard in ``CONFIG["keys"]`` on a 1280x720 frame.
+Up to ``KeyLayout.SMALL_LAYOUT`` keys the layout runs a loop too, so the
+difference there is the cost of its bookkeeping; above it the hit test is
+batched with numpy.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_key_layout
+"""
+
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from config.config import CONFIG
+from playground.key_layout import KeyLayout
+
+KEY_COUNTS = (7, 61, 88)
+FRAME = (1280, 720)
+POINT_COUNTS = (1, 2, 10)  # one finger, two hands, ten fingers
+ITERATIONS = 2000
+THRESHOLD = 1000.0
+
+
+def build_keys(count: int) -> List[Tuple[Tuple[int, int], Tuple[int, int], str]]:
+    """Lay out ``count`` keys in a row, every other one black."""
+    keys = []
+    for i in range(count):
+        black = i % 2 == 1
+        pos = (20 * i, 300 if black else 320)
+        size = (12, 60) if black else (20, 100)
+        keys.append((pos, size, "black" if black else "white"))
+    return keys
+
+
+def config_keys() -> List[Tuple[Tuple[int, int], Tuple[int, int], str]]:
+    """The configured keyboard, placed the way ``Piano`` places it."""
+    w, h = FRAME
+    return [
+        (
+            (int(w * key["pos"][0]), int(h * key["pos"][1])),
+            (int(key["size"][0]), int(key["size"][1])),
+            key["type"],
+        )
+        for key in CONFIG["keys"]
+    ]
+
+
+def python_loop(keys, last_hit, points, velocities, now) -> int:
+    """Reference implementation mirroring the original Piano.interact loop."""
+    hits = 0
+    for (x, y), vel in zip(points, velocities, strict=True):
+        for wanted in ("black", "white"):
+            hit = False
+            for i, ((x0, y0), (w, h), key_type) in enumerate(keys):
+                if key_type != wanted:
+                    continue
+                if x0 <= x <= x0 + w and y0 <= y <= y0 + h and vel > THRESHOLD:
+                    if now - last_hit[i] > 0.3:
+                        last_hit[i] = now
+                        hits += 1
+                        hit = True
+                        break
+            if hit:
+                break
+    return hits
+
+
+def bench(keys, point_count: int) -> Tuple[float, float]:
+    key_count = len(keys)
+    layout = KeyLayout(key_count)
+    for pos, size, key_type in keys:
+        layout.add(pos, size, key_type, 0.3)
+    rng = np.random.default_rng(0)
+    # Anywhere over the keyboard, plus a 20 px margin
+    x0 = min(pos[0] for pos, _, _ in keys) - 20
+    y0 = min(pos[1] for pos, _, _ in keys) - 20
+    x1 = max(pos[0] + size[0] for pos, size, _ in keys) + 20
+    y1 = max(pos[1] + size[1] for pos, size, _ in keys) + 20
+    points = np.column_stack(
+        (rng.integers(x0, x1, point_count), rng.integers(y0, y1, point_count))
+    )
+    velocities = rng.uniform(0, 2000, point_count)
+    point_tuples = [tuple(int(v) for v in p) for p in points]
+    vel_list = velocities.tolist()
+
+    last_hit = [0.0] * key_count
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        python_loop(keys, last_hit, point_tuples, vel_list, float(i))
+    loop_us = (time.perf_counter() - start) / ITERATIONS * 1e6
+
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        layout.hit_test(points, velocities, float(i), THRESHOLD)
+    batch_us = (time.perf_counter() - start) / ITERATIONS * 1e6
+    return loop_us, batch_us
+
+
+def main() -> None:
+    layouts = [("config", config_keys())] + [
+        (str(count), build_keys(count)) for count in KEY_COUNTS
+    ]
+    print(f"{'keys':>6} {'points':>6} {'loop (us)':>10} {'layout (us)':>12}")
+    for label, keys in layouts:
+        for point_count in POINT_COUNTS:
+            loop_us, layout_us = bench(keys, point_count)
+            print(f"{label:>6} {point_count:>6} {loop_us:>10.1f} {layout_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
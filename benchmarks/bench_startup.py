@@ -0,0 +1,78 @@
+"""Startup-time benchmark: importing the app and every setup phase.
+
+Reports the import time, the start and end of each ``VirtualPiano.setup``
+phase (overlapping phases run at the same time), the whole setup, and the
+first processed frame. ``sequential`` is what the phases would take one
+after another. Run each measurement in a fresh interpreter, from the
+repository root::
+
+    python -m benchmarks.bench_startup                  # synthetic camera
+    python -m benchmarks.bench_startup --camera --audio
+    python -m benchmarks.bench_startup --scripted       # no MediaPipe
+"""
+
+import argparse
+import json
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--camera", action="store_true", help="open the real camera")
+    parser.add_argument("--audio", action="store_true", help="open the audio device")
+    parser.add_argument(
+        "--scripted", action="store_true", help="scripted hands instead of MediaPipe"
+    )
+    parser.add_argument("--output", help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    # Imported here, so the import itself is measured
+    start = time.perf_counter()
+    from playground.virtual_piano import VirtualPiano
+
+    imported = time.perf_counter() - start
+
+    from playground.display import NullDisplay
+    from playground.headless import ScriptedHands, SyntheticFrameSource
+
+    app = VirtualPiano(
+        source=None if args.camera else SyntheticFrameSource(),
+        display=NullDisplay(),
+        hands=ScriptedHands() if args.scripted else None,
+        audio_output=args.audio,
+        pipelined=False,
+    )
+    start = time.perf_counter()
+    try:
+        app.setup()
+        setup = time.perf_counter() - start
+        app.update_loop()
+        first_frame = time.perf_counter() - start
+    finally:
+        app.cleanup()
+
+    phases = app.startup.report()
+    report = {
+        "import": imported,
+        "phases": phases,
+        "sequential": sum(phase["seconds"] for phase in phases.values()),
+        "setup": setup,
+        "first_frame": first_frame,
+    }
+    print(f"{'import':>12} {imported * 1000:8.1f} ms")
+    print(f"{'phase':>12} {'start':>8} {'end':>8} {'ms':>8}")
+    for name, phase in phases.items():
+        print(
+            f"{name:>12} {phase['start'] * 1000:8.1f} {phase['end'] * 1000:8.1f} "
+            f"{phase['seconds'] * 1000:8.1f}"
+        )
+    print(f"{'sequential':>12} {report['sequential'] * 1000:8.1f} ms")
+    print(f"{'setup':>12} {setup * 1000:8.1f} ms")
+    print(f"{'first frame':>12} {first_frame * 1000:8.1f} ms")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Scaling benchmark of the multi-station runner.
+
+Runs 1 to ``--stations`` synthetic stations on one shared audio engine (and,
+with ``--backend process``, one shared inference pool) and reports the frame
+rate of each station as stations are added. With enough cores the
+per-station rate should stay flat; the efficiency column is the mean
+per-station rate relative to a single station. With the process backend
+(the default, as in ``playground.stations``) the synthetic cameras deliver
+``--fps`` frames per second, and the rate is the frames that made it
+through inference. The thread backend runs as fast as it can and shows the
+GIL limit: per-station rate falls as stations are added.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_stations --stations 4
+    python -m benchmarks.bench_stations --stations 4 --backend thread
+"""
+
+import argparse
+import json
+
+from playground.headless import SyntheticFrameSource, run_stations_headless
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stations", type=int, default=4, help="max stations")
+    parser.add_argument("--frames", type=int, default=300, help="frames per station")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--backend", choices=("thread", "process"), default="process")
+    parser.add_argument("--workers", type=int, default=2, help="process backend")
+    parser.add_argument("--fps", type=float, default=60.0, help="process backend")
+    parser.add_argument("--output", help="write the JSON reports to this path")
+    args = parser.parse_args()
+
+    reports = []
+    print(f"{'stations':>8} {'fps/station':>12} {'min':>8} {'total':>8} {'eff':>6}")
+    for count in range(1, args.stations + 1):
+        sources = [
+            SyntheticFrameSource(
+                args.width,
+                args.height,
+                args.frames,
+                args.fps,
+                realtime=args.backend == "process",
+            )
+            for _ in range(count)
+        ]
+        report = run_stations_headless(
+            sources, backend=args.backend, workers=args.workers
+        )
+        reports.append(report)
+        rates = [station["fps"] for station in report["per_station"]]
+        mean = sum(rates) / len(rates)
+        baseline = reports[0]["total_fps"]
+        # No frame may reach inference before a short run ends
+        efficiency = f"{mean / baseline:6.0%}" if baseline else f"{'-':>6}"
+        print(
+            f"{count:8d} {mean:12.1f} {min(rates):8.1f} "
+            f"{report['total_fps']:8.1f} {efficiency}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,15 @@ CONFIG = {
     "key_cooldown": 0.3,
     "volume": 0.5,
     "sensitivity": 1000,
+    "audio": {
+        "sample_rate": 44100,
+        "buffer_size": 256,  # frames per block; lower = less latency
+        "voices": 32,
+        "steal": "oldest",  # or "quietest"
+    },
+    "sound_bank": {
+        "max_bytes": 64 * 1024 * 1024,  # budget for decoded samples
+    },
     "keys": [
         {
             "name": "C4",
@@ -15,7 +24,7 @@ CONFIG = {
             "name": "C#4",
             "pos": (0.25, 0.65),
             "size": (30, 60),
-            "sound": "sounds/piano_cs4(fake).wav",
+            "sound": None,  # pitch-shifted from the nearest sample
             "type": "black",
         },
         {
@@ -29,7 +38,7 @@ CONFIG = {
             "name": "D#4",
             "pos": (0.35, 0.65),
             "size": (30, 60),
-            "sound": "sounds/piano_ds4(fake).wav",
+            "sound": None,  # pitch-shifted from the nearest sample
             "type": "black",
         },
         {
@@ -55,6 +64,17 @@ CONFIG = {
         },
     ],
     "calibration_mode": False,
+    "auto_calibration": {
+        "enabled": True,
+        "on_start": False,  # look for the sheet as soon as the app opens
+        "dictionary": "DICT_4X4_50",
+        "sheet_size": (1600, 600),  # sheet pixels; prints at any scale
+        "marker_size": 120,
+        "margin": 20,
+        "black_key_size": (0.6, 0.6),  # fraction of white key width, height
+        "min_markers": 3,
+        "timeout": 1.0,  # s to keep looking for the sheet
+    },
     "camera_index": 0,
     "hands_config": {
         "max_num_hands": 2,
@@ -62,6 +82,112 @@ CONFIG = {
         "min_tracking_confidence": 0.7,
     },
     "fps": 60,
+    # Trades hand tracking quality for speed to hold the target frame rate;
+    # not available with the "process" pipeline backend
+    "quality_governor": {
+        "enabled": False,
+        "target_fps": None,  # None: "fps" above
+        "window": 30,  # frames whose p90 work time is compared to the budget
+        "hold": 60,  # frames between changes
+        "downgrade_at": 1.0,  # p90 above this share of the budget: cheaper
+        "upgrade_at": 0.6,  # p90 below this share of the budget: better
+        "start_level": 1,
+        # Best to cheapest; max_side limits the image given to MediaPipe (0:
+        # full size), the rest override "hands_config"
+        "levels": [
+            {"model_complexity": 1, "max_side": 0, "min_tracking_confidence": 0.7},
+            {"model_complexity": 1, "max_side": 640, "min_tracking_confidence": 0.7},
+            {"model_complexity": 0, "max_side": 640, "min_tracking_confidence": 0.7},
+            {"model_complexity": 0, "max_side": 480, "min_tracking_confidence": 0.5},
+            {"model_complexity": 0, "max_side": 320, "min_tracking_confidence": 0.5},
+        ],
+    },
+    "frame_pacing": {
+        "executor": True,  # run update_loop off the event loop
+        "skip_render_when_behind": True,  # hit detection still runs
+        "max_lag_frames": 4,  # drop missed deadlines beyond this
+    },
+    "pipeline": {
+        "enabled": True,
+        "backend": "thread",  # or "process": hand inference in worker processes
+        "workers": 2,  # inference processes for the "process" backend
+        # Backend for two or more stations: with "thread" they share one GIL
+        # and each station slows down as stations are added
+        "station_backend": "process",
+        "reply_timeout": 2.0,  # s before a frame lost by a worker is skipped
+        "frame_timeout": 0.1,  # max wait (s) for a new processed frame
+        "source_timeout": 2.0,  # failed camera reads (s) before giving up
+    },
+    "display": {
+        "preview": True,  # False: no window or drawing at all (quit with Ctrl+C)
+        "max_fps": 30,  # preview rate, independent of the processing rate
+        "threaded": True,  # imshow/waitKey on their own thread
+    },
+    "tracking": {
+        "fingertips": [4, 8, 12, 16, 20],  # MediaPipe landmarks that can hit keys
+        "max_distance": 200,  # px a hand may move between frames and keep its id
+        "timeout": 0.3,  # s before a lost hand's id is dropped
+        "min_cutoff": 1.0,  # One-Euro filter parameters
+        "beta": 0.05,
+        "d_cutoff": 10.0,
+        "predictive_onset": True,  # fire up to one frame early on fast strikes
+    },
+    "roi": {
+        "enabled": True,
+        "margin": 0.15,  # fraction of the frame added around keys and hands
+        "max_side": 640,  # downscale crops larger than this (px)
+        "full_frame_interval": 10,  # full-frame probe period while no hands
+    },
+    "motion_gate": {
+        "enabled": True,
+        "margin": 0.1,  # fraction of the frame added around the keys
+        "size": 96,  # px, longest side of the downscaled keyboard region
+        "pixel_threshold": 12,  # grey-level change that counts as motion
+        "min_pixels": 2,  # changed pixels needed to run inference
+        "max_skip": 15,  # run inference at least every this many frames
+    },
+    "instrumentation": {
+        "enabled": False,
+        "hud": False,  # toggle at runtime with 'h'
+        "capacity": 1024,  # samples kept per stage
+        "export_path": "stats.json",  # .json or .csv, written at exit
+    },
+    "recording": {
+        "path": "recordings/session-{timestamp}.vprec",
+        "flush_interval": 0.25,  # s between batched writes to disk
+        "export_midi": True,  # also write a .mid next to each recording
+    },
+    "playback": {
+        "lookahead": 0.1,  # s of events read ahead of the play position
+        "spin": 0.002,  # s busy-waited before each deadline
+        "tempo": 1.0,
+        "loop": False,
+        "loop_gap": 0.5,  # s after the last note before looping back
+    },
+    # Note velocity from hit speed: "min" at the sensitivity threshold, up
+    # to 1.0 at "full_speed" (px/s)
+    "dynamics": {
+        "min": 0.3,
+        "full_speed": 4000,
+    },
+    # Note events to an external synth ("python -m playground.note_output
+    # --listen 9000" prints them)
+    "note_output": {
+        "enabled": False,
+        "protocol": "osc",  # or "midi" (raw note messages over UDP)
+        "host": "127.0.0.1",
+        "port": 9000,
+        "address": "/piano",  # OSC address prefix
+        "channel": 0,  # MIDI channel, 0-15
+        "note_length": 0.5,  # s from note-on to note-off
+        "local_audio": True,  # also play the samples
+    },
+    # Cameras for "python -m playground.stations"; each gets its own window
+    # and keyboard ("keys" defaults to the list above)
+    "stations": [
+        {"name": "Station 1", "source": 0},
+        {"name": "Station 2", "source": 1},
+    ],
     "recording_mode": False,
     "playback_mode": False,
 }
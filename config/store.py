@@ -0,0 +1,82 @@
+import threading
+from typing import Callable, List, NamedTuple
+
+from config.config import CONFIG
+
+
+class ConfigSnapshot(NamedTuple):
+    """Immutable view of the settings that change while the app runs."""
+
+    version: int
+    volume: float
+    sensitivity: float
+    hit_velocity_threshold: float
+    calibration_mode: bool
+    recording_mode: bool
+    playback_mode: bool
+
+
+Subscriber = Callable[[ConfigSnapshot], None]
+
+
+class ConfigStore:
+    """Publishes a new ``ConfigSnapshot`` whenever a runtime setting changes.
+
+    Readers take ``store.snapshot`` once (a single attribute read, safe from
+    any thread) and use its fields for the rest of the frame. Writers call
+    ``update``, which swaps in a new snapshot with the version bumped, mirrors
+    the values into the ``CONFIG`` dict, and then notifies subscribers so they
+    can rebuild any state derived from the changed settings.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        self._lock = threading.Lock()
+        self._subscribers: List[Subscriber] = []
+        self.snapshot = ConfigSnapshot(
+            0, *(config[field] for field in ConfigSnapshot._fields[1:])
+        )
+
+    @property
+    def version(self) -> int:
+        return self.snapshot.version
+
+    def update(self, **changes) -> ConfigSnapshot:
+        """Apply ``changes`` and publish the new snapshot."""
+        unknown = set(changes) - set(ConfigSnapshot._fields[1:])
+        if unknown:
+            raise KeyError(f"Not a runtime setting: {', '.join(sorted(unknown))}")
+        with self._lock:
+            current = self.snapshot
+            if all(getattr(current, k) == v for k, v in changes.items()):
+                return current
+            snapshot = current._replace(version=current.version + 1, **changes)
+            self.config.update(changes)
+            self.snapshot = snapshot
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(snapshot)
+        return snapshot
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Call ``callback(snapshot)`` after every change; returns an unsubscriber."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def local_copy(self) -> "ConfigStore":
+        """A new store starting from the current settings, changed on its own.
+
+        Its ``config`` is a private dict, so its updates never reach ``CONFIG``
+        or this store's subscribers.
+        """
+        return ConfigStore(self.snapshot._asdict())
+
+
+STORE = ConfigStore(CONFIG)
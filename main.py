@@ -1,6 +1,8 @@
 import asyncio
 import platform
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from playground.frame_scheduler import FrameScheduler
 from playground.virtual_piano import VirtualPiano
 from config.config import CONFIG
 
@@ -14,17 +16,42 @@ logger = logging.getLogger(__name__)
 async def main():
     """Main async function for Pyodide compatibility."""
     app = VirtualPiano()
+    pacing = CONFIG["frame_pacing"]
+    scheduler = FrameScheduler(CONFIG["fps"], pacing["max_lag_frames"])
+    # Blocking work (camera, MediaPipe, OpenCV window) runs on one dedicated
+    # thread so the event loop stays free; Pyodide has no threads.
+    executor = None
+    if pacing["executor"] and platform.system() != "Emscripten":
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame")
+    loop = asyncio.get_running_loop()
+
+    async def run(func, *args):
+        if executor is None:
+            return func(*args)
+        return await loop.run_in_executor(executor, func, *args)
+
     try:
-        app.setup()
+        # The window shows the loading screen while startup phases overlap
+        await run(app.setup, app.show_loading)
         while True:
-            app.update_loop()
-            await asyncio.sleep(1.0 / CONFIG["fps"])
+            render = not (pacing["skip_render_when_behind"] and scheduler.behind())
+            await run(app.update_loop, render)
+            await scheduler.wait()
+            app.instrumentation.lap("sleep")
     except SystemExit:
         pass
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
     finally:
-        app.cleanup()
+        await run(app.cleanup)
+        if executor:
+            executor.shutdown()
+        report = scheduler.report()
+        logger.info(
+            f"Frame rate: {report['achieved_fps']:.1f} fps achieved of "
+            f"{report['target_fps']:.0f} target, "
+            f"{report['renders_skipped']} renders skipped."
+        )
 
 
 if platform.system() == "Emscripten":
@@ -0,0 +1,248 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from playground.instrumentation import Instrumentation
+from playground.sound_bank import LOAD_ERRORS, SoundBank
+
+logger = logging.getLogger(__name__)
+
+STEAL_POLICIES = ("oldest", "quietest")
+
+
+class Voice:
+    """One playing sample in the engine's fixed voice pool."""
+
+    __slots__ = ("note", "samples", "position", "gain", "started")
+
+    def __init__(self):
+        self.note: Optional[str] = None
+        self.samples: Optional[np.ndarray] = None
+        self.position = 0
+        self.gain = 0.0
+        self.started = 0  # sequence number of the note-on, for stealing
+
+    @property
+    def active(self) -> bool:
+        return self.samples is not None
+
+    def stop(self) -> None:
+        self.note = None
+        self.samples = None
+        self.position = 0
+
+
+class AudioEngine:
+    """Polyphonic software mixer with a fixed voice pool.
+
+    ``note_on`` looks the note's buffer up in the sample bank and enqueues
+    it, so the audio thread never decodes. The keys' samples are preloaded
+    (and pinned) during setup, so for them this is a lookup; any other note
+    is decoded on the caller's thread on its first use. Each call to ``render`` starts pending notes, mixes every
+    active voice into preallocated buffers and returns one block of int16
+    audio. When all voices are busy, a voice is stolen deterministically: the
+    oldest one, or the quietest one (ties broken by age). ``start`` streams
+    blocks to a dedicated pygame mixer channel from a background thread,
+    writing them into a few ``Sound``s created once and used in turn.
+
+    pygame only reports a finished block through its event queue, so the
+    output thread polls the channel every ``poll_interval`` (a quarter
+    block, about 1.5 ms at 256 frames and 44.1 kHz). A block is therefore
+    handed over up to one poll interval late: the output latency is the
+    device buffer, plus up to two blocks (the one playing and the one
+    queued), plus at most one poll interval.
+    """
+
+    def __init__(
+        self,
+        sound_bank: SoundBank,
+        voices: int = 32,
+        buffer_size: int = 256,
+        steal: str = "oldest",
+        volume: float = 1.0,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        if steal not in STEAL_POLICIES:
+            raise ValueError(f"Unknown voice stealing policy: {steal}")
+        self.sound_bank = sound_bank
+        self.sample_rate = sound_bank.sample_rate
+        self.channels = sound_bank.channels
+        self.buffer_size = buffer_size
+        self.steal = steal
+        self.volume = volume
+        self.instrumentation = instrumentation or Instrumentation()
+        self.voices: List[Voice] = [Voice() for _ in range(voices)]
+        self.notes_started = 0
+        self.voices_stolen = 0
+        # Hit-to-output latency (s) of recent notes
+        self.latencies: deque = deque(maxlen=1024)
+        self.poll_interval = self.block_duration / 4
+
+        self._pending: deque = deque()  # (note, samples, velocity, hit time)
+        self._mix = np.zeros((buffer_size, self.channels), dtype=np.float32)
+        self._scratch = np.zeros((buffer_size, self.channels), dtype=np.float32)
+        self._out = np.zeros((buffer_size, self.channels), dtype=np.int16)
+        self._block_onsets: List[float] = []
+        self._mixer: Any = None  # pygame.mixer, imported by start()
+        self._channel: Any = None
+        self._blocks: List[Any] = []  # (Sound, int16 view of its samples)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    @property
+    def block_duration(self) -> float:
+        return self.buffer_size / self.sample_rate
+
+    def note_on(
+        self, note: str, velocity: float = 1.0, timestamp: Optional[float] = None
+    ) -> None:
+        """Queue a note to start at the next rendered block.
+
+        The note's buffer is fetched here, decoding it if the bank does not
+        hold it. ``timestamp`` is the ``time.monotonic()`` of the hit, used to
+        measure hit-to-output latency; it defaults to now.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        try:
+            samples = self.sound_bank.buffer(note)
+        except LOAD_ERRORS as e:
+            logger.error(f"Error loading sample for {note}: {e}", exc_info=True)
+            return
+        self._pending.append((note, samples, velocity, timestamp))
+
+    def all_notes_off(self) -> None:
+        """Silence every voice and drop pending notes."""
+        self._pending.clear()
+        for voice in self.voices:
+            voice.stop()
+
+    def render(self) -> np.ndarray:
+        """Mix the next block. The returned array is reused between calls."""
+        self._block_onsets.clear()
+        while self._pending:
+            note, samples, velocity, hit_time = self._pending.popleft()
+            self._start_voice(note, samples, velocity)
+            self._block_onsets.append(hit_time)
+
+        mix = self._mix
+        mix.fill(0.0)
+        frames = self.buffer_size
+        for voice in self.voices:
+            if voice.samples is None:
+                continue
+            start = voice.position
+            n = min(len(voice.samples) - start, frames)
+            scratch = self._scratch[:n]
+            np.multiply(voice.samples[start : start + n], voice.gain, out=scratch)
+            mix[:n] += scratch
+            voice.position += n
+            if voice.position >= len(voice.samples):
+                voice.stop()
+
+        np.multiply(mix, self.volume * 32767.0, out=mix)
+        np.clip(mix, -32768.0, 32767.0, out=mix)
+        self._out[:] = mix
+        return self._out
+
+    def _start_voice(self, note: str, samples: np.ndarray, velocity: float) -> None:
+        voice = self._allocate_voice()
+        self.notes_started += 1
+        voice.note = note
+        voice.samples = samples
+        voice.position = 0
+        voice.gain = max(0.0, min(1.0, velocity))
+        voice.started = self.notes_started
+
+    def _allocate_voice(self) -> Voice:
+        for voice in self.voices:
+            if not voice.active:
+                return voice
+        self.voices_stolen += 1
+        if self.steal == "quietest":
+            return min(self.voices, key=lambda v: (v.gain, v.started))
+        return min(self.voices, key=lambda v: v.started)
+
+    def start(self) -> None:
+        """Open the output device and start streaming blocks."""
+        if self._running:
+            return
+        # Imported here so pygame does not slow down importing the app
+        from pygame import mixer, sndarray
+
+        mixer.init(
+            frequency=self.sample_rate,
+            size=-16,
+            channels=self.channels,
+            buffer=self.buffer_size,
+        )
+        self._mixer = mixer
+        self._channel = mixer.Channel(0)
+        # One block playing, one queued behind it and one being rendered
+        sounds = [mixer.Sound(buffer=self._out) for _ in range(3)]
+        self._blocks = [(sound, sndarray.samples(sound)) for sound in sounds]
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._output_loop, name="audio", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Audio engine started: {len(self.voices)} voices, "
+            f"{self.buffer_size} frames/block "
+            f"({self.block_duration * 1000:.1f} ms)."
+        )
+
+    def stop(self) -> None:
+        """Stop streaming and close the output device."""
+        if not self._running:
+            return
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.all_notes_off()
+        self._blocks = []
+        self._mixer.quit()
+        logger.info("Audio engine stopped.")
+
+    def _output_loop(self) -> None:
+        # Keep exactly one block queued behind the one playing, so the output
+        # latency stays at about two blocks plus the device buffer (and one
+        # poll interval; see the class docstring).
+        poll = self.poll_interval
+        index = 0
+        while self._running:
+            channel = self._channel
+            if channel.get_busy() and channel.get_queue() is not None:
+                time.sleep(poll)
+                continue
+            # Neither playing nor queued: the other two are
+            block, samples = self._blocks[index]
+            index = (index + 1) % len(self._blocks)
+            np.copyto(samples, self.render().reshape(samples.shape))
+            handoff = time.monotonic()
+            if channel.get_busy():
+                channel.queue(block)
+                # Starts once the currently playing block finishes
+                audible = handoff + self.block_duration
+            else:
+                channel.play(block)
+                audible = handoff
+            for hit_time in self._block_onsets:
+                self.latencies.append(audible - hit_time)
+                self.instrumentation.record("hit_to_sound", audible - hit_time)
+
+    def latency_stats(self) -> Dict[str, float]:
+        """Mean/p95/max hit-to-output latency in milliseconds."""
+        if not self.latencies:
+            return {}
+        values = np.array(self.latencies) * 1000.0
+        return {
+            "mean_ms": float(values.mean()),
+            "p95_ms": float(np.percentile(values, 95)),
+            "max_ms": float(values.max()),
+        }
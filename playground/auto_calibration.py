@@ -0,0 +1,301 @@
+"""Automatic key calibration from a printed keyboard sheet.
+
+The sheet has an ArUco marker in each corner and the keys drawn between
+them. Print it with::
+
+    python -m playground.auto_calibration sheet.png
+"""
+
+import argparse
+import logging
+import threading
+import time
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from config.config import CONFIG
+from playground.pipeline import LatestQueue
+
+logger = logging.getLogger(__name__)
+
+# Marker ids at the sheet's top-left, top-right, bottom-right, bottom-left
+MARKER_IDS = (0, 1, 2, 3)
+
+
+class Calibration(NamedTuple):
+    """Key geometry found in one camera frame."""
+
+    homography: np.ndarray  # 3x3, sheet pixels -> frame pixels
+    quads: np.ndarray  # (N, 4, 2) float32 key corners in frame pixels
+    label_map: np.ndarray  # (2, h, w) int16 white/black key index, -1 for none
+    markers: int  # number of markers used
+    seconds: float  # time taken to compute
+
+
+class KeyboardSheet:
+    """Geometry of the printed sheet, in sheet pixels.
+
+    Markers of side ``marker_size`` sit ``margin`` from each corner, and the
+    keyboard fills the area between the left and right marker columns. White
+    keys split that area evenly; each black key is centered on the boundary
+    between its neighbours and takes ``black_key_size`` (fraction of a white
+    key's width, fraction of the height).
+    """
+
+    def __init__(
+        self,
+        key_types: Sequence[str],
+        size: Tuple[int, int] = (1600, 600),
+        marker_size: int = 120,
+        margin: int = 20,
+        black_key_size: Tuple[float, float] = (0.6, 0.6),
+    ):
+        self.key_types = list(key_types)
+        self.size = size
+        self.marker_size = marker_size
+        self.margin = margin
+        self.black_key_size = black_key_size
+
+    def marker_corners(self) -> dict:
+        """Corners (TL, TR, BR, BL) of every marker, by marker id."""
+        w, h = self.size
+        s, m = self.marker_size, self.margin
+        origins = [(m, m), (w - m - s, m), (w - m - s, h - m - s), (m, h - m - s)]
+        return {
+            marker_id: np.array(
+                [(x, y), (x + s, y), (x + s, y + s), (x, y + s)], dtype=np.float32
+            )
+            for marker_id, (x, y) in zip(MARKER_IDS, origins, strict=True)
+        }
+
+    def keyboard_rect(self) -> Tuple[float, float, float, float]:
+        w, h = self.size
+        inset = 2 * self.margin + self.marker_size
+        return (inset, self.margin, w - inset, h - self.margin)
+
+    def key_quads(self) -> np.ndarray:
+        """``(N, 4, 2)`` key corners (TL, TR, BR, BL) in sheet pixels."""
+        x0, y0, x1, y1 = self.keyboard_rect()
+        whites = max(1, sum(t == "white" for t in self.key_types))
+        unit = (x1 - x0) / whites
+        black_w, black_h = self.black_key_size
+        quads = np.zeros((len(self.key_types), 4, 2), dtype=np.float32)
+        white_index = 0
+        for index, key_type in enumerate(self.key_types):
+            if key_type == "white":
+                left, right = x0 + white_index * unit, x0 + (white_index + 1) * unit
+                bottom = y1
+                white_index += 1
+            else:
+                center = x0 + white_index * unit
+                left, right = center - black_w * unit / 2, center + black_w * unit / 2
+                bottom = y0 + black_h * (y1 - y0)
+            quads[index] = [(left, y0), (right, y0), (right, bottom), (left, bottom)]
+        return quads
+
+    def render(self, dictionary) -> np.ndarray:
+        """Printable grayscale image of the sheet."""
+        w, h = self.size
+        image = np.full((h, w), 255, dtype=np.uint8)
+        for marker_id, corners in self.marker_corners().items():
+            x, y = corners[0].astype(int)
+            image[y : y + self.marker_size, x : x + self.marker_size] = (
+                cv2.aruco.generateImageMarker(dictionary, marker_id, self.marker_size)
+            )
+        quads = self.key_quads().round().astype(np.int32)
+        for quad, key_type in zip(quads, self.key_types, strict=True):
+            if key_type == "white":
+                cv2.polylines(image, [quad], True, 0, 3)
+        for quad, key_type in zip(quads, self.key_types, strict=True):
+            if key_type != "white":
+                cv2.fillPoly(image, [quad], 0)
+        return image
+
+
+def get_dictionary(name: str):
+    return cv2.aruco.getPredefinedDictionary(getattr(cv2.aruco, name))
+
+
+def label_map(
+    quads: np.ndarray, key_types: Sequence[str], shape: Tuple[int, int]
+) -> np.ndarray:
+    """Rasterize key quads into per-pixel key index maps.
+
+    Returns a ``(2, h, w)`` array: plane 0 holds the white keys and plane 1
+    the black keys, so a point over a black key still sees the white key
+    underneath. The hit test picks between them the same way it does for
+    overlapping rects.
+    """
+    labels = np.full((2,) + tuple(shape), -1, dtype=np.int16)
+    for index, key_type in enumerate(key_types):
+        plane = labels[0 if key_type == "white" else 1]
+        cv2.fillPoly(plane, [quads[index].round().astype(np.int32)], index)
+    return labels
+
+
+def calibrate(
+    frame: np.ndarray,
+    sheet: KeyboardSheet,
+    detector: "cv2.aruco.ArucoDetector",
+    min_markers: int = 3,
+    mirrored: bool = False,
+) -> Optional[Calibration]:
+    """Find the sheet in ``frame`` and map every key into frame pixels.
+
+    Set ``mirrored`` for the app's flipped camera frames: markers do not
+    decode in a mirror image, so detection runs on an unflipped copy and the
+    result is mirrored back.
+    """
+    start = time.perf_counter()
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if mirrored:
+        gray = cv2.flip(gray, 1)
+    corners, ids, _ = detector.detectMarkers(gray)
+    if ids is None:
+        return None
+    expected = sheet.marker_corners()
+    src: List[np.ndarray] = []
+    dst: List[np.ndarray] = []
+    for marker_corners, marker_id in zip(corners, ids.ravel().tolist(), strict=True):
+        if marker_id in expected:
+            src.append(expected[marker_id])
+            dst.append(marker_corners.reshape(4, 2))
+    if len(src) < min_markers:
+        return None
+    homography, _ = cv2.findHomography(np.concatenate(src), np.concatenate(dst))
+    if homography is None:
+        return None
+    if mirrored:
+        flip = np.array([[-1, 0, gray.shape[1] - 1], [0, 1, 0], [0, 0, 1]], float)
+        homography = flip @ homography
+    quads = cv2.perspectiveTransform(
+        sheet.key_quads().reshape(-1, 1, 2), homography
+    ).reshape(-1, 4, 2)
+    labels = label_map(quads, sheet.key_types, frame.shape[:2])
+    return Calibration(homography, quads, labels, len(src), time.perf_counter() - start)
+
+
+class AutoCalibrator:
+    """Runs ``calibrate`` on a background thread while the frame loop goes on.
+
+    After ``start``, the frame loop hands every frame to ``submit`` (a copy
+    into a latest-frame-wins slot) and checks ``poll`` for a result. Frames
+    are tried until the sheet is found or ``timeout`` seconds pass; hit
+    detection keeps using the previous layout meanwhile.
+    """
+
+    def __init__(
+        self,
+        sheet: KeyboardSheet,
+        dictionary,
+        min_markers: int = 3,
+        timeout: float = 1.0,
+        mirrored: bool = True,
+    ):
+        self.sheet = sheet
+        self.mirrored = mirrored
+        self.detector = cv2.aruco.ArucoDetector(dictionary)
+        self.min_markers = min_markers
+        self.timeout = timeout
+        self.active = False
+        self._running = False
+        self._deadline = 0.0
+        self._frames: LatestQueue[np.ndarray] = LatestQueue()
+        self._result: Optional[Calibration] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Begin looking for the sheet in the next submitted frames."""
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._run, name="calibration", daemon=True
+            )
+            self._thread.start()
+        self._deadline = time.monotonic() + self.timeout
+        self.active = True
+        logger.info("Auto calibration started: show the keyboard sheet.")
+
+    def submit(self, frame: np.ndarray) -> None:
+        """Offer a frame to the calibration thread (no-op when inactive)."""
+        if self.active:
+            self._frames.put(frame.copy())
+
+    def poll(self) -> Optional[Calibration]:
+        """Return a finished calibration once, or None."""
+        with self._lock:
+            result, self._result = self._result, None
+        if result is None and self.active and time.monotonic() > self._deadline:
+            self.active = False
+            logger.warning("Auto calibration timed out: keyboard sheet not found.")
+        return result
+
+    def close(self) -> None:
+        self.active = False
+        self._running = False
+        self._frames.close()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self) -> None:
+        while self._running:
+            frame = self._frames.get(timeout=0.1)
+            if frame is None or not self.active:
+                continue
+            try:
+                result = calibrate(
+                    frame, self.sheet, self.detector, self.min_markers, self.mirrored
+                )
+            except cv2.error as e:
+                logger.error(f"Auto calibration failed: {e}")
+                continue
+            if result is not None and self.active:
+                self.active = False
+                with self._lock:
+                    self._result = result
+                logger.info(
+                    f"Auto calibration found {result.markers} markers "
+                    f"in {result.seconds * 1000:.1f} ms."
+                )
+
+
+def sheet_from_config(
+    config: dict, key_configs: Optional[List[dict]] = None
+) -> KeyboardSheet:
+    settings = config["auto_calibration"]
+    key_configs = config["keys"] if key_configs is None else key_configs
+    return KeyboardSheet(
+        [key_config["type"] for key_config in key_configs],
+        settings["sheet_size"],
+        settings["marker_size"],
+        settings["margin"],
+        settings["black_key_size"],
+    )
+
+
+def calibrator_from_config(
+    config: dict, key_configs: Optional[List[dict]] = None
+) -> AutoCalibrator:
+    settings = config["auto_calibration"]
+    return AutoCalibrator(
+        sheet_from_config(config, key_configs),
+        get_dictionary(settings["dictionary"]),
+        settings["min_markers"],
+        settings["timeout"],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write the printable sheet.")
+    parser.add_argument("output", help="image file to write, e.g. sheet.png")
+    args = parser.parse_args()
+    dictionary = get_dictionary(CONFIG["auto_calibration"]["dictionary"])
+    cv2.imwrite(args.output, sheet_from_config(CONFIG).render(dictionary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import platform
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+import cv2
+import numpy as np
+
+WINDOW_NAME = "Virtual Piano"
+
+
+class FrameRateCap:
+    """Tells whether a frame is due under a ``max_fps`` cap (0 = uncapped).
+
+    A frame counts as due up to a quarter interval early, so a 60 fps loop
+    under a 30 fps cap shows every other frame instead of drifting lower.
+    """
+
+    def __init__(
+        self, max_fps: float = 0.0, clock: Callable[[], float] = time.monotonic
+    ):
+        self.interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.clock = clock
+        self._next = 0.0
+
+    def due(self) -> bool:
+        return self.clock() >= self._next - self.interval / 4
+
+    def shown(self) -> None:
+        self._next = max(self._next + self.interval, self.clock())
+
+
+class CvDisplay:
+    """Shows frames in an OpenCV window and polls the keyboard."""
+
+    def __init__(self, window_name: str = WINDOW_NAME, max_fps: float = 0.0):
+        self.window_name = window_name
+        self.cap = FrameRateCap(max_fps)
+
+    def due(self) -> bool:
+        """Whether a frame shown now would be displayed (under the fps cap)."""
+        return self.cap.due()
+
+    def show(self, frame: np.ndarray) -> None:
+        self.cap.shown()
+        cv2.imshow(self.window_name, frame)
+
+    def poll_key(self) -> int:
+        """Return the pressed key code (0-255), or 255 if none."""
+        return cv2.waitKey(1) & 0xFF
+
+    def close(self) -> None:
+        cv2.destroyAllWindows()
+
+
+class ThreadedDisplay:
+    """Shows frames and polls the keyboard from its own thread.
+
+    ``imshow`` and ``waitKey`` (at least a millisecond, often more) leave the
+    frame loop: ``show`` copies the frame, since the caller may reuse its
+    buffer, and hands it over, and keys pressed meanwhile are queued for
+    ``poll_key``. Frames are copied into three preallocated buffers (one
+    being shown, one waiting and one being written), so showing a frame
+    allocates nothing. Frames arrive at most ``max_fps`` times a second; use
+    ``due`` to skip drawing the ones that would not be shown. The window is
+    created and destroyed on the display thread, as HighGUI expects.
+    """
+
+    def __init__(
+        self,
+        window_name: str = WINDOW_NAME,
+        max_fps: float = 30.0,
+        key_interval: float = 0.01,
+    ):
+        self.window_name = window_name
+        self.cap = FrameRateCap(max_fps)
+        self.key_interval = key_interval  # s between keyboard polls when idle
+        self.frames_shown = 0
+        self._buffers: List[np.ndarray] = []
+        self._pending: Optional[int] = None  # buffer waiting to be shown
+        self._showing: Optional[int] = None  # buffer imshow is reading
+        self._lock = threading.Lock()
+        self._keys: deque = deque()
+        self._error: Optional[Exception] = None  # raised again by poll_key
+        self._wake = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="display", daemon=True)
+        self._thread.start()
+
+    def due(self) -> bool:
+        return self.cap.due()
+
+    def show(self, frame: np.ndarray) -> None:
+        self.cap.shown()
+        buffers = self._buffers
+        if not buffers or buffers[0].shape != frame.shape:
+            # imshow keeps its own reference to a buffer it is still reading
+            buffers = [np.empty_like(frame) for _ in range(3)]
+            with self._lock:
+                self._buffers = buffers
+                self._pending = self._showing = None
+        with self._lock:
+            index = next(
+                i for i in range(3) if i != self._pending and i != self._showing
+            )
+        np.copyto(buffers[index], frame)
+        with self._lock:
+            self._pending = index
+        self._wake.set()
+
+    def poll_key(self) -> int:
+        if self._error is not None:
+            raise self._error
+        return self._keys.popleft() if self._keys else 0xFF
+
+    def close(self) -> None:
+        self._running = False
+        self._wake.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        try:
+            while self._running:
+                self._wake.wait(self.key_interval)
+                self._wake.clear()
+                with self._lock:
+                    index, self._pending = self._pending, None
+                    self._showing = index
+                    buffers = self._buffers
+                if index is not None:
+                    cv2.imshow(self.window_name, buffers[index])
+                    self.frames_shown += 1
+                    with self._lock:
+                        self._showing = None
+                key = cv2.waitKey(1) & 0xFF
+                if key != 0xFF:
+                    self._keys.append(key)
+        except cv2.error as e:
+            self._error = e
+        finally:
+            cv2.destroyAllWindows()
+
+
+class NullDisplay:
+    """Display sink that discards frames, for headless runs.
+
+    With ``render=False`` frames are never due, so nothing is drawn either
+    (the "no preview" mode).
+    """
+
+    def __init__(self, render: bool = True):
+        self.render = render
+        self.frames_shown = 0
+
+    def due(self) -> bool:
+        return self.render
+
+    def show(self, frame: np.ndarray) -> None:
+        self.frames_shown += 1
+
+    def poll_key(self) -> int:
+        return 0xFF
+
+    def close(self) -> None:
+        pass
+
+
+class BufferedDisplay:
+    """Keeps the last frame for another thread to show.
+
+    Stations run their frame loops on their own threads, but OpenCV windows
+    must all be driven from one thread, so the station runner shows
+    ``frame`` and feeds keys in with ``push_key``.
+    """
+
+    def __init__(self, window_name: str = WINDOW_NAME):
+        self.window_name = window_name
+        self.frame: Optional[np.ndarray] = None
+        self._key = 0xFF
+
+    def due(self) -> bool:
+        return True
+
+    def show(self, frame: np.ndarray) -> None:
+        self.frame = frame
+
+    def push_key(self, key: int) -> None:
+        self._key = key
+
+    def poll_key(self) -> int:
+        key, self._key = self._key, 0xFF
+        return key
+
+    def close(self) -> None:
+        self.frame = None
+
+
+def display_from_config(config: dict):
+    """The preview display described by ``config["display"]``."""
+    settings = config["display"]
+    if not settings["preview"]:
+        return NullDisplay(render=False)
+    if settings["threaded"] and platform.system() != "Emscripten":
+        return ThreadedDisplay(WINDOW_NAME, settings["max_fps"])
+    return CvDisplay(WINDOW_NAME, settings["max_fps"])
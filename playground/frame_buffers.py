@@ -0,0 +1,83 @@
+from typing import Any, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from playground.roi import Box, crop
+
+
+class FrameBuffers:
+    """Preallocated buffers for capturing, mirroring and converting frames.
+
+    The camera reads into one reused capture buffer, ``mirror`` flips it
+    into one of ``slots`` frame buffers and ``rgb`` converts a frame into a
+    reused RGB buffer for MediaPipe, all through ``dst=`` outputs, so a frame
+    costs no full-size allocation. A single-threaded loop mirrors every frame
+    into slot 0; a pipeline that keeps several frames in flight ``acquire``s
+    a slot per frame and ``release``s it once nothing reads the frame.
+
+    When the camera resolution changes the buffers are reallocated for the
+    new size. Frames still held from before keep their old memory, and their
+    slots are reused at the new size once released.
+    """
+
+    def __init__(self, slots: int = 1):
+        self.slots = slots
+        self.shape: Optional[Tuple[int, ...]] = None
+        self.frames: Optional[np.ndarray] = None  # (slots, H, W, 3) mirrored BGR
+        self._free: List[int] = list(range(slots))
+        self._capture: Optional[np.ndarray] = None
+        self._rgb: Optional[np.ndarray] = None
+        self._crop: Optional[np.ndarray] = None
+        self.frames_dropped = 0
+        self.reallocations = 0
+
+    def read(self, cap: Any) -> Tuple[bool, Optional[np.ndarray]]:
+        """``cap.read`` into the reused capture buffer."""
+        if self._capture is None:
+            ret, frame = cap.read()
+        else:
+            ret, frame = cap.read(self._capture)
+        if ret:
+            # Backends hand back a new array when the size changed
+            self._capture = frame
+        return ret, frame
+
+    def acquire(self) -> Optional[int]:
+        """Take a free slot to mirror a frame into, or None if all are busy."""
+        if not self._free:
+            self.frames_dropped += 1
+            return None
+        return self._free.pop()
+
+    def release(self, slot: int) -> None:
+        """Return a slot once nothing reads its frame anymore."""
+        self._free.append(slot)
+
+    def mirror(self, frame: np.ndarray, slot: int = 0) -> np.ndarray:
+        """Flip ``frame`` horizontally into the buffer of ``slot``."""
+        if frame.shape != self.shape:
+            self._allocate(frame.shape)
+        return cv2.flip(frame, 1, dst=self.frames[slot])
+
+    def crop(self, frame: np.ndarray, box: Optional[Box], max_side: int) -> np.ndarray:
+        """``roi.crop`` into a reused buffer, overwritten by the next call."""
+        if box is None:
+            return frame
+        self._crop = crop(frame, box, max_side, self._crop)
+        return self._crop
+
+    def rgb(self, frame: np.ndarray) -> np.ndarray:
+        """Convert a BGR frame into the reused RGB buffer.
+
+        The result is overwritten by the next call.
+        """
+        if self._rgb is None or self._rgb.shape != frame.shape:
+            self._rgb = np.empty_like(frame)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+
+    def _allocate(self, shape: Tuple[int, ...]) -> None:
+        if self.shape is not None:
+            self.reallocations += 1
+        self.shape = shape
+        self.frames = np.empty((self.slots,) + shape, dtype=np.uint8)
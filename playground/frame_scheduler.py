@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class FrameScheduler:
+    """Paces the frame loop against absolute deadlines.
+
+    Frame ``n`` is due at ``start + n / fps``. After each frame ``wait`` sleeps
+    only for what is left of the budget, so processing time is not added on
+    top of the frame period. When a frame starts more than one period late,
+    ``behind`` tells the loop to skip rendering for it (hit detection still
+    runs); when the loop falls more than ``max_lag`` periods behind, the
+    missed deadlines are dropped instead of being caught up in a burst.
+    """
+
+    def __init__(
+        self,
+        fps: float,
+        max_lag: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.max_lag = max_lag
+        self.clock = clock
+        self.deadline = 0.0  # when the current frame was due
+        self.frames = 0
+        self.renders_skipped = 0
+        self.deadlines_dropped = 0
+        self._started = 0.0
+
+    def behind(self) -> bool:
+        """Whether the current frame started over a period late."""
+        now = self.clock()
+        if not self._started:
+            self._started = self.deadline = now
+        late = now - self.deadline >= self.period
+        if late:
+            self.renders_skipped += 1
+        return late
+
+    async def wait(self) -> None:
+        """Sleep until the next frame is due."""
+        self.frames += 1
+        self.deadline += self.period
+        now = self.clock()
+        remaining = self.deadline - now
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+            return
+        missed = int(-remaining / self.period)
+        if missed > self.max_lag:
+            self.deadlines_dropped += missed
+            self.deadline += missed * self.period
+        await asyncio.sleep(0)  # still let other tasks run
+
+    def report(self) -> Dict[str, float]:
+        """Target and achieved frame rate plus the number of skipped renders."""
+        elapsed = self.clock() - self._started if self._started else 0.0
+        return {
+            "target_fps": self.fps,
+            "achieved_fps": self.frames / elapsed if elapsed > 0 else 0.0,
+            "frames": self.frames,
+            "renders_skipped": self.renders_skipped,
+            "deadlines_dropped": self.deadlines_dropped,
+        }
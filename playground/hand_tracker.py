@@ -0,0 +1,162 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class OneEuroFilter:
+    """One-Euro filter over an array of values (Casiez et al., 2012).
+
+    Smooths jitter at low speed while keeping lag low at high speed, and
+    provides a filtered derivative that is far less noisy than a one-frame
+    finite difference.
+    """
+
+    def __init__(
+        self, min_cutoff: float = 1.0, beta: float = 0.05, d_cutoff: float = 10.0
+    ):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.value: Optional[np.ndarray] = None
+        self.derivative: Optional[np.ndarray] = None
+        self.timestamp = 0.0
+
+    @staticmethod
+    def _alpha(cutoff, dt: float):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, value: np.ndarray, timestamp: float) -> np.ndarray:
+        value = np.asarray(value, dtype=np.float64)
+        if self.value is None:
+            self.value = value.copy()
+            self.derivative = np.zeros_like(value)
+            self.timestamp = timestamp
+            return self.value
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return self.value
+        self.timestamp = timestamp
+        raw_derivative = (value - self.value) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.derivative = self.derivative + a_d * (raw_derivative - self.derivative)
+        cutoff = self.min_cutoff + self.beta * np.abs(self.derivative)
+        a = self._alpha(cutoff, dt)
+        self.value = self.value + a * (value - self.value)
+        return self.value
+
+
+class TrackedHand:
+    """A hand with a stable id and filtered point positions/velocities."""
+
+    def __init__(self, hand_id: int, label: Optional[str], filter_params: dict):
+        self.id = hand_id
+        self.label = label
+        self.filter = OneEuroFilter(**filter_params)
+        self.last_seen = 0.0
+        self.frame_interval = 0.0
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Filtered ``(K, 2)`` pixel positions of the tracked points."""
+        return self.filter.value
+
+    @property
+    def velocities(self) -> np.ndarray:
+        """Filtered ``(K, 2)`` velocities in pixels per second."""
+        return self.filter.derivative
+
+    def predict(self, lookahead: float) -> np.ndarray:
+        """Positions extrapolated ``lookahead`` seconds ahead."""
+        return self.positions + self.velocities * lookahead
+
+    def update(self, points: np.ndarray, timestamp: float) -> None:
+        if self.last_seen:
+            self.frame_interval = timestamp - self.last_seen
+        self.filter(points, timestamp)
+        self.last_seen = timestamp
+
+
+class HandTracker:
+    """Gives hands stable ids across frames, independent of MediaPipe's order.
+
+    Detections are matched to existing tracks greedily by distance, only
+    between hands with the same handedness label, and within
+    ``max_distance`` pixels. Unmatched detections start new tracks, and tracks
+    not seen for ``timeout`` seconds are dropped.
+    """
+
+    def __init__(
+        self,
+        max_distance: float = 200.0,
+        timeout: float = 0.3,
+        min_cutoff: float = 1.0,
+        beta: float = 0.05,
+        d_cutoff: float = 10.0,
+    ):
+        self.max_distance = max_distance
+        self.timeout = timeout
+        self.filter_params = {
+            "min_cutoff": min_cutoff,
+            "beta": beta,
+            "d_cutoff": d_cutoff,
+        }
+        self.hands: Dict[int, TrackedHand] = {}
+        self._next_id = 0
+
+    def update(
+        self, detections: List[Tuple[Optional[str], np.ndarray]], timestamp: float
+    ) -> List[TrackedHand]:
+        """Match ``(label, (K, 2) points)`` detections and return their tracks.
+
+        The returned list is in detection order.
+        """
+        for hand_id in [
+            i for i, h in self.hands.items() if timestamp - h.last_seen > self.timeout
+        ]:
+            del self.hands[hand_id]
+
+        pairs = []
+        for d, (label, points) in enumerate(detections):
+            center = np.asarray(points, dtype=np.float64).mean(axis=0)
+            for hand in self.hands.values():
+                if label is not None and hand.label is not None and label != hand.label:
+                    continue
+                # Compare with where the hand should be by now, not where it was
+                expected = hand.predict(timestamp - hand.last_seen).mean(axis=0)
+                distance = float(np.linalg.norm(center - expected))
+                if distance <= self.max_distance:
+                    pairs.append((distance, d, hand.id))
+        pairs.sort()
+
+        matched: List[Optional[TrackedHand]] = [None] * len(detections)
+        used = set()
+        for _, d, hand_id in pairs:
+            if matched[d] is None and hand_id not in used:
+                matched[d] = self.hands[hand_id]
+                used.add(hand_id)
+
+        for d, (label, points) in enumerate(detections):
+            hand = matched[d]
+            if hand is None:
+                hand = TrackedHand(self._next_id, label, self.filter_params)
+                self._next_id += 1
+                self.hands[hand.id] = hand
+                matched[d] = hand
+            hand.update(points, timestamp)
+        return matched
+
+    def coast(self, timestamp: float) -> List[TrackedHand]:
+        """Advance every track to ``timestamp`` without a new detection.
+
+        For frames the motion gate skipped: nothing moved over the keyboard
+        since the last detection, so each hand is extrapolated as staying
+        where it was. Its velocity then decays towards zero instead of
+        carrying the fingertips on, and the track does not time out while
+        the hand rests.
+        """
+        hands = list(self.hands.values())
+        for hand in hands:
+            hand.update(hand.positions.copy(), timestamp)
+        return hands
@@ -0,0 +1,359 @@
+import asyncio
+import gc
+import logging
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.config import CONFIG
+from config.store import STORE
+from playground.display import NullDisplay
+from playground.inference_pool import InferencePool
+from playground.instrumentation import PERCENTILES
+from playground.stations import StationRunner
+from playground.virtual_piano import VirtualPiano, create_engine
+
+logger = logging.getLogger(__name__)
+
+MARKER_COLOR = (180, 200, 255)  # BGR colour of the synthetic fingertip
+
+
+class VideoFileSource:
+    """Camera stand-in that reads frames from a recorded video file."""
+
+    def __init__(self, path: str):
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Could not open video {path}.")
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.position = -1  # index of the last frame read
+        self.exhausted = False
+
+    def read(
+        self, image: Optional[np.ndarray] = None
+    ) -> Tuple[bool, Optional[np.ndarray]]:
+        ret, frame = self.cap.read(image)
+        if not ret:
+            self.exhausted = True
+            return False, None
+        self.position += 1
+        return True, frame
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+class SyntheticFrameSource:
+    """Generates frames of a fingertip striking each white key in turn.
+
+    The strike script is deterministic, so together with ``ScriptedHands`` it
+    gives a repeatable benchmark that needs neither a camera nor a recording.
+    Positions are normalized and expressed in the mirrored frame, like the
+    landmarks MediaPipe returns for the flipped image.
+    """
+
+    APPROACH_FRAMES = 3
+    LIFT_FRAMES = 5
+    APPROACH_HEIGHT = 0.25  # normalized distance above the key centre
+
+    def __init__(
+        self,
+        width: int = 1280,
+        height: int = 720,
+        frames: int = 600,
+        fps: float = 30.0,
+        realtime: bool = False,
+    ):
+        self.width = width
+        self.height = height
+        self.frames = frames
+        self.fps = fps
+        # Deliver frames no faster than ``fps``, like a camera
+        self.realtime = realtime
+        self.position = -1
+        self.exhausted = False
+        self._started: Optional[float] = None
+        self.targets = [
+            (
+                k["pos"][0] + k["size"][0] / 2 / width,
+                k["pos"][1] + k["size"][1] / 2 / height,
+            )
+            for k in CONFIG["keys"]
+            if k["type"] == "white"
+        ]
+        self._background = np.full((height, width, 3), 60, dtype=np.uint8)
+
+    def fingertip(self, index: int) -> Tuple[float, float]:
+        """Normalized fingertip position (mirrored frame) at a frame index."""
+        period = self.APPROACH_FRAMES + self.LIFT_FRAMES
+        strike, phase = divmod(index, period)
+        x, y = self.targets[strike % len(self.targets)]
+        if phase < self.APPROACH_FRAMES:
+            height = 1 - (phase + 1) / self.APPROACH_FRAMES
+        else:
+            height = (phase - self.APPROACH_FRAMES + 1) / self.LIFT_FRAMES
+        return x, y - self.APPROACH_HEIGHT * height
+
+    def read(
+        self, image: Optional[np.ndarray] = None
+    ) -> Tuple[bool, Optional[np.ndarray]]:
+        """Next frame, drawn into ``image`` when it has the right size."""
+        if self.position + 1 >= self.frames:
+            self.exhausted = True
+            return False, None
+        if self.realtime:
+            if self._started is None:
+                self._started = time.monotonic()
+            delay = self._started + (self.position + 1) / self.fps - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        self.position += 1
+        frame = image
+        if frame is None or frame.shape != self._background.shape:
+            frame = np.empty_like(self._background)
+        np.copyto(frame, self._background)
+        x, y = self.fingertip(self.position)
+        # The app mirrors the frame, so draw the fingertip un-mirrored
+        center = (int((1 - x) * self.width), int(y * self.height))
+        cv2.circle(frame, center, 12, MARKER_COLOR, -1)
+        return True, frame
+
+    def isOpened(self) -> bool:
+        return not self.exhausted
+
+    def release(self) -> None:
+        self.exhausted = True
+
+
+class ScriptedHands:
+    """Stand-in for MediaPipe Hands that finds a synthetic source's fingertip.
+
+    The fingertip is located from the marker drawn by ``SyntheticFrameSource``
+    in the image it is given, so it works on cropped or downscaled input just
+    like the real model.
+    """
+
+    def __init__(self):
+        self._mask: Optional[np.ndarray] = None  # reused marker mask
+
+    def process(self, rgb: np.ndarray) -> Any:
+        from mediapipe.framework.formats import landmark_pb2
+
+        # The marker is the only pixel region with a bright red channel
+        if self._mask is None or self._mask.shape != rgb.shape[:2]:
+            self._mask = np.empty(rgb.shape[:2], dtype=bool)
+        np.greater(rgb[:, :, 0], 200, out=self._mask)
+        moments = cv2.moments(self._mask.view(np.uint8), binaryImage=True)
+        if moments["m00"] == 0:
+            return SimpleNamespace(multi_hand_landmarks=None)
+        h, w = rgb.shape[:2]
+        x = moments["m10"] / moments["m00"] / w
+        y = moments["m01"] / moments["m00"] / h
+        hand = landmark_pb2.NormalizedLandmarkList()
+        for i in range(21):
+            # Palm 40 px below the tip; only the tip position matters
+            hand.landmark.add(x=x, y=y if i == 8 else y + 40 / h, z=0.0)
+        return SimpleNamespace(multi_hand_landmarks=[hand])
+
+    def close(self) -> None:
+        pass
+
+
+def run_headless(
+    source: Any,
+    hands: Any = None,
+    max_frames: Optional[int] = None,
+    trace_allocations: bool = False,
+) -> Dict[str, Any]:
+    """Run the real update loop over ``source`` as fast as possible.
+
+    ``hands`` defaults to MediaPipe. Time inside the app follows the source's
+    frame timestamps, so velocities, cooldowns and the notes triggered are
+    repeatable regardless of how fast the machine runs. Returns sustained FPS,
+    per-stage timings and the ``(frame, note)`` sequence.
+
+    With ``trace_allocations`` every ``update_loop`` call runs under
+    ``tracemalloc`` (which slows it down) and the report gains an
+    ``allocations`` entry, see ``allocation_summary``. Frames go to a
+    ``NullDisplay``, so the preview window's own cost is not included.
+    """
+    app = VirtualPiano(
+        source=source,
+        display=NullDisplay(),
+        hands=hands,
+        audio_output=False,
+        clock=lambda: source.position / source.fps,
+        pipelined=False,
+    )
+    app.instrumentation.enabled = True
+    notes: List[Tuple[int, str]] = []
+    app.setup()
+    app.piano.note_listeners.append(
+        lambda name, _: notes.append((source.position, name))
+    )
+    frames = 0
+    starts: List[int] = []  # bytes allocated when each frame started
+    peaks: List[int] = []  # most bytes allocated at once during each frame
+    if trace_allocations:
+        tracemalloc.start()
+        collections = sum(s["collections"] for s in gc.get_stats())
+    start = time.perf_counter()
+    try:
+        while not source.exhausted and (max_frames is None or frames < max_frames):
+            if trace_allocations:
+                starts.append(tracemalloc.get_traced_memory()[0])
+                tracemalloc.reset_peak()
+            app.update_loop()
+            if trace_allocations:
+                peaks.append(tracemalloc.get_traced_memory()[1])
+            if source.exhausted:
+                break
+            app.engine.render()  # drain triggered notes as the device would
+            app.instrumentation.lap("audio_render")
+            frames += 1
+    finally:
+        elapsed = time.perf_counter() - start
+        if trace_allocations:
+            end = tracemalloc.get_traced_memory()[0]
+            collections = sum(s["collections"] for s in gc.get_stats()) - collections
+            tracemalloc.stop()
+        app.cleanup()
+    report = {
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "stages": app.instrumentation.summary(),
+        "notes": notes,
+    }
+    if trace_allocations:
+        report["allocations"] = allocation_summary(
+            starts,
+            peaks,
+            end,
+            collections,
+            int(np.prod(app.buffers.shape or (0,))),
+        )
+    logger.info(f"Headless run: {frames} frames at {report['fps']:.1f} fps.")
+    return report
+
+
+def allocation_summary(
+    starts: List[int],
+    peaks: List[int],
+    end: int,
+    collections: int,
+    frame_bytes: int,
+    warmup: int = 5,
+) -> Dict[str, float]:
+    """Summarize traced memory per frame, skipping ``warmup`` frames.
+
+    ``starts`` and ``peaks`` are the traced bytes when each frame started and
+    the most during it. The summary gives, in KB, how far each frame rose
+    above its start, so a frame that allocates and frees a full-size image
+    counts at least ``frame_bytes``; ``frames_allocating_images`` is how many
+    frames did that. ``retained_kb`` is what stayed allocated from the end
+    of warm-up to ``end``, and ``gc_collections`` how often the garbage
+    collector ran during the whole run.
+    """
+    warmup = min(warmup, max(len(starts) - 1, 0))
+    values = np.subtract(peaks[warmup:], starts[warmup:], dtype=np.float64)
+    if not len(values):
+        values = np.zeros(1)
+    p50, p95, p99 = np.percentile(values, PERCENTILES) / 1024
+    return {
+        "frames": len(peaks) - warmup,
+        "p50_kb": float(p50),
+        "p95_kb": float(p95),
+        "p99_kb": float(p99),
+        "max_kb": float(values.max() / 1024),
+        "frames_allocating_images": int((values >= frame_bytes).sum()),
+        "retained_kb": (end - starts[warmup]) / 1024 if starts else 0.0,
+        "gc_collections": collections,
+    }
+
+
+def run_stations_headless(
+    sources: List[Any],
+    hands_factory: Callable[[], Any] = ScriptedHands,
+    backend: str = "thread",
+    workers: int = 2,
+) -> Dict[str, Any]:
+    """Run one station per source on a ``StationRunner`` as fast as possible.
+
+    All stations share one audio engine. With the "thread" backend every
+    station runs its own ``hands_factory()`` on its own thread; with
+    "process" they share an ``InferencePool`` of ``workers`` processes.
+    Returns the frames that went through hand inference and the frame rate
+    of every station, plus their total. Pipelined (process) runs start the
+    clock once every station has had a frame inferred, so worker start-up
+    is not counted; give them ``realtime`` sources, or capture outruns
+    inference and most frames are dropped. Stations are only set up (and
+    realtime sources only start) once every worker has loaded its model.
+    """
+    engine = create_engine()
+    pool = None
+    if backend == "process":
+        pool = InferencePool(workers, hands_factory=hands_factory)
+        if not pool.wait_ready(60.0):
+            logger.warning("Inference workers not ready after 60 s.")
+    stations = [
+        VirtualPiano(
+            source=source,
+            display=NullDisplay(),
+            hands=None if pool else hands_factory(),
+            audio_output=False,
+            clock=lambda source=source: source.position / source.fps,
+            pipelined=pool is not None,
+            engine=engine,
+            pool=pool,
+            store=STORE.local_copy(),
+        )
+        for source in sources
+    ]
+    runner = StationRunner(stations, engine, pool, audio_output=False)
+
+    def inferred() -> List[int]:
+        if pool:
+            return [station.pipeline.frames_inferred for station in stations]
+        return list(runner.frames)
+
+    async def drive() -> None:
+        while not any(source.exhausted for source in sources):
+            await runner.step()
+            engine.render()  # drain triggered notes as the device would
+
+    runner.setup()
+    try:
+        if pool:
+            while not all(inferred()) and not any(s.exhausted for s in sources):
+                time.sleep(0.01)
+        baseline = inferred()
+        start = time.perf_counter()
+        asyncio.run(drive())
+        elapsed = time.perf_counter() - start
+        counts = [now - then for now, then in zip(inferred(), baseline, strict=True)]
+    finally:
+        runner.cleanup()
+    per_station = [
+        {"frames": frames, "fps": frames / elapsed if elapsed > 0 else 0.0}
+        for frames in counts
+    ]
+    report = {
+        "stations": len(sources),
+        "backend": backend,
+        "seconds": elapsed,
+        "per_station": per_station,
+        "total_fps": sum(s["fps"] for s in per_station),
+    }
+    logger.info(
+        f"Headless stations: {len(sources)} at "
+        f"{report['total_fps'] / len(sources):.1f} fps each."
+    )
+    return report
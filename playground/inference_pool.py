@@ -0,0 +1,392 @@
+import itertools
+import logging
+import multiprocessing as mp
+import queue
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from playground.frame_buffers import FrameBuffers
+from playground.landmarks import array_to_landmarks, landmarks_to_array
+from playground.roi import Box
+
+logger = logging.getLogger(__name__)
+
+# (client id, ring name, frame shape, slots, seq, slot, crop box or None, max side)
+Task = Tuple[int, str, Tuple[int, ...], int, int, int, Optional[Box], int]
+# (seq, slot, (H, 21, 3) full-frame landmarks, handedness labels, seconds)
+Reply = Tuple[int, int, Optional[np.ndarray], List[Optional[str]], float]
+
+
+def _default_hands(**kwargs) -> Any:
+    from mediapipe.python.solutions.hands import Hands
+
+    return Hands(**kwargs)
+
+
+def _worker(
+    tasks: "mp.Queue",
+    replies: "mp.Queue",
+    hands_factory: Callable[..., Any],
+    hands_kwargs: Dict[str, Any],
+) -> None:
+    """Inference process: reads frames from shared memory, replies with arrays.
+
+    Every client (station) has its own frame ring and its own ``Hands``
+    instance here, both set up on the first task seen from it, so hand
+    tracking state never mixes frames from different cameras. One ``Hands``
+    is loaded before the worker reports ready and goes to the first client.
+    A task naming another ring than the client's last one (the client was
+    resized) maps that ring instead, keeping the client's ``Hands``. Every
+    task gets a reply, with no landmarks if the frame could not be read.
+    """
+    clients: Dict[int, list] = {}  # client id -> [shm, frames, hands, buffers]
+    spare = hands_factory(**hands_kwargs)
+    replies.put((None, None))  # ready
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            client_id, shm_name, shape, slots, seq, slot, box, max_side = task
+            client = clients.get(client_id)
+            if client is None or client[0].name != shm_name:
+                try:
+                    shm = shared_memory.SharedMemory(name=shm_name)
+                except FileNotFoundError:
+                    # The client closed before this task ran
+                    replies.put((client_id, (seq, slot, None, [], 0.0)))
+                    continue
+                frames = np.ndarray((slots,) + shape, dtype=np.uint8, buffer=shm.buf)
+                if client is None:
+                    hands = (
+                        spare if spare is not None else hands_factory(**hands_kwargs)
+                    )
+                    spare = None
+                    # Crop and RGB images are reused between tasks
+                    client = clients[client_id] = [None, None, hands, FrameBuffers()]
+                else:
+                    client[1] = None
+                    client[0].close()
+                client[0], client[1] = shm, frames
+            _, frames, hands, buffers = client
+            h, w = shape[:2]
+            start = time.perf_counter()
+            landmarks, labels = None, []
+            try:
+                rgb = buffers.rgb(buffers.crop(frames[slot], box, max_side))
+                result = hands.process(rgb)
+                multi_hand_landmarks = getattr(result, "multi_hand_landmarks", None)
+                if multi_hand_landmarks:
+                    landmarks = np.stack(
+                        [landmarks_to_array(hand) for hand in multi_hand_landmarks]
+                    )
+                    if box is not None:
+                        # Crop-normalized -> full-frame-normalized
+                        x0, y0, x1, y1 = box
+                        landmarks[..., 0] = (x0 + landmarks[..., 0] * (x1 - x0)) / w
+                        landmarks[..., 1] = (y0 + landmarks[..., 1] * (y1 - y0)) / h
+                    handedness = getattr(result, "multi_handedness", None) or []
+                    labels = [
+                        handedness[i].classification[0].label
+                        if i < len(handedness)
+                        else None
+                        for i in range(len(landmarks))
+                    ]
+            except (RuntimeError, ValueError, cv2.error) as e:
+                logger.error(f"Hand inference failed: {e}", exc_info=True)
+            replies.put(
+                (client_id, (seq, slot, landmarks, labels, time.perf_counter() - start))
+            )
+    finally:
+        if hasattr(spare, "close"):
+            spare.close()
+        for shm, frames, hands, _ in clients.values():
+            if hasattr(hands, "close"):
+                hands.close()
+            del frames
+            shm.close()
+
+
+def to_result(landmarks: Optional[np.ndarray], labels: List[Optional[str]]) -> Any:
+    """Rebuild a MediaPipe-shaped result from a worker's arrays."""
+    if landmarks is None:
+        return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+    return SimpleNamespace(
+        multi_hand_landmarks=[array_to_landmarks(hand) for hand in landmarks],
+        multi_handedness=[
+            SimpleNamespace(classification=[SimpleNamespace(label=label)])
+            for label in labels
+        ],
+    )
+
+
+class InferenceClient:
+    """One frame source's view of an ``InferencePool``.
+
+    Frames live in a ring of ``slots`` preallocated buffers in one
+    ``SharedMemory`` block owned by the client. The producer ``acquire``s a
+    free slot and writes the frame straight into it, ``submit`` sends only
+    the slot number, and workers reply with compact ``(hands, 21, 3)``
+    landmark arrays, so no image is ever pickled. ``results`` hands replies
+    back in frame order, holding early ones until the frames before them are
+    done. A slot stays in use until ``release`` is called, so the frame can
+    still be drawn on after inference.
+
+    When the frame size changes, ``resize`` moves to a new ring. Frames
+    still held from before keep their old memory, and their slots are reused
+    at the new size once released; old rings are freed by ``close``.
+
+    A frame with no reply after ``reply_timeout`` seconds (its worker died)
+    is given up: ``results`` returns it with no landmarks, so the frames
+    after it are not held back, and a late reply for it is ignored.
+    """
+
+    def __init__(
+        self,
+        pool: "InferencePool",
+        client_id: int,
+        shape,
+        slots: int,
+        reply_timeout: float = 2.0,
+    ):
+        self.pool = pool
+        self.client_id = client_id
+        self.slots = slots
+        self.reply_timeout = reply_timeout
+        self._retired: List[shared_memory.SharedMemory] = []
+        self._allocate(shape)
+        self._replies: "queue.Queue[Reply]" = queue.Queue()
+        self._free = list(range(slots))
+        self._pending: Dict[int, Reply] = {}
+        # (seq, slot, submit time) of frames in flight, in order
+        self._submitted: deque = deque()
+        self._last_seq: Optional[int] = None  # last seq returned by results
+        self.frames_dropped = 0
+        self.replies_lost = 0
+
+    def _allocate(self, shape: Tuple[int, ...]) -> None:
+        self.shape = tuple(shape)
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=int(np.prod(self.shape)) * self.slots
+        )
+        self.frames = np.ndarray(
+            (self.slots,) + self.shape, dtype=np.uint8, buffer=self._shm.buf
+        )
+
+    def resize(self, shape: Tuple[int, ...]) -> None:
+        """Write frames of ``shape`` from now on, into a new ring."""
+        self._retired.append(self._shm)
+        self._allocate(shape)
+
+    def acquire(self) -> Optional[int]:
+        """Take a free slot to write a frame into, or None if all are busy."""
+        if not self._free:
+            self.frames_dropped += 1
+            return None
+        return self._free.pop()
+
+    def frame(self, slot: int) -> np.ndarray:
+        """The shared-memory frame buffer of ``slot``."""
+        return self.frames[slot]
+
+    def submit(
+        self, seq: int, slot: int, box: Optional[Box] = None, max_side: int = 0
+    ) -> None:
+        """Queue the frame in ``slot`` for inference, optionally cropped."""
+        self._submitted.append((seq, slot, time.monotonic()))
+        self.pool._tasks.put(
+            (
+                self.client_id,
+                self._shm.name,
+                self.shape,
+                self.slots,
+                seq,
+                slot,
+                box,
+                max_side,
+            )
+        )
+
+    def release(self, slot: int) -> None:
+        """Return a slot to the ring once nothing reads its frame anymore."""
+        self._free.append(slot)
+
+    @property
+    def in_flight(self) -> int:
+        """Frames submitted whose results have not been returned yet."""
+        return len(self._submitted)
+
+    def results(self, timeout: Optional[float] = None) -> List[Reply]:
+        """Replies that are now in frame order, waiting up to ``timeout``."""
+        try:
+            reply = self._replies.get(timeout=timeout)
+        except queue.Empty:
+            reply = None
+        while reply is not None:
+            if self._last_seq is None or reply[0] > self._last_seq:
+                self._pending[reply[0]] = reply
+            try:
+                reply = self._replies.get_nowait()
+            except queue.Empty:
+                break
+        ready = []
+        now = time.monotonic()
+        while self._submitted:
+            seq, slot, submitted = self._submitted[0]
+            if seq in self._pending:
+                ready.append(self._pending.pop(seq))
+            elif now - submitted > self.reply_timeout:
+                self.replies_lost += 1
+                logger.warning(f"No inference reply for frame {seq}: skipped.")
+                ready.append((seq, slot, None, [], 0.0))
+            else:
+                break
+            self._submitted.popleft()
+            self._last_seq = seq
+        return ready
+
+    def close(self) -> None:
+        """Free the frame rings; workers drop their mapping when they stop."""
+        self.pool._clients.pop(self.client_id, None)
+        del self.frames
+        for shm in self._retired + [self._shm]:
+            shm.close()
+            shm.unlink()
+
+
+class InferencePool:
+    """Runs hand inference in worker processes over shared-memory frames.
+
+    Each frame source gets an ``InferenceClient`` from ``client``; several
+    sources (one per station) can share the same workers. Workers take tasks
+    from one queue in arrival order and a dispatcher thread routes every
+    reply back to the client that submitted it.
+
+    Each worker has its own ``Hands`` instance per client. MediaPipe tracks
+    hands between the frames one instance sees, so with several workers it
+    runs detection more often; more workers raise throughput, not per-frame
+    accuracy.
+
+    A worker that dies is restarted by the dispatcher; the frame it was
+    working on is given up by its client after ``reply_timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        hands_factory: Callable[..., Any] = _default_hands,
+        hands_kwargs: Optional[Dict[str, Any]] = None,
+        reply_timeout: float = 2.0,
+    ):
+        self.workers = workers
+        self.reply_timeout = reply_timeout
+        self._context = mp.get_context("spawn")
+        self._tasks = self._context.Queue()
+        self._replies = self._context.Queue()
+        self._worker_args = (
+            self._tasks,
+            self._replies,
+            hands_factory,
+            hands_kwargs or {},
+        )
+        self._clients: Dict[int, InferenceClient] = {}
+        self._ids = itertools.count()  # clients may be created from many threads
+        self._ready = 0  # workers that loaded their model
+        self._ready_cond = threading.Condition()
+        self._processes_lock = threading.Lock()
+        self._closing = False
+        self._processes = [self._start_worker(i) for i in range(workers)]
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="inference-replies", daemon=True
+        )
+        self._dispatcher.start()
+        logger.info(f"Inference pool started: {workers} workers.")
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every worker has loaded its model; False on timeout."""
+        with self._ready_cond:
+            return self._ready_cond.wait_for(
+                lambda: self._ready >= self.workers, timeout
+            )
+
+    def client(
+        self, shape: Tuple[int, ...], slots: Optional[int] = None
+    ) -> InferenceClient:
+        """Create a frame ring of ``slots`` frames of ``shape`` for one source."""
+        client = InferenceClient(
+            self,
+            next(self._ids),
+            shape,
+            slots or self.workers + 3,
+            self.reply_timeout,
+        )
+        self._clients[client.client_id] = client
+        return client
+
+    def _start_worker(self, index: int) -> "mp.Process":
+        process = self._context.Process(
+            target=_worker,
+            args=self._worker_args,
+            name=f"inference-{index}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def _restart_dead_workers(self) -> None:
+        with self._processes_lock:
+            if self._closing:
+                return
+            for index, process in enumerate(self._processes):
+                if not process.is_alive():
+                    logger.error(
+                        f"Inference worker {process.name} died "
+                        f"(exit code {process.exitcode}): restarting it."
+                    )
+                    self._processes[index] = self._start_worker(index)
+
+    def _dispatch(self) -> None:
+        next_check = time.monotonic() + 1.0
+        while True:
+            if time.monotonic() > next_check:
+                self._restart_dead_workers()
+                next_check = time.monotonic() + 1.0
+            try:
+                message = self._replies.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if message is None:
+                break
+            client_id, reply = message
+            if client_id is None:
+                with self._ready_cond:
+                    self._ready += 1
+                    self._ready_cond.notify_all()
+                continue
+            client = self._clients.get(client_id)
+            if client is not None:
+                client._replies.put(reply)
+
+    def close(self) -> None:
+        """Stop the workers and free every client's shared memory."""
+        with self._processes_lock:
+            self._closing = True
+            processes, self._processes = self._processes, []
+        for _ in processes:
+            self._tasks.put(None)
+        for process in processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        self._replies.put(None)
+        self._dispatcher.join(timeout=1.0)
+        for client in list(self._clients.values()):
+            client.close()
+        logger.info("Inference pool stopped.")
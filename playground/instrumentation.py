@@ -0,0 +1,139 @@
+import csv
+import json
+import logging
+import time
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 95, 99)
+
+
+class RingBuffer:
+    """Fixed-size float buffer that overwrites its oldest values."""
+
+    def __init__(self, capacity: int):
+        self.data = np.zeros(capacity, dtype=np.float64)
+        self.index = 0
+        self.count = 0
+
+    def append(self, value: float) -> None:
+        self.data[self.index] = value
+        self.index = (self.index + 1) % len(self.data)
+        if self.count < len(self.data):
+            self.count += 1
+
+    def values(self) -> np.ndarray:
+        """The stored values (unordered)."""
+        return self.data[: self.count]
+
+
+class Instrumentation:
+    """Low-overhead per-stage timing for the frame loop.
+
+    The frame loop calls ``mark`` when a frame starts and ``lap(stage)`` after
+    each stage, which records the time since the previous mark/lap. Other
+    threads record durations directly with ``record``. Every stage keeps its
+    last ``capacity`` samples in a ring buffer, from which rolling p50/p95/p99
+    are computed on demand. When disabled, every call returns immediately.
+    """
+
+    def __init__(self, enabled: bool = False, capacity: int = 1024):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.buffers: Dict[str, RingBuffer] = {}
+        self.hud = False
+        self._last = 0.0
+        self._frame_start = 0.0
+        self._hud_lines: List[str] = []
+        self._hud_updated = 0.0
+
+    def mark(self) -> None:
+        """Start a new frame; records the full frame period as ``frame``."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start:
+            self.record("frame", now - self._frame_start)
+        self._frame_start = self._last = now
+
+    def lap(self, stage: str) -> None:
+        """Record the time since the previous mark/lap under ``stage``."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.record(stage, now - self._last)
+        self._last = now
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record a duration measured elsewhere (e.g. another thread)."""
+        if not self.enabled:
+            return
+        buffer = self.buffers.get(stage)
+        if buffer is None:
+            buffer = self.buffers[stage] = RingBuffer(self.capacity)
+        buffer.append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Rolling count, mean and percentiles (ms) for every stage."""
+        stats = {}
+        for stage, buffer in list(self.buffers.items()):
+            values = buffer.values() * 1000.0
+            if not len(values):
+                continue
+            p50, p95, p99 = np.percentile(values, PERCENTILES)
+            stats[stage] = {
+                "count": int(len(values)),
+                "mean_ms": float(values.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+            }
+        return stats
+
+    def export(self, path: str) -> None:
+        """Write the summary to ``path`` as JSON or CSV (by extension)."""
+        stats = self.summary()
+        if path.lower().endswith(".csv"):
+            fields = ["stage", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms"]
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                for stage, row in stats.items():
+                    writer.writerow({"stage": stage, **row})
+        else:
+            with open(path, "w") as f:
+                json.dump(stats, f, indent=2)
+        logger.info(f"Instrumentation stats exported to {path}.")
+
+    def draw_hud(self, frame: np.ndarray, refresh: float = 0.5) -> None:
+        """Draw p50/p95/p99 per stage in the frame's top-right corner."""
+        if not (self.enabled and self.hud):
+            return
+        now = time.perf_counter()
+        if now - self._hud_updated > refresh:
+            self._hud_updated = now
+            stats = self.summary()
+            self._hud_lines = [
+                f"{stage:>14} {s['p50_ms']:6.1f} {s['p95_ms']:6.1f} {s['p99_ms']:6.1f}"
+                for stage, s in stats.items()
+            ]
+            frame_stats: Optional[Dict[str, float]] = stats.get("frame")
+            if frame_stats and frame_stats["mean_ms"] > 0:
+                self._hud_lines.append(f"fps {1000.0 / frame_stats['mean_ms']:.1f}")
+        x = frame.shape[1] - 330
+        for i, line in enumerate(
+            ["stage (ms)      p50    p95    p99"] + self._hud_lines
+        ):
+            cv2.putText(
+                frame,
+                line,
+                (x, 20 + 18 * i),
+                cv2.FONT_HERSHEY_PLAIN,
+                1.0,
+                (0, 255, 255),
+                1,
+            )
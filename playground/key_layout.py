@@ -0,0 +1,244 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class KeyLayout:
+    """Compact, array-backed store of key geometry and hit state.
+
+    Each row is a key. Rects are stored as ``(x0, y0, x1, y1)`` so all tracked
+    fingertips can be tested against all keys in a single broadcasted
+    comparison instead of a Python loop per key per hand.
+
+    Keys may also be arbitrary quads (seen through an angled camera, see
+    ``set_quads``). Their rects then hold the bounding boxes, and hit testing
+    looks each point up in precomputed per-pixel key index maps instead, one
+    for the white keys and one for the black keys.
+
+    Each numpy call costs a few microseconds however small its arrays, so on
+    a small keyboard (the default one has 7 keys) a plain loop over the keys
+    is faster: ``hit_test`` uses one up to ``SMALL_LAYOUT`` keys.
+    """
+
+    BLACK_PRIORITY = 1
+    WHITE_PRIORITY = 0
+    # Keys up to which rect hit testing runs as a Python loop
+    SMALL_LAYOUT = 16
+
+    def __init__(self, capacity: int = 8):
+        self.count = 0
+        self.version = 0  # bumped on every geometry change
+        self.key_versions = np.zeros(capacity, dtype=np.int64)  # version per key
+        self.rects = np.zeros((capacity, 4), dtype=np.int32)
+        self.quads = np.zeros((capacity, 4, 2), dtype=np.int32)  # TL, TR, BR, BL
+        self.warped = np.zeros(capacity, dtype=bool)  # quad is not the rect
+        self.label_map: Optional[np.ndarray] = None  # (2, h, w) white/black index
+        self.is_black = np.zeros(capacity, dtype=bool)
+        self.priorities = np.zeros(capacity, dtype=np.int32)
+        # Hit preference per key: priority first, then earlier layout order
+        self.ranks = np.zeros(capacity, dtype=np.int64)
+        self.cooldowns = np.zeros(capacity, dtype=np.float64)
+        self.last_hit = np.zeros(capacity, dtype=np.float64)
+        # (key, x0, y0, x1, y1, cooldown) in hit preference order, for the
+        # small-batch loop; rebuilt when ``version`` changes
+        self._ordered: List[Tuple[int, int, int, int, int, float]] = []
+        self._ordered_version = -1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(
+        self,
+        pos: Tuple[int, int],
+        size: Tuple[int, int],
+        key_type: str,
+        cooldown: float,
+    ) -> int:
+        """Append a key and return its row index."""
+        if self.count == len(self.rects):
+            self._grow(max(8, 2 * self.count))
+        index = self.count
+        self.count += 1
+        black = key_type == "black"
+        self.is_black[index] = black
+        self.set_rect(index, pos, size)
+        self.priorities[index] = self.BLACK_PRIORITY if black else self.WHITE_PRIORITY
+        n = self.count
+        self.ranks[:n] = self.priorities[:n] * n + (n - 1 - np.arange(n))
+        self.cooldowns[index] = cooldown
+        self.last_hit[index] = 0.0
+        return index
+
+    def set_rect(self, index: int, pos: Tuple[int, int], size: Tuple[int, int]) -> None:
+        """Move/resize a single key."""
+        x0, y0 = pos
+        w, h = size
+        self.rects[index] = (x0, y0, x0 + w, y0 + h)
+        self.quads[index] = ((x0, y0), (x0 + w, y0), (x0 + w, y0 + h), (x0, y0 + h))
+        self.warped[index] = False
+        if self.label_map is not None:
+            self._relabel(index)
+        self.version += 1
+        self.key_versions[index] = self.version
+
+    def set_quads(self, quads: np.ndarray, label_map: np.ndarray) -> None:
+        """Replace every key's geometry with calibrated quads.
+
+        ``label_map`` holds the frame-sized white and black key index maps the
+        hit test will use; see ``auto_calibration.label_map``.
+        """
+        n = self.count
+        quads = np.asarray(quads).round().astype(np.int32)[:n]
+        self.quads[:n] = quads
+        self.rects[:n, :2] = quads.min(axis=1)
+        self.rects[:n, 2:] = quads.max(axis=1)
+        self.warped[:n] = True
+        self.label_map = label_map
+        self.version += 1
+        self.key_versions[:n] = self.version
+
+    def _relabel(self, index: int) -> None:
+        """Redraw one key, now a plain rect, into the calibrated lookup.
+
+        The other calibrated keys keep their quads. Once no key is calibrated
+        any more the lookup is dropped and hit testing goes back to rects.
+        """
+        if not self.warped[: self.count].any():
+            self.label_map = None
+            return
+        plane = self.label_map[int(self.is_black[index])]
+        plane[plane == index] = -1
+        x0, y0, x1, y1 = self.rects[index]
+        plane[max(y0, 0) : y1 + 1, max(x0, 0) : x1 + 1] = index
+
+    def _grow(self, capacity: int) -> None:
+        for name in (
+            "rects",
+            "key_versions",
+            "quads",
+            "warped",
+            "is_black",
+            "priorities",
+            "ranks",
+            "cooldowns",
+            "last_hit",
+        ):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+
+    def hit_test(
+        self,
+        points: np.ndarray,
+        velocities: np.ndarray,
+        current_time: float,
+        velocity_threshold: float,
+    ) -> List[Tuple[int, int]]:
+        """Test every point against every key and register the hits.
+
+        ``points`` is an ``(M, 2)`` array of pixel positions and ``velocities``
+        the matching ``(M,)`` downward speeds. Each point hits at most one key:
+        black keys win over white keys, then the first key in layout order. A
+        key wanted by several points in the same call is only hit once, by the
+        first of them; the others hit nothing this time. Returns a list of
+        ``(point_index, key_index)`` pairs in point order.
+        """
+        n = self.count
+        points = np.asarray(points).reshape(-1, 2)
+        if n == 0 or len(points) == 0:
+            return []
+        if self.label_map is None and n <= self.SMALL_LAYOUT:
+            return self._hit_test_small(
+                points, velocities, current_time, velocity_threshold
+            )
+        # Only fingertips moving fast enough can hit anything
+        candidates = np.flatnonzero(np.asarray(velocities) > velocity_threshold)
+        if candidates.size == 0:
+            return []
+        if self.label_map is not None:
+            labels = self._lookup(points[candidates])
+            inside = (labels[:, :, None] == np.arange(n)).any(axis=1)
+        else:
+            rects = self.rects[:n]
+            x = points[candidates, 0:1]
+            y = points[candidates, 1:2]
+            inside = (
+                (rects[:, 0] <= x)
+                & (x <= rects[:, 2])
+                & (rects[:, 1] <= y)
+                & (y <= rects[:, 3])
+            )
+        ready = current_time - self.last_hit[:n] > self.cooldowns[:n]
+        valid = inside & ready
+        rows = np.flatnonzero(valid.any(axis=1))
+        if rows.size == 0:
+            return []
+
+        # Each point's preferred key, then each key to the first point on it
+        keys = np.where(valid[rows], self.ranks[:n], -1).argmax(axis=1)
+        first = self._first_per_key(keys)
+        hit_rows, key_indices = rows[first], keys[first]
+        self.last_hit[key_indices] = current_time
+        return list(
+            zip(candidates[hit_rows].tolist(), key_indices.tolist(), strict=True)
+        )
+
+    def _hit_test_small(
+        self,
+        points: np.ndarray,
+        velocities: np.ndarray,
+        current_time: float,
+        velocity_threshold: float,
+    ) -> List[Tuple[int, int]]:
+        """``hit_test`` on rects as a Python loop, same results."""
+        if self._ordered_version != self.version:
+            n = self.count
+            order = np.argsort(-self.ranks[:n], kind="stable").tolist()
+            rects = self.rects[:n].tolist()
+            cooldowns = self.cooldowns[:n].tolist()
+            self._ordered = [(key, *rects[key], cooldowns[key]) for key in order]
+            self._ordered_version = self.version
+        last_hit = self.last_hit[: self.count].tolist()
+        hits: List[Tuple[int, int]] = []
+        taken = set()
+        speeds = np.asarray(velocities).tolist()
+        for point, ((x, y), speed) in enumerate(
+            zip(points.tolist(), speeds, strict=True)
+        ):
+            if speed <= velocity_threshold:
+                continue
+            # The first ready key under the point is its preferred one
+            for key, x0, y0, x1, y1, cooldown in self._ordered:
+                if (
+                    x0 <= x <= x1
+                    and y0 <= y <= y1
+                    and current_time - last_hit[key] > cooldown
+                ):
+                    if key not in taken:
+                        taken.add(key)
+                        hits.append((point, key))
+                    break
+        for _, key in hits:
+            self.last_hit[key] = current_time
+        return hits
+
+    def _lookup(self, points: np.ndarray) -> np.ndarray:
+        """``(M, 2)`` white and black key index under each point, -1 for none."""
+        _, h, w = self.label_map.shape
+        x = np.floor(points[:, 0]).astype(np.intp)
+        y = np.floor(points[:, 1]).astype(np.intp)
+        on_frame = (x >= 0) & (x < w) & (y >= 0) & (y < h)
+        labels = np.full((len(points), 2), -1, dtype=np.intp)
+        labels[on_frame] = self.label_map[:, y[on_frame], x[on_frame]].T
+        return labels
+
+    @staticmethod
+    def _first_per_key(keys: np.ndarray) -> np.ndarray:
+        """Mask of the entries of ``keys`` that are the first for their key."""
+        # A stable sort keeps points of the same key in point order
+        order = np.argsort(keys, kind="stable")
+        ordered = keys[order]
+        first = np.empty(len(keys), dtype=bool)
+        first[order] = np.concatenate(([True], ordered[1:] != ordered[:-1]))
+        return first
@@ -0,0 +1,169 @@
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from playground.key import Key
+
+HIT_COLOR = (0, 255, 0)
+WHITE_COLOR = (255, 255, 255)
+BLACK_COLOR = (0, 0, 0)
+LABEL_COLOR = (255, 255, 255)
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+LABEL_SCALE = 0.6
+LABEL_THICKNESS = 2
+WHITE_BORDER = 4
+
+
+class KeyboardOverlay:
+    """Keyboard rendered once into a cached overlay image plus mask.
+
+    Each frame only composites the overlay onto the camera image with a single
+    masked copy. Keys whose highlight state changed since the last frame are
+    re-rendered in place, and so are keys that moved in the layout (where they
+    were and where they are now). The whole cache is rebuilt when the frame
+    size changes or most keys moved at once.
+    """
+
+    def __init__(self, keys: List[Key]):
+        self.keys = keys
+        self.layout = keys[0].layout if keys else None
+        self.overlay: Optional[np.ndarray] = None
+        self.mask: Optional[np.ndarray] = None
+        self.highlighted = np.zeros(len(keys), dtype=bool)
+        self.regions = np.zeros((len(keys), 4), dtype=np.int32)
+        self._shape: Optional[Tuple[int, ...]] = None
+        self._layout_version = -1
+        self._key_versions = np.full(len(keys), -1, dtype=np.int64)
+        # Painter's order: white keys first, then black keys on top
+        self._order = [i for i, k in enumerate(keys) if k.key_type == "white"] + [
+            i for i, k in enumerate(keys) if k.key_type != "white"
+        ]
+
+    def draw(self, frame: np.ndarray, current_time: float) -> None:
+        """Composite the keyboard onto ``frame``."""
+        if not self.keys:
+            return
+        if frame.shape != self._shape:
+            self.rebuild(frame.shape, current_time)
+        else:
+            if self.layout.version != self._layout_version:
+                self._update_moved(current_time)
+            highlighted = self._highlight_state(current_time)
+            for index in np.flatnonzero(highlighted != self.highlighted):
+                self.highlighted[index] = highlighted[index]
+                self._redraw_region(self.regions[index])
+        cv2.copyTo(self.overlay, self.mask, frame)
+
+    def rebuild(self, shape: Tuple[int, ...], current_time: float) -> None:
+        """Re-render the whole keyboard for a new frame size or layout."""
+        self._shape = shape
+        self._layout_version = self.layout.version
+        self._key_versions[:] = self.layout.key_versions[: len(self.keys)]
+        self.overlay = np.zeros(shape, dtype=np.uint8)
+        self.mask = np.zeros(shape[:2], dtype=np.uint8)
+        self.highlighted = self._highlight_state(current_time)
+        for index, key in enumerate(self.keys):
+            self.regions[index] = self._key_region(key)
+        self._render(self.overlay, self.mask, (0, 0), self._order)
+
+    def _update_moved(self, current_time: float) -> None:
+        """Redraw the old and new regions of keys moved since the last frame."""
+        versions = self.layout.key_versions[: len(self.keys)]
+        moved = np.flatnonzero(versions != self._key_versions)
+        if 2 * len(moved) > len(self.keys):
+            self.rebuild(self._shape, current_time)
+            return
+        self._layout_version = self.layout.version
+        self._key_versions[:] = versions
+        for index in moved:
+            old = self.regions[index].copy()
+            self.regions[index] = self._key_region(self.keys[index])
+            self._redraw_region(old)
+            self._redraw_region(self.regions[index])
+
+    def _highlight_state(self, current_time: float) -> np.ndarray:
+        n = len(self.keys)
+        return current_time - self.layout.last_hit[:n] < self.layout.cooldowns[:n]
+
+    def _key_region(self, key: Key) -> Tuple[int, int, int, int]:
+        """Bounding box of everything drawn for a key (rect, border, label)."""
+        (x0, y0), (w, h) = key.pos, key.size
+        (tw, th), baseline = cv2.getTextSize(
+            key.name, LABEL_FONT, LABEL_SCALE, LABEL_THICKNESS
+        )
+        pad = WHITE_BORDER
+        return (
+            x0 - pad,
+            min(y0 - pad, y0 - 10 - th - pad),
+            max(x0 + w, x0 + tw) + pad + 1,
+            max(y0 + h, y0 - 10 + baseline) + pad + 1,
+        )
+
+    def _redraw_region(self, region: np.ndarray) -> None:
+        """Clear a region and redraw every key overlapping it, in order."""
+        height, width = self.mask.shape
+        x0, y0 = max(int(region[0]), 0), max(int(region[1]), 0)
+        x1, y1 = min(int(region[2]), width), min(int(region[3]), height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        regions = self.regions
+        overlapping = [
+            i
+            for i in self._order
+            if regions[i, 0] < x1
+            and regions[i, 2] > x0
+            and regions[i, 1] < y1
+            and regions[i, 3] > y0
+        ]
+        overlay = self.overlay[y0:y1, x0:x1]
+        mask = self.mask[y0:y1, x0:x1]
+        overlay[:] = 0
+        mask[:] = 0
+        self._render(overlay, mask, (x0, y0), overlapping)
+
+    def _render(
+        self,
+        overlay: np.ndarray,
+        mask: np.ndarray,
+        origin: Tuple[int, int],
+        indices: List[int],
+    ) -> None:
+        """Draw keys into ``overlay``/``mask`` views whose top-left is ``origin``."""
+        ox, oy = origin
+        for index in indices:
+            key = self.keys[index]
+            (x, y), (w, h) = key.pos, key.size
+            x, y = x - ox, y - oy
+            if self.highlighted[index]:
+                color = HIT_COLOR
+            elif key.key_type == "white":
+                color = WHITE_COLOR
+            else:
+                color = BLACK_COLOR
+            thickness = -1 if key.key_type == "black" else WHITE_BORDER
+            if self.layout.warped[index]:
+                quad = self.layout.quads[index] - (ox, oy)
+                for image, ink in ((overlay, color), (mask, 255)):
+                    if thickness < 0:
+                        cv2.fillPoly(image, [quad], ink, cv2.LINE_8)
+                    else:
+                        cv2.polylines(image, [quad], True, ink, thickness, cv2.LINE_8)
+            else:
+                for image, ink in ((overlay, color), (mask, 255)):
+                    cv2.rectangle(
+                        image, (x, y), (x + w, y + h), ink, thickness, cv2.LINE_8
+                    )
+            for image, ink in ((overlay, LABEL_COLOR), (mask, 255)):
+                cv2.putText(
+                    image,
+                    key.name,
+                    (x, y - 10),
+                    LABEL_FONT,
+                    LABEL_SCALE,
+                    ink,
+                    LABEL_THICKNESS,
+                    cv2.LINE_8,
+                )
+        # Keep the mask binary even if the text renderer antialiases
+        cv2.threshold(mask, 127, 255, cv2.THRESH_BINARY, dst=mask)
@@ -0,0 +1,103 @@
+from typing import Any, Sequence
+
+import cv2
+import numpy as np
+
+NUM_LANDMARKS = 21
+FINGERTIPS = (4, 8, 12, 16, 20)  # thumb, index, middle, ring, pinky tips
+# MediaPipe's HAND_CONNECTIONS as a (21, 2) array of landmark index pairs
+HAND_BONES = np.array(
+    [
+        (0, 1), (1, 2), (2, 3), (3, 4),  # thumb
+        (0, 5), (5, 6), (6, 7), (7, 8),  # index
+        (5, 9), (9, 10), (10, 11), (11, 12),  # middle
+        (9, 13), (13, 14), (14, 15), (15, 16),  # ring
+        (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),  # pinky
+    ],
+    dtype=np.intp,
+)  # fmt: skip
+
+# Serialized landmark record: 0x0A, length, then x/y/z as a tag byte
+# (0x0D, 0x15, 0x1D) followed by a little-endian float32 each
+_RECORD_TAGS = ((0, 0x0A), (2, 0x0D), (7, 0x15), (12, 0x1D))
+_FLOAT_COLUMNS = np.r_[3:7, 8:12, 13:17]
+
+
+def landmarks_to_array(hand_landmarks: Any) -> np.ndarray:
+    """Convert one hand's landmarks to a ``(21, 3)`` float32 array.
+
+    MediaPipe landmark lists are protobuf messages where every landmark is
+    serialized as a fixed-size record, so the whole hand is decoded with a
+    single ``np.frombuffer`` instead of 63 attribute reads. Anything that does
+    not match that layout falls back to per-landmark access.
+    """
+    serialize = getattr(hand_landmarks, "SerializeToString", None)
+    if serialize is not None:
+        data = serialize()
+        record, remainder = divmod(len(data), NUM_LANDMARKS)
+        if (
+            remainder == 0
+            and record >= 17
+            and data[1] == record - 2
+            and all(
+                data[offset::record] == bytes((tag,)) * NUM_LANDMARKS
+                for offset, tag in _RECORD_TAGS
+            )
+        ):
+            rows = np.frombuffer(data, dtype=np.uint8).reshape(NUM_LANDMARKS, record)
+            return rows.take(_FLOAT_COLUMNS, axis=1).view("<f4")
+    return np.array(
+        [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32
+    )
+
+
+def array_to_landmarks(hand: np.ndarray) -> Any:
+    """Build a MediaPipe ``NormalizedLandmarkList`` from a ``(21, 3)`` array.
+
+    The inverse of ``landmarks_to_array``: the serialized records are laid
+    out with NumPy and parsed in one call, for results that crossed a process
+    boundary as plain arrays.
+    """
+    from mediapipe.framework.formats import landmark_pb2
+
+    rows = np.zeros((NUM_LANDMARKS, 17), dtype=np.uint8)
+    for offset, tag in _RECORD_TAGS:
+        rows[:, offset] = tag
+    rows[:, 1] = 15
+    rows[:, _FLOAT_COLUMNS] = (
+        np.ascontiguousarray(hand, dtype="<f4")
+        .view(np.uint8)
+        .reshape(NUM_LANDMARKS, 12)
+    )
+    return landmark_pb2.NormalizedLandmarkList.FromString(rows.tobytes())
+
+
+def fingertips(
+    hand: np.ndarray, width: int, height: int, tips=FINGERTIPS
+) -> np.ndarray:
+    """Pixel ``(len(tips), 2)`` positions of the fingertips of a ``(21, 3)`` hand."""
+    return hand[list(tips), :2] * np.array([width, height], dtype=np.float32)
+
+
+def draw_skeleton(
+    frame: np.ndarray,
+    hands: Sequence[np.ndarray],
+    bone_color=(255, 255, 255),
+    joint_color=(0, 0, 255),
+) -> None:
+    """Draw ``(21, 3)`` normalized hands onto ``frame``.
+
+    Every bone of every hand is drawn by one ``cv2.polylines`` call over
+    segments gathered with ``HAND_BONES``, instead of one line per connection
+    and per-landmark attribute reads as with MediaPipe's ``draw_landmarks``.
+    """
+    if not len(hands):
+        return
+    h, w = frame.shape[:2]
+    points = np.rint(
+        np.stack(hands)[..., :2] * np.array([w, h], dtype=np.float32)
+    ).astype(np.int32)
+    segments = points[:, HAND_BONES].reshape(-1, 2, 2)
+    cv2.polylines(frame, list(segments), False, bone_color, 2)
+    for x, y in points.reshape(-1, 2).tolist():
+        cv2.circle(frame, (x, y), 3, joint_color, -1)
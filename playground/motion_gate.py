@@ -0,0 +1,91 @@
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.store import STORE, ConfigStore
+from playground.key_layout import KeyLayout
+
+
+class MotionGate:
+    """Skips hand inference on frames where nothing moves over the keyboard.
+
+    The keyboard region (the key rects grown by ``margin``) is shrunk to at
+    most ``size`` pixels on its longest side, converted to grey, and compared
+    with the same thumbnail of the last frame that went through inference.
+    Inference runs when at least ``min_pixels`` thumbnail pixels changed by
+    more than ``pixel_threshold`` grey levels, so a frame with motion is
+    inferred itself, never one frame late. Comparing against the last
+    inferred frame rather than the previous one also catches motion too slow
+    to show between consecutive frames. Every ``max_skip`` skipped frames
+    inference runs anyway, to refresh tracking.
+    """
+
+    def __init__(
+        self,
+        layout: KeyLayout,
+        margin: float = 0.1,
+        size: int = 96,
+        pixel_threshold: int = 12,
+        min_pixels: int = 2,
+        max_skip: int = 15,
+        store: ConfigStore = STORE,
+    ):
+        self.layout = layout
+        self.store = store
+        self.margin = margin
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.min_pixels = min_pixels
+        self.max_skip = max_skip
+        self.reference: Optional[np.ndarray] = None
+        self.skipped = 0  # consecutive skipped frames
+        self.frames_checked = 0
+        self.frames_skipped = 0
+
+    def check(self, frame: np.ndarray, force: bool = False) -> bool:
+        """Whether ``frame`` needs inference; ``force`` to infer regardless."""
+        self.frames_checked += 1
+        thumbnail = self._thumbnail(frame)
+        run = (
+            force
+            or self.store.snapshot.calibration_mode  # calibration follows the fingertip
+            or self.reference is None
+            or self.reference.shape != thumbnail.shape
+            or self.skipped >= self.max_skip
+            or self._changed(thumbnail)
+        )
+        if run:
+            self.reference = thumbnail
+            self.skipped = 0
+        else:
+            self.skipped += 1
+            self.frames_skipped += 1
+        return run
+
+    def _changed(self, thumbnail: np.ndarray) -> bool:
+        diff = cv2.absdiff(thumbnail, self.reference)
+        return np.count_nonzero(diff > self.pixel_threshold) >= self.min_pixels
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        x0, y0, x1, y1 = self._region(frame.shape[1], frame.shape[0])
+        # An integer factor keeps INTER_AREA on its fast block-average path
+        factor = max(1, -(-max(x1 - x0, y1 - y0) // self.size))
+        w, h = max(1, (x1 - x0) // factor), max(1, (y1 - y0) // factor)
+        region = frame[y0 : y0 + h * factor, x0 : x0 + w * factor]
+        small = cv2.resize(region, (w, h), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def _region(self, w: int, h: int) -> Tuple[int, int, int, int]:
+        n = self.layout.count
+        if not n:
+            return 0, 0, w, h
+        rects = self.layout.rects[:n]
+        mx, my = int(self.margin * w), int(self.margin * h)
+        x0 = max(0, int(rects[:, 0].min()) - mx)
+        y0 = max(0, int(rects[:, 1].min()) - my)
+        x1 = min(w, int(rects[:, 2].max()) + mx)
+        y1 = min(h, int(rects[:, 3].max()) + my)
+        if x1 <= x0 or y1 <= y0:
+            return 0, 0, w, h
+        return x0, y0, x1, y1
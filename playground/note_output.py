@@ -0,0 +1,294 @@
+"""Note events over UDP, as OSC or raw MIDI, for driving an external synth.
+
+To see what the app sends, run a loopback receiver from the repository
+root::
+
+    python -m playground.note_output --listen 9000
+"""
+
+import argparse
+import heapq
+import logging
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from typing import Iterable, List, Optional, Protocol, Tuple, Union
+
+from playground.sound_bank import midi_to_note, note_to_midi
+
+logger = logging.getLogger(__name__)
+
+PROTOCOLS = ("osc", "midi")
+NOTE_ON = 0x90
+NOTE_OFF = 0x80
+OSC_BUNDLE = b"#bundle\0"
+OSC_IMMEDIATE = struct.pack(">II", 0, 1)  # OSC time tag meaning "now"
+
+# (note on?, MIDI note, velocity 0-127)
+NoteEvent = Tuple[bool, int, int]
+
+
+class NoteSink(Protocol):
+    """Anything notes can be played on: the audio engine or a ``NoteSender``."""
+
+    def note_on(
+        self, note: str, velocity: float = 1.0, timestamp: Optional[float] = None
+    ) -> None: ...
+
+
+class NoteOutputs:
+    """Plays every note on several sinks."""
+
+    def __init__(self, sinks: Iterable[NoteSink]):
+        self.sinks = list(sinks)
+
+    def note_on(
+        self, note: str, velocity: float = 1.0, timestamp: Optional[float] = None
+    ) -> None:
+        for sink in self.sinks:
+            sink.note_on(note, velocity, timestamp)
+
+
+def _osc_string(value: str) -> bytes:
+    data = value.encode() + b"\0"
+    return data + b"\0" * (-len(data) % 4)
+
+
+def osc_message(address: str, *args: Union[int, float, str]) -> bytes:
+    """Encode an OSC message with int32, float32 and string arguments."""
+    tags = ","
+    payload = b""
+    for arg in args:
+        if isinstance(arg, int):
+            tags += "i"
+            payload += struct.pack(">i", arg)
+        elif isinstance(arg, float):
+            tags += "f"
+            payload += struct.pack(">f", arg)
+        else:
+            tags += "s"
+            payload += _osc_string(arg)
+    return _osc_string(address) + _osc_string(tags) + payload
+
+
+def osc_bundle(messages: List[bytes]) -> bytes:
+    """Wrap OSC messages in one bundle to be applied at once."""
+    return (
+        OSC_BUNDLE
+        + OSC_IMMEDIATE
+        + b"".join(struct.pack(">i", len(message)) + message for message in messages)
+    )
+
+
+def decode_osc(packet: bytes) -> List[Tuple[str, list]]:
+    """Decode an OSC message or bundle into ``(address, args)`` pairs."""
+
+    def string(offset: int) -> Tuple[str, int]:
+        end = packet.index(b"\0", offset)
+        return packet[offset:end].decode(), end + 4 - (end - offset) % 4
+
+    if packet.startswith(OSC_BUNDLE):
+        messages, offset = [], 16
+        while offset < len(packet):
+            (size,) = struct.unpack_from(">i", packet, offset)
+            messages += decode_osc(packet[offset + 4 : offset + 4 + size])
+            offset += 4 + size
+        return messages
+    address, offset = string(0)
+    tags, offset = string(offset)
+    args: list = []
+    for tag in tags[1:]:
+        if tag in "if":
+            args.append(struct.unpack_from(">" + tag, packet, offset)[0])
+            offset += 4
+        elif tag == "s":
+            value, offset = string(offset)
+            args.append(value)
+    return [(address, args)]
+
+
+def decode_midi(data: bytes) -> List[Tuple[str, int, int, int]]:
+    """Decode raw note messages into ``(kind, channel, note, velocity)``."""
+    messages = []
+    for i in range(0, len(data) - 2, 3):
+        status, note, velocity = data[i : i + 3]
+        kind = "note_on" if status & 0xF0 == NOTE_ON and velocity else "note_off"
+        messages.append((kind, status & 0x0F, note, velocity))
+    return messages
+
+
+class NoteSender:
+    """Sends note-on/off events over UDP without ever blocking the caller.
+
+    ``note_on`` only appends to a queue and wakes the sender thread, which
+    waits ``batch_window`` seconds so the hits of one frame go out together,
+    then sends them as one datagram: an OSC bundle of ``{address}/note_on``
+    and ``{address}/note_off`` messages (``[note, velocity]`` int arguments),
+    or back-to-back raw MIDI note messages on ``channel``. Each note-on
+    schedules its note-off ``note_length`` seconds later; a note struck again
+    before then is turned off first. The socket is non-blocking, so when the
+    OS buffer is full the datagram is dropped and counted instead of waited
+    on.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9000,
+        protocol: str = "osc",
+        address: str = "/piano",
+        channel: int = 0,
+        note_length: float = 0.5,
+        batch_window: float = 0.001,
+    ):
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"Unknown note output protocol: {protocol}")
+        self.target = (host, port)
+        self.protocol = protocol
+        self.address = address
+        self.channel = channel
+        self.note_length = note_length
+        self.batch_window = batch_window
+        self.messages_sent = 0
+        self.datagrams_sent = 0
+        self.datagrams_dropped = 0
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._pending: deque = deque()  # (midi note, velocity 0-127)
+        self._offs: List[Tuple[float, int]] = []  # heap of (due time, midi note)
+        self._sounding: dict = {}  # midi note -> due time of its note-off
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: dict) -> "NoteSender":
+        settings = config["note_output"]
+        return cls(
+            settings["host"],
+            settings["port"],
+            settings["protocol"],
+            settings["address"],
+            settings["channel"],
+            settings["note_length"],
+        )
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="note-output", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Note output started: {self.protocol} to "
+            f"{self.target[0]}:{self.target[1]}."
+        )
+
+    def note_on(
+        self, note: str, velocity: float = 1.0, timestamp: Optional[float] = None
+    ) -> None:
+        """Queue a note-on (velocity 0-1); returns immediately."""
+        midi_velocity = max(1, min(127, round(velocity * 127)))
+        self._pending.append((note_to_midi(note), midi_velocity))
+        self._wake.set()
+
+    def close(self) -> None:
+        """Turn off every sounding note, stop the thread and close the socket."""
+        if self._running:
+            self._running = False
+            self._wake.set()
+            if self._thread:
+                self._thread.join(timeout=1.0)
+                self._thread = None
+            self._send([(False, note, 0) for note in self._sounding])
+            self._sounding.clear()
+            logger.info(
+                f"Note output stopped: {self.messages_sent} messages in "
+                f"{self.datagrams_sent} datagrams, "
+                f"{self.datagrams_dropped} dropped."
+            )
+        self._socket.close()
+
+    def _run(self) -> None:
+        while self._running:
+            timeout = None
+            if self._offs:
+                timeout = max(0.0, self._offs[0][0] - time.monotonic())
+            if self._wake.wait(timeout):
+                self._wake.clear()
+                if self._pending:
+                    time.sleep(self.batch_window)  # gather the rest of the frame
+            events: List[NoteEvent] = []
+            now = time.monotonic()
+            while self._offs and self._offs[0][0] <= now:
+                due, note = heapq.heappop(self._offs)
+                if self._sounding.get(note) == due:  # not re-struck since
+                    del self._sounding[note]
+                    events.append((False, note, 0))
+            while self._pending:
+                note, velocity = self._pending.popleft()
+                if note in self._sounding:
+                    events.append((False, note, 0))
+                due = now + self.note_length
+                self._sounding[note] = due
+                heapq.heappush(self._offs, (due, note))
+                events.append((True, note, velocity))
+            self._send(events)
+
+    def _send(self, events: List[NoteEvent]) -> None:
+        if not events:
+            return
+        if self.protocol == "osc":
+            messages = [
+                osc_message(f"{self.address}/{'note_on' if on else 'note_off'}", n, v)
+                for on, n, v in events
+            ]
+            data = messages[0] if len(messages) == 1 else osc_bundle(messages)
+        else:
+            data = bytes(
+                byte
+                for on, n, v in events
+                for byte in ((NOTE_ON if on else NOTE_OFF) | self.channel, n, v)
+            )
+        try:
+            self._socket.sendto(data, self.target)
+        except (BlockingIOError, OSError) as e:
+            self.datagrams_dropped += 1
+            logger.debug(f"Note output datagram dropped: {e}")
+            return
+        self.datagrams_sent += 1
+        self.messages_sent += len(events)
+
+
+def listen(port: int, protocol: str = "osc", host: str = "127.0.0.1") -> None:
+    """Print the note events arriving on ``port`` (a loopback test receiver)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind((host, port))
+        print(f"Listening for {protocol} on {host}:{port}")
+        while True:
+            data, _ = sock.recvfrom(65536)
+            if protocol == "osc":
+                for address, args in decode_osc(data):
+                    print(address, *args)
+            else:
+                for kind, channel, note, velocity in decode_midi(data):
+                    print(kind, channel, midi_to_note(note), velocity)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print received note events.")
+    parser.add_argument("--listen", type=int, default=9000, help="UDP port")
+    parser.add_argument("--protocol", choices=PROTOCOLS, default="osc")
+    args = parser.parse_args()
+    try:
+        listen(args.listen, args.protocol)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
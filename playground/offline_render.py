@@ -0,0 +1,132 @@
+"""Faster-than-real-time render of recordings to WAV.
+
+Run from the repository root::
+
+    python -m playground.offline_render recordings/session.vprec session.wav
+"""
+
+import argparse
+import logging
+import time
+import wave
+from typing import Dict, List
+
+import numpy as np
+
+from config.config import CONFIG
+from playground.recording_file import RecordingReader
+from playground.sound_bank import SoundBank, midi_to_note
+
+logger = logging.getLogger(__name__)
+
+
+def render_wav(
+    reader: RecordingReader,
+    sound_bank: SoundBank,
+    path: str,
+    volume: float = 1.0,
+    chunk_frames: int = 65536,
+) -> Dict[str, float]:
+    """Mix every note of a recording into a 16-bit WAV file.
+
+    Notes are mixed the same way the ``AudioEngine`` mixes voices (gain from
+    velocity, master volume, hard clip), but without a voice limit and
+    without waiting for the clock. Output is produced ``chunk_frames`` at a
+    time: only the notes sounding in the current chunk are kept, so memory
+    use does not grow with the length of the recording. The output length
+    comes from the sample lengths alone, so notes are only decoded to be
+    mixed. Returns a small report with the rendered length and the
+    speed relative to real time.
+    """
+    start = time.perf_counter()
+    rate = sound_bank.sample_rate
+    channels = sound_bank.channels
+    events = reader.events
+    times = events["time"]
+    # Ends with the last note to stop: each note's last onset plus its length
+    last = np.full(128, -1.0)
+    for chunk in reader.chunks():
+        np.maximum.at(last, chunk["note"], chunk["time"])
+    total = max(
+        (
+            round(float(last[note]) * rate) + sound_bank.frames(midi_to_note(note))
+            for note in np.flatnonzero(last >= 0).tolist()
+        ),
+        default=0,
+    )
+
+    mix = np.zeros((chunk_frames, channels), dtype=np.float32)
+    scratch = np.zeros((chunk_frames, channels), dtype=np.float32)
+    out = np.zeros((chunk_frames, channels), dtype=np.int16)
+    active: List[tuple] = []  # (onset frame, samples, gain)
+    next_event = 0
+    with wave.open(path, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        for chunk_start in range(0, total, chunk_frames):
+            chunk_end = min(chunk_start + chunk_frames, total)
+            while next_event < len(events):
+                onset = round(float(times[next_event]) * rate)
+                if onset >= chunk_end:
+                    break
+                note = midi_to_note(int(events["note"][next_event]))
+                gain = min(1.0, events["velocity"][next_event] / 127)
+                active.append((onset, sound_bank.buffer(note), gain))
+                next_event += 1
+
+            frames = chunk_end - chunk_start
+            mix[:frames] = 0.0
+            still_active = []
+            for onset, samples, gain in active:
+                begin = max(onset, chunk_start)
+                end = min(onset + len(samples), chunk_end)
+                if end > begin:
+                    n = end - begin
+                    part = scratch[:n]
+                    np.multiply(samples[begin - onset : end - onset], gain, out=part)
+                    mix[begin - chunk_start : end - chunk_start] += part
+                if onset + len(samples) > chunk_end:
+                    still_active.append((onset, samples, gain))
+            active = still_active
+
+            block = mix[:frames]
+            np.multiply(block, volume * 32767.0, out=block)
+            np.clip(block, -32768.0, 32767.0, out=block)
+            out[:frames] = block
+            f.writeframes(out[:frames].tobytes())
+
+    elapsed = time.perf_counter() - start
+    seconds = total / rate
+    logger.info(f"Rendered {len(events)} notes ({seconds:.1f} s) to {path}.")
+    return {
+        "notes": len(events),
+        "seconds": seconds,
+        "render_seconds": elapsed,
+        "realtime_factor": seconds / elapsed if elapsed else float("inf"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render a recording to WAV.")
+    parser.add_argument("recording", help="recording file (.vprec)")
+    parser.add_argument("output", help="WAV file to write")
+    parser.add_argument("--volume", type=float, default=CONFIG["volume"])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    report = render_wav(
+        RecordingReader(args.recording),
+        SoundBank.from_config(CONFIG),
+        args.output,
+        volume=args.volume,
+    )
+    print(
+        f"{report['seconds']:.1f} s of audio rendered in "
+        f"{report['render_seconds']:.2f} s "
+        f"({report['realtime_factor']:.0f}x real time)"
+    )
+
+
+if __name__ == "__main__":
+    main()
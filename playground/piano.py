@@ -1,61 +1,133 @@
-from typing import Tuple, List
+from typing import Callable, Iterable, Tuple, List, Optional
 import numpy as np
-import asyncio
 
 from playground.key import Key
+from playground.key_layout import KeyLayout
+from playground.keyboard_overlay import KeyboardOverlay
 from config.config import CONFIG
+from config.store import STORE
 from playground.recorder import Recorder
+from playground.note_output import NoteSink
 
 
 class Piano:
     """Manages a collection of piano keys."""
 
-    def __init__(self, frame_dim: Tuple[int, int]):
+    def __init__(
+        self,
+        frame_dim: Tuple[int, int],
+        engine: NoteSink,
+        key_configs: Optional[List[dict]] = None,
+    ):
+        self.engine = engine
         self.keys: List[Key] = []
         self.keys_dict = {}  # Dict for quick access by name
-        w, h = frame_dim
-        for key_config in CONFIG["keys"]:
-            pos = (int(w * key_config["pos"][0]), int(h * key_config["pos"][1]))
-            size = key_config["size"]
+        # Geometry is derived from these (normalized pos, pixel size) on
+        # frame size or calibration changes; see update_layout
+        self.key_configs = CONFIG["keys"] if key_configs is None else key_configs
+        self.frame_dim = tuple(frame_dim)
+        self.layout = KeyLayout(len(self.key_configs))
+        for key_config in self.key_configs:
+            pos, size = self._pixel_rect(key_config)
             key = Key(
                 key_config["name"],
                 pos,
                 size,
-                key_config["sound"],
+                engine,
                 CONFIG["key_cooldown"],
                 key_config["type"],
+                self.layout,
             )
             self.keys.append(key)
             self.keys_dict[key_config["name"]] = key
+        self.overlay = KeyboardOverlay(self.keys)
+        # Called with (key name, time) for every note played
+        self.note_listeners: List[Callable[[str, float], None]] = []
 
-    def draw(self, frame: np.ndarray) -> None:
-        """Draw all keys on the frame, white keys first, then black."""
-        current_time = asyncio.get_event_loop().time()
-        for key in self.keys:
-            if key.key_type == "white":
-                key.draw(frame, current_time)
-        for key in self.keys:
-            if key.key_type == "black":
-                key.draw(frame, current_time)
-
-    def interact(
-        self, hand_pos: Tuple[int, int], hand_vel: float, recorder: "Recorder"
-    ) -> None:
-        """Check for interactions with all keys, prioritizing black keys."""
-        current_time = asyncio.get_event_loop().time()
-        hit = False
-        # Check black keys first
-        for key in self.keys:
-            if key.key_type == "black" and key.check_hit(
-                hand_pos, hand_vel, current_time, CONFIG["sensitivity"]
-            ):
-                recorder.record_note(key.name)
-                hit = True
-                break
-        if not hit:
-            for key in self.keys:
-                if key.key_type == "white" and key.check_hit(
-                    hand_pos, hand_vel, current_time, CONFIG["sensitivity"]
-                ):
-                    recorder.record_note(key.name)
-                    break
+    def draw(self, frame: np.ndarray, current_time: float) -> None:
+        """Composite the cached keyboard overlay onto the frame."""
+        self.overlay.draw(frame, current_time)
+
+    def _pixel_rect(self, key_config: dict) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        w, h = self.frame_dim
+        pos = (int(w * key_config["pos"][0]), int(h * key_config["pos"][1]))
+        size = key_config["size"]
+        return pos, (int(size[0]), int(size[1]))
+
+    def update_layout(
+        self,
+        frame_dim: Optional[Tuple[int, int]] = None,
+        indices: Optional[Iterable[int]] = None,
+    ) -> int:
+        """Re-derive key rects from ``key_configs`` and return how many moved.
+
+        Called after manual calibration edits a key config (pass its index)
+        or when the frame size changes (pass the new size). Only keys whose
+        pixel rect actually changed are written to the layout, so hit testing
+        picks them up immediately and the overlay redraws just those keys;
+        samples stay loaded, since keys play by name through the engine. Keys
+        placed by auto calibration go back to their configured rects.
+        """
+        if frame_dim is not None:
+            self.frame_dim = tuple(frame_dim)
+        if indices is None:
+            indices = range(len(self.keys))
+        moved = 0
+        for index in indices:
+            key = self.keys[index]
+            pos, size = self._pixel_rect(self.key_configs[index])
+            if key.pos != pos or key.size != size or self.layout.warped[key.index]:
+                self.layout.set_rect(key.index, pos, size)
+                moved += 1
+        return moved
+
+    def apply_calibration(self, quads: np.ndarray, label_map: np.ndarray) -> None:
+        """Use auto-calibrated key quads (frame pixels) and their lookup map."""
+        self.layout.set_quads(quads, label_map)
+
+    def interact_many(
+        self,
+        points: np.ndarray,
+        velocities: np.ndarray,
+        recorder: "Recorder",
+        current_time: float,
+        predicted: Optional[np.ndarray] = None,
+        threshold: Optional[float] = None,
+    ) -> List[Key]:
+        """Hit-test all tracked points against all keys in one batch.
+
+        ``predicted`` optionally holds where each point is expected to be one
+        frame later; points that hit nothing now may fire early from there.
+        """
+        if threshold is None:
+            threshold = STORE.snapshot.sensitivity
+        hits = self.layout.hit_test(points, velocities, current_time, threshold)
+        if predicted is not None:
+            missed = np.setdiff1d(np.arange(len(points)), [p for p, _ in hits])
+            if missed.size:
+                early = self.layout.hit_test(
+                    predicted[missed], velocities[missed], current_time, threshold
+                )
+                hits += [(int(missed[p]), k) for p, k in early]
+        played = []
+        for point_index, key_index in hits:
+            key = self.keys[key_index]
+            velocity = hit_velocity(velocities[point_index], threshold)
+            if key.play(velocity):
+                recorder.record_note(key.name, velocity)
+                played.append(key)
+                for listener in self.note_listeners:
+                    listener(key.name, current_time)
+        return played
+
+
+def hit_velocity(speed: float, threshold: float) -> float:
+    """Note velocity (0-1) for a hit at ``speed``, from ``CONFIG["dynamics"]``.
+
+    Just above ``threshold`` gives the minimum velocity, ``full_speed`` and
+    faster give 1.0, linearly in between.
+    """
+    dynamics = CONFIG["dynamics"]
+    span = max(dynamics["full_speed"] - threshold, 1e-6)
+    amount = min(max((float(speed) - threshold) / span, 0.0), 1.0)
+    return dynamics["min"] + (1.0 - dynamics["min"]) * amount
@@ -0,0 +1,283 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Generic, NamedTuple, Optional, TypeVar
+
+import cv2
+import numpy as np
+
+from playground.frame_buffers import FrameBuffers
+from playground.inference_pool import InferenceClient, to_result
+from playground.instrumentation import Instrumentation
+from playground.motion_gate import MotionGate
+from playground.quality_governor import QualityGovernor
+from playground.roi import InferenceROI
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class FramePacket(NamedTuple):
+    """A captured frame travelling through the pipeline."""
+
+    seq: int
+    timestamp: float  # pipeline clock right after the frame was read
+    frame: np.ndarray  # mirrored BGR frame
+    result: Any = None  # MediaPipe result, filled by the inference stage
+    slot: int = -1  # FrameBuffers or InferenceClient slot holding the frame
+    gated: bool = False  # inference skipped by the motion gate
+
+
+class LatestQueue(Generic[T]):
+    """Single-slot queue where a newer item replaces any unread one."""
+
+    def __init__(self, on_drop: Optional[Callable[[T], None]] = None):
+        self.on_drop = on_drop
+        self._item: Optional[T] = None
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item: T) -> None:
+        """Store an item, dropping the previous one if nobody read it."""
+        with self._cond:
+            dropped, self._item = self._item, item
+            self._cond.notify()
+        if dropped is not None:
+            self.dropped += 1
+            if self.on_drop:
+                self.on_drop(dropped)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[T]:
+        """Take the newest item, waiting up to ``timeout`` seconds for one."""
+        with self._cond:
+            if self._item is None and not self._closed:
+                self._cond.wait(timeout)
+            item, self._item = self._item, None
+            return item
+
+    def close(self) -> None:
+        """Wake up any waiting reader."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class FramePipeline:
+    """Capture -> inference -> render pipeline joined by latest-frame-wins queues.
+
+    The capture thread keeps reading from the camera, the inference thread runs
+    MediaPipe on the newest captured frame, and the render stage (the caller of
+    ``latest``) always gets the newest processed frame. Stale frames are dropped
+    instead of queued, so a slow ``Hands.process`` never builds up a backlog.
+
+    With an ``InferenceClient`` the capture thread writes each frame straight
+    into a shared-memory slot and inference runs in worker processes; the
+    second thread only collects their results in frame order.
+
+    With a ``MotionGate``, frames with no motion over the keyboard skip
+    inference and are passed on marked ``gated``. A ``QualityGovernor`` is
+    fed the inference stage's time per frame, the stage that has to keep up.
+
+    Every packet carries the time its frame was read, from ``clock``, so the
+    render stage can time hand motion by capture rather than by arrival,
+    whatever the queue and inference delay.
+
+    Failed camera reads are retried with a growing delay; after
+    ``source_timeout`` seconds without a frame the capture thread gives up
+    and sets ``source_lost``.
+
+    Frames are captured, mirrored and converted into reused ``FrameBuffers``
+    (or the client's shared-memory ring), so the pipeline allocates no
+    full-size images per frame.
+    """
+
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        hands: Any,
+        instrumentation: Optional[Instrumentation] = None,
+        roi: Optional[InferenceROI] = None,
+        pool: Optional[InferenceClient] = None,
+        gate: Optional[MotionGate] = None,
+        governor: Optional[QualityGovernor] = None,
+        clock: Callable[[], float] = time.monotonic,
+        source_timeout: float = 2.0,
+    ):
+        self.cap = cap
+        self.hands = hands
+        self.roi = roi
+        self.pool = pool
+        self.gate = gate
+        self.governor = governor
+        self.clock = clock
+        self.source_timeout = source_timeout
+        self.source_lost = False
+        self.instrumentation = instrumentation or Instrumentation()
+        # In flight at most: one being captured, one in each queue, one in
+        # inference and the one delivered to the render stage
+        self.buffers = FrameBuffers(slots=5)
+        self.captured: LatestQueue[FramePacket] = LatestQueue(self._release)
+        self.processed: LatestQueue[FramePacket] = LatestQueue(self._release)
+        self._delivered: Optional[FramePacket] = None
+        # seq -> (capture time, frame) of frames submitted to the pool
+        self._submitted: dict = {}
+        self.running = False
+        self.frames_captured = 0
+        self.frames_inferred = 0
+        self._threads: list = []
+
+    def start(self) -> None:
+        """Start the capture and inference threads."""
+        if self.running:
+            return
+        self.running = True
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(
+                target=self._collect_loop if self.pool else self._inference_loop,
+                name="inference",
+                daemon=True,
+            ),
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info("Frame pipeline started.")
+
+    def latest(self, timeout: Optional[float] = None) -> Optional[FramePacket]:
+        """Return the newest processed frame, or None if none arrived in time.
+
+        The frame returned by the previous call is no longer valid after this.
+        """
+        packet = self.processed.get(timeout)
+        if packet is not None:
+            if self._delivered is not None:
+                self._release(self._delivered)
+            self._delivered = packet
+        return packet
+
+    def _release(self, packet: FramePacket) -> None:
+        if packet.slot < 0:
+            return
+        if self.pool:
+            self.pool.release(packet.slot)
+        else:
+            self.buffers.release(packet.slot)
+
+    def stop(self) -> None:
+        """Stop both worker threads and wait for them to exit."""
+        if not self.running:
+            return
+        self.running = False
+        self.captured.close()
+        self.processed.close()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+        logger.info(
+            f"Frame pipeline stopped: {self.frames_captured} captured, "
+            f"{self.frames_inferred} inferred, "
+            f"{self.captured.dropped + self.processed.dropped} dropped."
+        )
+
+    def _capture_loop(self) -> None:
+        seq = 0
+        failures = 0
+        failing_since = 0.0
+        stats = self.instrumentation
+        while self.running:
+            start = time.perf_counter()
+            ret, frame = self.buffers.read(self.cap)
+            stats.record("camera_read", time.perf_counter() - start)
+            if not ret:
+                if not failures:
+                    failing_since = time.monotonic()
+                    logger.warning("Failed to read frame from camera, retrying.")
+                failures += 1
+                if time.monotonic() - failing_since >= self.source_timeout:
+                    logger.error(
+                        f"No frame from the camera for {self.source_timeout:.1f} s "
+                        f"({failures} failed reads): capture stopped."
+                    )
+                    self.source_lost = True
+                    self.processed.close()  # wake the render stage up
+                    return
+                # 10 ms, doubling up to 250 ms
+                time.sleep(min(0.01 * 2 ** min(failures - 1, 5), 0.25))
+                continue
+            if failures:
+                logger.info(f"Camera read again after {failures} failed reads.")
+                failures = 0
+            timestamp = self.clock()
+            seq += 1
+            self.frames_captured += 1
+            if self.pool:
+                self._submit(seq, timestamp, frame)
+                continue
+            slot = self.buffers.acquire()
+            if slot is None:
+                continue  # every buffer is busy: drop this frame
+            mirrored = self.buffers.mirror(frame, slot)
+            self.captured.put(FramePacket(seq, timestamp, mirrored, None, slot))
+
+    def _submit(self, seq: int, timestamp: float, frame: np.ndarray) -> None:
+        if frame.shape != self.pool.shape:
+            # cv2.flip would silently write a new array instead of the ring
+            logger.info(f"Frame size changed to {frame.shape}: new frame ring.")
+            self.pool.resize(frame.shape)
+        slot = self.pool.acquire()
+        if slot is None:
+            return  # every slot is busy: drop this frame
+        # Mirror straight into shared memory; workers read it from there
+        mirrored = cv2.flip(frame, 1, dst=self.pool.frame(slot))
+        if self.gate and not self.gate.check(mirrored, force=self.pool.in_flight > 0):
+            # Only skipped while nothing is in flight, so frames stay in order
+            self.processed.put(FramePacket(seq, timestamp, mirrored, None, slot, True))
+            return
+        self._submitted[seq] = (timestamp, mirrored)
+        h, w = frame.shape[:2]
+        box = self.roi.plan(w, h) if self.roi else None
+        self.pool.submit(seq, slot, box, self.roi.max_side if self.roi else 0)
+
+    def _inference_loop(self) -> None:
+        stats = self.instrumentation
+        while self.running:
+            packet = self.captured.get(timeout=0.1)
+            if packet is None:
+                continue
+            if self.gate and not self.gate.check(packet.frame):
+                self.processed.put(packet._replace(gated=True))
+                continue
+            try:
+                start = time.perf_counter()
+                rgb = self.buffers.rgb(packet.frame)
+                converted = time.perf_counter()
+                if self.roi:
+                    result = self.roi.process(self.hands, rgb)
+                else:
+                    result = self.hands.process(rgb)
+                done = time.perf_counter()
+                stats.record("preprocess", converted - start)
+                stats.record("hands_process", done - converted)
+                if self.governor:
+                    self.governor.observe(done - start)
+            except (RuntimeError, ValueError, cv2.error) as e:
+                logger.error(f"Hand inference failed: {e}", exc_info=True)
+                self._release(packet)
+                continue
+            self.frames_inferred += 1
+            self.processed.put(packet._replace(result=result))
+
+    def _collect_loop(self) -> None:
+        stats = self.instrumentation
+        while self.running:
+            for seq, slot, landmarks, labels, seconds in self.pool.results(0.1):
+                # The frame submitted, which may be in a ring resized since
+                timestamp, frame = self._submitted.pop(seq)
+                result = to_result(landmarks, labels)
+                if self.roi:
+                    self.roi.track(result, frame.shape[1], frame.shape[0])
+                stats.record("hands_process", seconds)
+                self.frames_inferred += 1
+                self.processed.put(FramePacket(seq, timestamp, frame, result, slot))
@@ -0,0 +1,205 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from playground.recording_file import RecordingReader
+
+logger = logging.getLogger(__name__)
+
+PlayCallback = Callable[[int, int, float], None]  # midi note, velocity, deadline
+
+
+class PlaybackScheduler:
+    """Plays a recording from a dedicated timer thread against absolute deadlines.
+
+    Every event's deadline is computed from a fixed anchor (wall time, song
+    position), never by accumulating sleeps, so timing errors do not add up
+    over a long recording. The thread sleeps until shortly before the next
+    deadline (waking early for seeks and tempo changes), spins for the last
+    ``spin`` seconds, and then dispatches together every event due within
+    ``batch_window`` (one audio block), so chords land in the same buffer.
+    Only events within ``lookahead`` seconds are read from the memory-mapped
+    recording at a time. The dispatch error of every batch is kept as timing
+    jitter. With ``loop`` each pass starts ``loop_gap`` seconds (of the
+    recording) after the last event of the previous one.
+    """
+
+    def __init__(
+        self,
+        reader: RecordingReader,
+        play: PlayCallback,
+        lookahead: float = 0.1,
+        batch_window: float = 0.005,
+        spin: float = 0.002,
+        tempo: float = 1.0,
+        loop: bool = False,
+        on_finished: Optional[Callable[[], None]] = None,
+        loop_gap: float = 0.5,
+    ):
+        if tempo <= 0:
+            raise ValueError("Tempo must be positive")
+        if loop_gap <= 0:
+            raise ValueError("Loop gap must be positive")
+        self.reader = reader
+        self.play = play
+        self.lookahead = lookahead
+        self.batch_window = batch_window
+        self.spin = spin
+        self.loop = loop
+        self.loop_gap = loop_gap
+        self.on_finished = on_finished
+        self.jitter: deque = deque(maxlen=4096)  # |dispatch - deadline| (s)
+        self.notes_played = 0
+
+        self._times = reader.events["time"]
+        self._tempo = tempo
+        self._anchor_wall = 0.0
+        self._anchor_pos = 0.0
+        self._index = 0
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def tempo(self) -> float:
+        return self._tempo
+
+    @property
+    def position(self) -> float:
+        """Current song position in seconds of the recording."""
+        with self._cond:
+            return self._position(time.monotonic())
+
+    def start(self, position: float = 0.0) -> None:
+        """Start playing from ``position`` seconds into the recording."""
+        if self._running:
+            return
+        with self._cond:
+            self._set_anchor(time.monotonic(), position)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="playback", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop playing and wait for the timer thread to exit."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def seek(self, position: float) -> None:
+        """Jump to ``position`` seconds into the recording."""
+        with self._cond:
+            self._set_anchor(time.monotonic(), position)
+            self._cond.notify()
+
+    def set_tempo(self, tempo: float) -> None:
+        """Change the playback speed (1.0 is as recorded) without a jump."""
+        if tempo <= 0:
+            raise ValueError("Tempo must be positive")
+        with self._cond:
+            now = time.monotonic()
+            position = self._position(now)
+            self._tempo = tempo
+            self._set_anchor(now, position)
+            self._cond.notify()
+
+    def jitter_stats(self) -> Dict[str, float]:
+        """Mean/p95/max absolute dispatch error in milliseconds."""
+        if not self.jitter:
+            return {}
+        values = np.array(self.jitter) * 1000.0
+        return {
+            "mean_ms": float(values.mean()),
+            "p95_ms": float(np.percentile(values, 95)),
+            "max_ms": float(values.max()),
+        }
+
+    def _position(self, now: float) -> float:
+        return self._anchor_pos + (now - self._anchor_wall) * self._tempo
+
+    def _deadline(self, event_time: float) -> float:
+        return self._anchor_wall + (event_time - self._anchor_pos) / self._tempo
+
+    def _set_anchor(self, wall: float, position: float) -> None:
+        position = max(0.0, position)
+        self._anchor_wall = wall
+        self._anchor_pos = position
+        self._index = int(np.searchsorted(self._times, position, side="left"))
+
+    def _run(self) -> None:
+        times = self._times
+        count = len(times)
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                if self._index >= count:
+                    if not self.loop or not count:
+                        break
+                    # Restart where the previous pass ends, never at once: a
+                    # recording of a single chord would replay it in a tight loop
+                    end = self._deadline(
+                        max(self.reader.duration + self.loop_gap, self._anchor_pos)
+                    )
+                    self._set_anchor(end, 0.0)
+                    continue
+                deadline = self._deadline(float(times[self._index]))
+                wait = deadline - time.monotonic() - self.spin
+                if wait > 0:
+                    self._cond.wait(min(wait, self.lookahead))
+                    continue
+                # Read the events due within the lookahead window
+                horizon = (
+                    self._anchor_pos
+                    + (deadline + self.lookahead - self._anchor_wall) * self._tempo
+                )
+                end = int(np.searchsorted(times, horizon, side="right"))
+                window = self.reader.events[self._index : max(end, self._index + 1)]
+                anchor_wall, anchor_pos, tempo = (
+                    self._anchor_wall,
+                    self._anchor_pos,
+                    self._tempo,
+                )
+
+            while time.monotonic() < deadline:
+                pass  # spin for the last fraction of a millisecond
+
+            batch_end = deadline + self.batch_window
+            dispatched = 0
+            for event_time, note, velocity in zip(
+                window["time"].tolist(),
+                window["note"].tolist(),
+                window["velocity"].tolist(),
+                strict=True,
+            ):
+                event_deadline = anchor_wall + (event_time - anchor_pos) / tempo
+                if event_deadline > batch_end:
+                    break
+                self.play(note, velocity, event_deadline)
+                dispatched += 1
+            self.jitter.append(abs(time.monotonic() - deadline))
+            self.notes_played += dispatched
+
+            with self._cond:
+                # Skip ahead unless a seek or tempo change moved the anchor
+                if (self._anchor_wall, self._anchor_pos, self._tempo) == (
+                    anchor_wall,
+                    anchor_pos,
+                    tempo,
+                ):
+                    self._index += dispatched
+
+        self._running = False
+        if self.on_finished:
+            self.on_finished()
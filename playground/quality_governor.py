@@ -0,0 +1,229 @@
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveHands:
+    """MediaPipe ``Hands`` whose settings can change while frames keep coming.
+
+    Images larger than ``max_side`` (0 for no limit) are shrunk before
+    inference; landmarks are normalized, so nothing has to be mapped back.
+    Model complexity and confidences are fixed when ``Hands`` is created, so
+    ``configure`` with new ``hands_kwargs`` loads a new instance with
+    ``loader`` on a background thread, and ``process`` keeps using the
+    current one until the new one is ready.
+    """
+
+    def __init__(
+        self,
+        hands: Any,
+        hands_kwargs: Dict[str, Any],
+        loader: Callable[[Dict[str, Any]], Any],
+        max_side: int = 0,
+    ):
+        self.hands = hands
+        self.hands_kwargs = dict(hands_kwargs)
+        self.loader = loader
+        self.max_side = max_side
+        self._buffer: Optional[np.ndarray] = None  # reused downscaled image
+        self._pending: Optional[Future] = None
+        self._pending_kwargs: Dict[str, Any] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hands")
+
+    @property
+    def loading(self) -> bool:
+        """Whether a reconfigured ``Hands`` is still being loaded."""
+        return self._pending is not None
+
+    def configure(self, max_side: int, **hands_kwargs) -> None:
+        """Use ``max_side`` from now on and ``hands_kwargs`` once loaded."""
+        self.max_side = max_side
+        wanted = {**self.hands_kwargs, **hands_kwargs}
+        if self._pending is not None:
+            if wanted == self._pending_kwargs:
+                return
+            _discard(self._pending)  # superseded before it was used
+            self._pending = None
+        if wanted == self.hands_kwargs:
+            return
+        self._pending_kwargs = wanted
+        self._pending = self._executor.submit(self.loader, wanted)
+
+    def process(self, rgb: np.ndarray) -> Any:
+        if self._pending is not None and self._pending.done():
+            self._swap()
+        h, w = rgb.shape[:2]
+        if self.max_side and max(w, h) > self.max_side:
+            scale = self.max_side / max(w, h)
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            self._buffer = cv2.resize(
+                rgb, size, dst=self._buffer, interpolation=cv2.INTER_AREA
+            )
+            rgb = self._buffer
+        return self.hands.process(rgb)
+
+    def _swap(self) -> None:
+        future, self._pending = self._pending, None
+        if future.cancelled():
+            return
+        try:
+            hands = future.result()
+        except (RuntimeError, ValueError, OSError) as e:
+            logger.error(
+                f"Failed to load hands with {self._pending_kwargs}: {e}", exc_info=True
+            )
+            return
+        self.hands.close()
+        self.hands = hands
+        self.hands_kwargs = self._pending_kwargs
+        logger.info(f"Hands reloaded: {self.hands_kwargs}.")
+
+    def close(self) -> None:
+        if self._pending is not None:
+            _discard(self._pending)
+            self._pending = None
+        self._executor.shutdown(wait=False)
+        self.hands.close()
+
+
+def _discard(future: Future) -> None:
+    """Cancel loading ``Hands``, or close them once loaded if already started."""
+    if future.cancel():
+        return
+
+    def close(done: Future) -> None:
+        if done.exception() is None:
+            done.result().close()
+
+    future.add_done_callback(close)
+
+
+def level_kwargs(base: Dict[str, Any], level: Dict[str, Any]) -> Dict[str, Any]:
+    """``Hands`` arguments for a governor level: ``base`` plus its overrides."""
+    return {**base, **{k: v for k, v in level.items() if k != "max_side"}}
+
+
+class QualityGovernor:
+    """Steps hand inference quality up or down to stay within a frame budget.
+
+    ``levels`` go from best to cheapest; each is a dict with ``max_side``
+    (see ``AdaptiveHands``) and any ``Hands`` arguments to override, such as
+    ``model_complexity`` and ``min_tracking_confidence``. ``observe`` takes
+    the work time of every frame. Once ``hold`` frames have passed since the
+    last change, the 90th percentile of the last ``window`` frames is
+    compared with ``budget``: above ``downgrade_at`` times the budget the
+    next cheaper level is used, below ``upgrade_at`` times the next better
+    one. No decision is taken while a new model is loading.
+
+    Besides the gap between the two thresholds and the hold, flapping is
+    avoided by learning how much more each level costs than the next one,
+    from the load measured on both sides of every change: an upgrade whose
+    predicted load would exceed ``downgrade_at`` is not made.
+    """
+
+    def __init__(
+        self,
+        hands: AdaptiveHands,
+        levels: List[Dict[str, Any]],
+        budget: float,
+        window: int = 30,
+        hold: int = 60,
+        downgrade_at: float = 1.0,
+        upgrade_at: float = 0.6,
+        level: int = 0,
+    ):
+        self.hands = hands
+        self.levels = levels
+        self.budget = budget
+        self.window = window
+        self.hold = hold
+        self.downgrade_at = downgrade_at
+        self.upgrade_at = upgrade_at
+        self.level = -1
+        self.changes = 0
+        # cost_ratios[i]: load at level i over load at level i + 1, once seen
+        self.cost_ratios: List[Optional[float]] = [None] * (len(levels) - 1)
+        self._samples: deque = deque(maxlen=window)
+        self._since_change = 0
+        self._before: Optional[Tuple[int, float]] = None  # (level, load) left
+        self.set_level(level)
+
+    @classmethod
+    def from_config(cls, hands: AdaptiveHands, config: dict) -> "QualityGovernor":
+        settings = config["quality_governor"]
+        return cls(
+            hands,
+            settings["levels"],
+            1.0 / (settings["target_fps"] or config["fps"]),
+            settings["window"],
+            settings["hold"],
+            settings["downgrade_at"],
+            settings["upgrade_at"],
+            settings["start_level"],
+        )
+
+    def observe(self, seconds: float) -> None:
+        """Record one frame's work time and change level if warranted."""
+        self._since_change += 1
+        if self.hands.loading:
+            self._samples.clear()  # only judge frames of the model in use
+            return
+        self._samples.append(seconds)
+        if len(self._samples) < self.window:
+            return
+        load = sorted(self._samples)[int(0.9 * (self.window - 1))] / self.budget
+        if self._before is not None:
+            self._learn(load)
+        if self._since_change < self.hold:
+            return
+        if load > self.downgrade_at and self.level < len(self.levels) - 1:
+            self.set_level(self.level + 1, load)
+        elif load < self.upgrade_at and self.level > 0:
+            ratio = self.cost_ratios[self.level - 1]
+            if ratio is None or load * ratio <= self.downgrade_at:
+                self.set_level(self.level - 1, load)
+
+    def _learn(self, load: float) -> None:
+        """Cost ratio of the levels on both sides of the last change."""
+        level, before = self._before
+        self._before = None
+        better, worse = (before, load) if level < self.level else (load, before)
+        if worse > 0:
+            # Never assume a better level is cheaper, whatever the noise
+            self.cost_ratios[min(level, self.level)] = max(1.0, better / worse)
+
+    def set_level(self, level: int, load: Optional[float] = None) -> None:
+        """Switch to ``levels[level]`` right away."""
+        level = min(max(level, 0), len(self.levels) - 1)
+        if level == self.level:
+            return
+        if self.level >= 0:
+            self.changes += 1
+            logger.info(
+                f"Inference quality level {self.level} -> {level} "
+                f"(p90 at {load or 0:.0%} of the frame budget)."
+            )
+            if load is not None:
+                self._before = (self.level, load)
+        self.level = level
+        self.hands.configure(
+            self.levels[level].get("max_side", 0),
+            **level_kwargs({}, self.levels[level]),
+        )
+        self._samples.clear()
+        self._since_change = 0
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "level": self.level,
+            "changes": self.changes,
+            "cost_ratios": self.cost_ratios,
+            "hands_kwargs": dict(self.hands.hands_kwargs),
+            "max_side": self.hands.max_side,
+        }
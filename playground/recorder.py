@@ -1,70 +1,149 @@
-import asyncio
-from typing import List, Tuple
 import logging
-from pygame import mixer
+import os
+import time
+from typing import Optional
 
 from config.config import CONFIG
+from config.store import STORE, ConfigStore
+from playground.offline_render import render_wav
+from playground.playback_scheduler import PlaybackScheduler
+from playground.recording_file import RecordingReader, RecordingWriter, export_midi
+from playground.sound_bank import SoundBank, midi_to_note, note_to_midi
 
 logger = logging.getLogger(__name__)
 
 
 class Recorder:
-    """Manages recording and playback of note sequences."""
+    """Manages recording and playback of note sequences.
 
-    def __init__(self):
-        self.sequence: List[Tuple[str, float]] = []  # (note_name, timestamp)
+    Notes are streamed to a binary recording file as they are played, and
+    playback reads the file back lazily on a ``PlaybackScheduler`` thread.
+    The recording and playback modes are published on ``store``.
+    """
+
+    def __init__(self, store: ConfigStore = STORE):
+        self.store = store
+        self.writer: Optional[RecordingWriter] = None
+        self.path: Optional[str] = None  # last recording
         self.start_time: float = 0.0
-        self.playback_task = None
+        self.scheduler: Optional[PlaybackScheduler] = None
+        # Playback speed, kept for the next playback too (see set_tempo)
+        self.tempo: float = CONFIG["playback"]["tempo"]
 
     def start_recording(self) -> None:
         """Start recording sequence."""
-        self.sequence.clear()
-        self.start_time = asyncio.get_event_loop().time()
-        CONFIG["recording_mode"] = True
-        logger.info("Recording started.")
+        if self.writer:
+            self.writer.close()
+        self.path = CONFIG["recording"]["path"].format(
+            timestamp=time.strftime("%Y%m%d-%H%M%S")
+        )
+        self.writer = RecordingWriter(self.path, CONFIG["recording"]["flush_interval"])
+        self.start_time = time.monotonic()
+        self.store.update(recording_mode=True)
+        logger.info(f"Recording started: {self.path}")
 
     def stop_recording(self) -> None:
         """Stop recording sequence."""
-        CONFIG["recording_mode"] = False
+        self.store.update(recording_mode=False)
+        if self.writer:
+            writer, self.writer = self.writer, None
+            writer.close()
+            if CONFIG["recording"]["export_midi"]:
+                self.export_midi(os.path.splitext(self.path)[0] + ".mid")
         logger.info("Recording stopped.")
 
-    def record_note(self, note_name: str) -> None:
+    def record_note(self, note_name: str, velocity: float = 1.0) -> None:
         """Record a note with relative timestamp."""
-        if CONFIG["recording_mode"]:
-            current_time = asyncio.get_event_loop().time()
+        if self.writer and self.store.snapshot.recording_mode:
+            current_time = time.monotonic()
             relative_time = current_time - self.start_time
-            self.sequence.append((note_name, relative_time))
+            self.writer.write(
+                note_to_midi(note_name), relative_time, round(velocity * 127)
+            )
             logger.debug(f"Recorded note: {note_name} at {relative_time}")
 
-    async def playback(self, keys_dict: dict) -> None:
-        """Playback the recorded sequence."""
-        CONFIG["playback_mode"] = True
-        if not mixer.get_init():
-            mixer.init()
-        start_time = asyncio.get_event_loop().time()
-        last_time = start_time
-        for note_name, rel_time in self.sequence:
-            # Aguarda o tempo relativo entre notas, considerando o tempo desde o início
-            wait_time = (start_time + rel_time) - last_time
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-            last_time = start_time + rel_time
-            if note_name in keys_dict:
-                try:
-                    keys_dict[note_name].sound.play()
-                except Exception as e:
-                    logger.error(f"Error playing back {note_name}: {e}")
-        CONFIG["playback_mode"] = False
-        logger.info("Playback completed.")
+    def open(self, path: str) -> RecordingReader:
+        """Select an existing recording for playback."""
+        reader = RecordingReader(path)
+        self.path = path
+        return reader
+
+    def export_midi(self, midi_path: str) -> None:
+        """Export the last recording as a Standard MIDI File."""
+        if self.path:
+            export_midi(RecordingReader(self.path), midi_path)
+
+    def export_wav(self, wav_path: str, sound_bank: SoundBank) -> None:
+        """Render the last recording to a WAV file, faster than real time."""
+        if self.path:
+            render_wav(
+                RecordingReader(self.path),
+                sound_bank,
+                wav_path,
+                self.store.snapshot.volume,
+            )
+
+    def start_playback(self, keys_dict: dict, position: float = 0.0) -> None:
+        """Start playing the last recording on the playback scheduler."""
+        if not self.path or self.store.snapshot.recording_mode:
+            return
+        self.stop_playback()
+        settings = CONFIG["playback"]
+        audio = CONFIG["audio"]
+
+        def play(note: int, velocity: int, deadline: float) -> None:
+            key = keys_dict.get(midi_to_note(note))
+            if key:
+                key.play(velocity / 127, deadline)
 
-    def start_playback(self, keys_dict: dict) -> None:
-        """Start async playback."""
-        if self.sequence:
-            self.playback_task = asyncio.create_task(self.playback(keys_dict))
+        self.scheduler = PlaybackScheduler(
+            RecordingReader(self.path),
+            play,
+            lookahead=settings["lookahead"],
+            batch_window=audio["buffer_size"] / audio["sample_rate"],
+            spin=settings["spin"],
+            tempo=self.tempo,
+            loop=settings["loop"],
+            on_finished=self._playback_finished,
+            loop_gap=settings["loop_gap"],
+        )
+        self.store.update(playback_mode=True)
+        self.scheduler.start(position)
+        logger.info("Playback started.")
+
+    def seek(self, position: float) -> None:
+        """Jump to ``position`` seconds into the playing recording."""
+        if self.scheduler:
+            self.scheduler.seek(position)
+
+    def set_tempo(self, tempo: float) -> None:
+        """Scale the playback speed (1.0 is as recorded)."""
+        self.tempo = tempo
+        if self.scheduler:
+            self.scheduler.set_tempo(tempo)
 
     def stop_playback(self) -> None:
         """Stop playback if running."""
-        if self.playback_task:
-            self.playback_task.cancel()
-            CONFIG["playback_mode"] = False
-            logger.info("Playback stopped.")
+        if self.scheduler:
+            scheduler, self.scheduler = self.scheduler, None
+            scheduler.on_finished = None
+            if scheduler.running:
+                scheduler.stop()
+                self._log_jitter(scheduler)
+                logger.info("Playback stopped.")
+            self.store.update(playback_mode=False)
+
+    def _playback_finished(self) -> None:
+        self.store.update(playback_mode=False)
+        if self.scheduler:
+            self._log_jitter(self.scheduler)
+        logger.info("Playback completed.")
+
+    @staticmethod
+    def _log_jitter(scheduler: PlaybackScheduler) -> None:
+        stats = scheduler.jitter_stats()
+        if stats:
+            logger.info(
+                f"Playback timing jitter: mean {stats['mean_ms']:.2f} ms, "
+                f"p95 {stats['p95_ms']:.2f} ms, max {stats['max_ms']:.2f} ms"
+            )
@@ -0,0 +1,204 @@
+import heapq
+import logging
+import os
+import struct
+import threading
+import time
+from collections import deque
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VPRC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHd")  # magic, version, record size, start (epoch s)
+EVENT_DTYPE = np.dtype([("time", "<f8"), ("note", "u1"), ("velocity", "u1")])
+
+
+class RecordingWriter:
+    """Appends note events to a compact binary file without blocking the caller.
+
+    ``write`` only appends to an in-memory queue; a background thread batches
+    queued events into fixed-width records (float64 time, uint8 MIDI note,
+    uint8 velocity) and appends them to the file every ``flush_interval``
+    seconds, so the file is always a valid recording up to the last flush.
+    The file stays open until ``close``; use the writer in a ``with`` block
+    where its lifetime fits one.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.25):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.count = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._queue: deque = deque()
+        self._closed = threading.Event()
+        self._file = open(path, "wb")  # noqa: SIM115 - closed by close()
+        try:
+            self._file.write(
+                HEADER.pack(MAGIC, VERSION, EVENT_DTYPE.itemsize, time.time())
+            )
+            self._file.flush()
+            self._thread = threading.Thread(
+                target=self._writer_loop, name="recording-writer", daemon=True
+            )
+            self._thread.start()
+        except BaseException:
+            self._closed.set()
+            self._file.close()
+            raise
+
+    def __enter__(self) -> "RecordingWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, note: int, timestamp: float, velocity: int = 127) -> None:
+        """Queue one note event (``timestamp`` in seconds from the start)."""
+        self._queue.append((timestamp, note, velocity))
+
+    def close(self) -> None:
+        """Flush pending events and close the file."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        try:
+            self._thread.join()
+        finally:
+            self._file.close()
+        logger.info(f"Recording saved to {self.path} ({self.count} notes).")
+
+    def _writer_loop(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            self._flush()
+        self._flush()
+
+    def _flush(self) -> None:
+        queue = self._queue
+        batch = [queue.popleft() for _ in range(len(queue))]
+        if not batch:
+            return
+        records = np.array(batch, dtype=EVENT_DTYPE)
+        self._file.write(records.tobytes())
+        self._file.flush()
+        self.count += len(records)
+
+
+class RecordingReader:
+    """Lazily reads a recording file through a memory map.
+
+    Opening a file only parses its header, so hours-long sessions reopen
+    instantly and iterate in constant memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is not a recording file")
+        magic, version, record_size, self.started_at = HEADER.unpack(header)
+        if magic != MAGIC or record_size != EVENT_DTYPE.itemsize:
+            raise ValueError(f"{path} is not a recording file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported recording version {version} in {path}")
+        count = (os.path.getsize(path) - HEADER.size) // EVENT_DTYPE.itemsize
+        self.events = (
+            np.memmap(
+                path, dtype=EVENT_DTYPE, mode="r", offset=HEADER.size, shape=count
+            )
+            if count
+            else np.zeros(0, dtype=EVENT_DTYPE)
+        )
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def duration(self) -> float:
+        return float(self.events["time"][-1]) if len(self.events) else 0.0
+
+    def chunks(self, size: int = 4096) -> Iterator[np.ndarray]:
+        """Yield the events in consecutive slices of at most ``size``."""
+        for start in range(0, len(self.events), size):
+            yield self.events[start : start + size]
+
+    def __iter__(self) -> Iterator[Tuple[float, int, int]]:
+        """Iterate ``(time, midi note, velocity)`` tuples."""
+        for chunk in self.chunks():
+            yield from zip(
+                chunk["time"].tolist(),
+                chunk["note"].tolist(),
+                chunk["velocity"].tolist(),
+                strict=True,
+            )
+
+
+def _varlen(value: int) -> bytes:
+    """Encode a MIDI variable-length quantity."""
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.append(0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(reversed(out))
+
+
+def export_midi(
+    reader: RecordingReader,
+    path: str,
+    note_length: float = 0.5,
+    tempo_bpm: float = 120.0,
+    ticks_per_beat: int = 480,
+) -> None:
+    """Write a recording as a format-0 Standard MIDI File.
+
+    Notes are held for ``note_length`` seconds, or until the same note is
+    struck again. Events are streamed to disk and the track length is patched
+    in at the end, so memory use does not grow with the recording.
+    """
+    ticks_per_second = ticks_per_beat * tempo_bpm / 60.0
+    with open(path, "wb") as f:
+        f.write(b"MThd" + struct.pack(">IHHH", 6, 0, 1, ticks_per_beat))
+        f.write(b"MTrk\x00\x00\x00\x00")
+        track_start = f.tell()
+        tempo = int(60_000_000 / tempo_bpm)
+        f.write(b"\x00\xff\x51\x03" + tempo.to_bytes(3, "big"))
+
+        last_tick = 0
+        pending_offs: List[Tuple[int, int]] = []  # heap of (tick, note)
+        holding = {}  # note -> tick of its scheduled note-off
+
+        def emit(tick: int, message: bytes) -> None:
+            nonlocal last_tick
+            f.write(_varlen(tick - last_tick) + message)
+            last_tick = tick
+
+        def release_until(tick: int) -> None:
+            while pending_offs and pending_offs[0][0] <= tick:
+                off_tick, note = heapq.heappop(pending_offs)
+                if holding.get(note) == off_tick:
+                    del holding[note]
+                    emit(off_tick, bytes((0x80, note, 0)))
+
+        for timestamp, note, velocity in reader:
+            tick = max(last_tick, int(round(timestamp * ticks_per_second)))
+            release_until(tick)
+            if note in holding:
+                emit(tick, bytes((0x80, note, 0)))
+            emit(tick, bytes((0x90, note, max(1, velocity))))
+            off_tick = tick + max(1, int(note_length * ticks_per_second))
+            holding[note] = off_tick
+            heapq.heappush(pending_offs, (off_tick, note))
+        release_until(float("inf"))
+        f.write(b"\x00\xff\x2f\x00")  # end of track
+
+        track_length = f.tell() - track_start
+        f.seek(track_start - 4)
+        f.write(struct.pack(">I", track_length))
+    logger.info(f"MIDI exported to {path}.")
@@ -0,0 +1,176 @@
+import logging
+from typing import Any, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.store import STORE, ConfigStore
+from playground.key_layout import KeyLayout
+
+logger = logging.getLogger(__name__)
+
+Box = Tuple[int, int, int, int]  # x0, y0, x1, y1 in pixels
+
+
+class InferenceROI:
+    """Crops the frame sent to MediaPipe to where hands can actually play.
+
+    The region is the union of the key rects and the last known hand bounding
+    boxes, grown by a margin so entering hands are still seen, and optionally
+    downscaled. Landmarks are mapped back to full-frame coordinates in place,
+    so the rest of the app never sees the crop. When tracking is lost the next
+    frame is processed in full, and while no hands are found a full frame is
+    probed every ``full_frame_interval`` frames.
+    """
+
+    def __init__(
+        self,
+        layout: KeyLayout,
+        margin: float = 0.15,
+        max_side: int = 640,
+        full_frame_interval: int = 10,
+        store: ConfigStore = STORE,
+    ):
+        self.layout = layout
+        self.store = store
+        self.margin = margin
+        self.max_side = max_side
+        self.full_frame_interval = full_frame_interval
+        self.crop: Optional[Box] = None
+        self._buffer: Optional[np.ndarray] = None  # reused crop image
+        self.hand_boxes: list = []
+        self.frames_lost = 0
+        self.full_frames = 0
+        self.cropped_frames = 0
+
+    def process(self, hands: Any, rgb: np.ndarray) -> Any:
+        """Run ``hands.process`` on the region of interest of ``rgb``."""
+        h, w = rgb.shape[:2]
+        box = self.plan(w, h)
+        if box is not None:
+            self._buffer = crop(rgb, box, self.max_side, self._buffer)
+        result = hands.process(rgb if box is None else self._buffer)
+        if box is not None:
+            self._map_to_frame(result, box, w, h)
+        self.track(result, w, h)
+        return result
+
+    def plan(self, w: int, h: int) -> Optional[Box]:
+        """Choose the next crop box, or None to process the full frame.
+
+        Callers that run inference elsewhere (see ``InferencePool``) crop
+        with ``crop``, map landmarks back themselves and then call ``track``.
+        """
+        box = self._choose_region(w, h)
+        if box is None:
+            self.full_frames += 1
+        else:
+            self.cropped_frames += 1
+        return box
+
+    def _choose_region(self, w: int, h: int) -> Optional[Box]:
+        if self.store.snapshot.calibration_mode:
+            return None  # calibration needs the whole frame
+        if self.frames_lost and (self.frames_lost - 1) % self.full_frame_interval == 0:
+            # Just lost tracking, or periodic probe for hands outside the ROI
+            return None
+        n = self.layout.count
+        boxes = [tuple(r) for r in self.layout.rects[:n]] + self.hand_boxes
+        if not boxes:
+            return None
+        boxes = np.array(boxes)
+        required = (
+            boxes[:, 0].min(),
+            boxes[:, 1].min(),
+            boxes[:, 2].max(),
+            boxes[:, 3].max(),
+        )
+        if self.crop is not None and self._fits(required, self.crop, w, h):
+            return self.crop
+        self.crop = self._expand(required, w, h)
+        if self.crop == (0, 0, w, h):
+            return None
+        return self.crop
+
+    def _fits(self, required: Box, crop: Box, w: int, h: int) -> bool:
+        """Keep the current crop while it contains the required region and is
+        not much larger than needed, so MediaPipe's tracker sees a stable
+        view."""
+        x0, y0, x1, y1 = self._clip(required, w, h)
+        cx0, cy0, cx1, cy1 = crop
+        if x0 < cx0 or y0 < cy0 or x1 > cx1 or y1 > cy1:
+            return False
+        ex0, ey0, ex1, ey1 = self._expand(required, w, h)
+        return (cx1 - cx0) * (cy1 - cy0) <= 2 * (ex1 - ex0) * (ey1 - ey0)
+
+    def _expand(self, box: Box, w: int, h: int) -> Box:
+        x0, y0, x1, y1 = box
+        mx = int(self.margin * w)
+        my = int(self.margin * h)
+        return self._clip((x0 - mx, y0 - my, x1 + mx, y1 + my), w, h)
+
+    @staticmethod
+    def _clip(box: Box, w: int, h: int) -> Box:
+        x0, y0, x1, y1 = box
+        return (
+            int(max(0, min(x0, w))),
+            int(max(0, min(y0, h))),
+            int(max(0, min(x1, w))),
+            int(max(0, min(y1, h))),
+        )
+
+    @staticmethod
+    def _map_to_frame(result: Any, box: Box, w: int, h: int) -> None:
+        """Rewrite crop-normalized landmarks as full-frame-normalized."""
+        landmarks = getattr(result, "multi_hand_landmarks", None)
+        if not landmarks:
+            return
+        x0, y0, x1, y1 = box
+        sx, sy = (x1 - x0) / w, (y1 - y0) / h
+        ox, oy = x0 / w, y0 / h
+        for hand_landmarks in landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = ox + lm.x * sx
+                lm.y = oy + lm.y * sy
+
+    def track(self, result: Any, w: int, h: int) -> None:
+        """Remember where the hands are for the next frame's crop."""
+        landmarks = getattr(result, "multi_hand_landmarks", None)
+        if not landmarks:
+            self.hand_boxes = []
+            self.frames_lost += 1
+            return
+        self.frames_lost = 0
+        self.hand_boxes = []
+        for hand_landmarks in landmarks:
+            xs = [lm.x for lm in hand_landmarks.landmark]
+            ys = [lm.y for lm in hand_landmarks.landmark]
+            self.hand_boxes.append(
+                (int(min(xs) * w), int(min(ys) * h), int(max(xs) * w), int(max(ys) * h))
+            )
+
+
+def crop(
+    image: np.ndarray,
+    box: Optional[Box],
+    max_side: int,
+    dst: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Cut ``box`` out of ``image`` and shrink it to at most ``max_side``.
+
+    The result is written into ``dst`` when it has the right size, so
+    passing the previous result back in reuses it while the box is stable.
+    """
+    if box is None:
+        return image
+    x0, y0, x1, y1 = box
+    image = image[y0:y1, x0:x1]
+    scale = max_side / max(x1 - x0, y1 - y0)
+    if scale < 1.0:
+        return cv2.resize(
+            image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA, dst=dst
+        )
+    if dst is None or dst.shape != image.shape:
+        return np.ascontiguousarray(image)
+    np.copyto(dst, image)
+    return dst
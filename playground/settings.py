@@ -1,5 +1,5 @@
 import pygame
-from config.config import CONFIG
+from config.store import STORE
 
 
 class SettingsMenu:
@@ -16,13 +16,15 @@ class SettingsMenu:
 
     def init(self) -> None:
         """Initialize Pygame for settings menu."""
-        pygame.init()
-        pygame.mixer.init()
+        # Only the display and fonts: the mixer belongs to the audio engine
+        pygame.display.init()
+        pygame.font.init()
         self.screen = pygame.display.set_mode((400, 300))
         pygame.display.set_caption("Piano Settings")
         self.font = pygame.font.SysFont(None, 32)
-        self.volume_slider = int(CONFIG["volume"] * 100)
-        self.sensitivity_slider = CONFIG["sensitivity"]
+        settings = STORE.snapshot
+        self.volume_slider = int(settings.volume * 100)
+        self.sensitivity_slider = settings.sensitivity
         self.running = True
 
     def draw_slider(
@@ -59,10 +61,12 @@ class SettingsMenu:
                 return False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_s:
-                    CONFIG["volume"] = self.volume_slider / 100
-                    CONFIG["sensitivity"] = self.sensitivity_slider
-                    CONFIG["hit_velocity_threshold"] = self.sensitivity_slider
-                    pygame.mixer.music.set_volume(CONFIG["volume"])
+                    # Subscribers (the audio engine) pick the new values up
+                    STORE.update(
+                        volume=self.volume_slider / 100,
+                        sensitivity=self.sensitivity_slider,
+                        hit_velocity_threshold=self.sensitivity_slider,
+                    )
                     self.running = False
                     return False
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -102,4 +106,4 @@ class SettingsMenu:
 
     def cleanup(self) -> None:
         """Cleanup Pygame."""
-        pygame.quit()
+        pygame.display.quit()
@@ -0,0 +1,245 @@
+import logging
+import os
+import re
+import struct
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NOTE_OFFSETS = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+NOTE_PATTERN = re.compile(r"^([A-G])([#b]?)(-?\d+)$")
+# What SoundBank.buffer raises for a note it cannot load: no sample to
+# generate it from, a bad note name or WAV file, or an unreadable file
+LOAD_ERRORS = (KeyError, ValueError, OSError, struct.error)
+
+
+def note_to_midi(name: str) -> int:
+    """Convert a note name like ``C#4`` or ``Bb3`` to a MIDI note number."""
+    match = NOTE_PATTERN.match(name)
+    if not match:
+        raise ValueError(f"Invalid note name: {name}")
+    letter, accidental, octave = match.groups()
+    semitone = NOTE_OFFSETS[letter] + {"#": 1, "b": -1, "": 0}[accidental]
+    return 12 * (int(octave) + 1) + semitone
+
+
+def midi_to_note(midi: int) -> str:
+    """Convert a MIDI note number to a name like ``C#4`` (sharps only)."""
+    names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+    return f"{names[midi % 12]}{midi // 12 - 1}"
+
+
+def map_wav(path: str) -> Tuple[np.ndarray, int]:
+    """Memory-map the PCM data of a 16-bit WAV file.
+
+    Returns a read-only ``(frames, channels)`` int16 array backed by the file
+    and the sample rate. Nothing is read until the samples are touched.
+    """
+    with open(path, "rb") as f:
+        riff, _, wave_id = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave_id != b"WAVE":
+            raise ValueError(f"{path} is not a WAV file")
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, chunk_size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                fmt = struct.unpack("<HHIIHH", f.read(16))
+                f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+            elif chunk_id == b"data":
+                data_offset = f.tell()
+                break
+            else:
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+    if fmt is None:
+        raise ValueError(f"{path} has no fmt chunk")
+    audio_format, channels, rate, _, _, bits = fmt
+    if audio_format != 1 or bits != 16:
+        raise ValueError(f"{path}: only 16-bit PCM WAV files are supported")
+    frames = min(chunk_size, os.path.getsize(path) - data_offset) // (2 * channels)
+    samples = np.memmap(
+        path, dtype="<i2", mode="r", offset=data_offset, shape=(frames, channels)
+    )
+    return samples, rate
+
+
+def resample(samples: np.ndarray, ratio: float) -> np.ndarray:
+    """Resample ``(frames, channels)`` audio so it plays ``ratio`` times faster.
+
+    Used both for pitch-shifting (ratio = 2 ** (semitones / 12)) and for
+    sample-rate conversion. Linear interpolation, int16 in and out.
+    """
+    frames = len(samples)
+    out_frames = max(1, int(frames / ratio))
+    positions = np.arange(out_frames) * ratio
+    source = np.arange(frames)
+    out = np.empty((out_frames, samples.shape[1]), dtype=np.int16)
+    for channel in range(samples.shape[1]):
+        out[:, channel] = np.interp(positions, source, samples[:, channel])
+    return out
+
+
+class SoundBank:
+    """Maps note names to samples, loaded on demand within a memory budget.
+
+    Real samples are memory-mapped WAV files. Decoded float32 buffers, already
+    converted to the output sample rate and channel count, live in a bounded
+    LRU and are evicted when ``max_bytes`` is exceeded. Buffers loaded by
+    ``preload`` are pinned instead: they stay loaded whatever the budget, so
+    playing a preloaded note never decodes. Notes without a sample are
+    generated by pitch-shifting the nearest real sample.
+    """
+
+    def __init__(self, max_bytes: int, sample_rate: int = 44100, channels: int = 2):
+        self.max_bytes = max_bytes
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.paths: Dict[int, str] = {}  # MIDI note -> WAV path
+        self._mapped: Dict[int, Tuple[np.ndarray, int]] = {}
+        self._cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._cached_bytes = 0
+        self._pinned: Dict[int, np.ndarray] = {}  # outside the LRU and budget
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls, config: dict, key_configs: Optional[Iterable[dict]] = None
+    ) -> "SoundBank":
+        """Create a bank with the samples of ``key_configs`` (default: the keys
+        in ``config``)."""
+        bank = cls(config["sound_bank"]["max_bytes"], config["audio"]["sample_rate"])
+        for key_config in config["keys"] if key_configs is None else key_configs:
+            bank.register(key_config["name"], key_config["sound"])
+        return bank
+
+    def register(self, note: str, path: Optional[str]) -> None:
+        """Declare the sample file for a note; missing files are filled in.
+
+        A note has one sample: a different file for a note already registered
+        is ignored with a warning.
+        """
+        if path is None:
+            return
+        if not os.path.exists(path):
+            logger.warning(f"Sample {path} for {note} not found, will pitch-shift.")
+            return
+        midi = note_to_midi(note)
+        registered = self.paths.setdefault(midi, path)
+        if registered != path:
+            logger.warning(f"{note} already uses {registered}, ignoring {path}.")
+
+    def samples(self, note: str) -> Tuple[np.ndarray, int]:
+        """Return raw int16 samples and sample rate for a note."""
+        midi = note_to_midi(note)
+        nearest = self._source(midi)
+        source, rate = self._map(nearest)
+        if nearest == midi:
+            return source, rate
+        logger.debug(f"Pitch-shifting {nearest} by {midi - nearest} for {note}")
+        return resample(source, 2 ** ((midi - nearest) / 12)), rate
+
+    def frames(self, note: str) -> int:
+        """Length of ``buffer(note)`` in frames, without decoding it.
+
+        Only the WAV header is read for a note that is not loaded yet.
+        """
+        midi = note_to_midi(note)
+        with self._lock:
+            data = self._pinned.get(midi)
+            if data is None:
+                data = self._cache.get(midi)
+        if data is not None:
+            return len(data)
+        nearest = self._source(midi)
+        source, rate = self._map(nearest)
+        frames = len(source)
+        # The same lengths resample() gives
+        if nearest != midi:
+            frames = max(1, int(frames / 2 ** ((midi - nearest) / 12)))
+        if rate != self.sample_rate:
+            frames = max(1, int(frames / (rate / self.sample_rate)))
+        return frames
+
+    def buffer(self, note: str) -> np.ndarray:
+        """Return a ``(frames, channels)`` float32 buffer in [-1, 1] for a note.
+
+        The buffer is decoded on first use and must be treated as read-only.
+        """
+        midi = note_to_midi(note)
+        with self._lock:
+            data = self._pinned.get(midi)
+            if data is not None:
+                return data
+            data = self._cache.get(midi)
+            if data is not None:
+                self._cache.move_to_end(midi)
+                return data
+        samples, rate = self.samples(note)
+        data = self._convert(samples, rate)
+        with self._lock:
+            if midi not in self._cache:
+                self._cache[midi] = data
+                self._cached_bytes += data.nbytes
+                self._evict()
+        return data
+
+    def preload(self, notes: Iterable[str], workers: int = 4) -> int:
+        """Decode and pin the buffers of ``notes``, ``workers`` at once.
+
+        Saves every hit of these keys from decoding its sample, including
+        after other notes have filled the budget. Returns how many buffers
+        were loaded; notes that cannot be loaded are skipped.
+        """
+
+        def load(note: str) -> bool:
+            try:
+                data = self.buffer(note)
+            except LOAD_ERRORS as e:
+                logger.error(f"Error loading sample for {note}: {e}", exc_info=True)
+                return False
+            midi = note_to_midi(note)
+            with self._lock:
+                if self._cache.pop(midi, None) is not None:
+                    self._cached_bytes -= data.nbytes
+                self._pinned[midi] = data
+            return True
+
+        with ThreadPoolExecutor(workers, thread_name_prefix="samples") as executor:
+            return sum(executor.map(load, notes))
+
+    def _source(self, midi: int) -> int:
+        """The registered note whose sample plays ``midi``."""
+        if midi in self.paths:
+            return midi
+        if not self.paths:
+            raise KeyError(f"No samples registered to generate {midi_to_note(midi)}")
+        return min(self.paths, key=lambda m: (abs(m - midi), m))
+
+    def _map(self, midi: int) -> Tuple[np.ndarray, int]:
+        mapped = self._mapped.get(midi)
+        if mapped is None:
+            mapped = self._mapped[midi] = map_wav(self.paths[midi])
+        return mapped
+
+    def _evict(self) -> None:
+        # Always keep the most recent entry, even if it alone exceeds the budget
+        while self._cached_bytes > self.max_bytes and len(self._cache) > 1:
+            _, data = self._cache.popitem(last=False)
+            self._cached_bytes -= data.nbytes
+
+    def _convert(self, samples: np.ndarray, rate: int) -> np.ndarray:
+        """Convert int16 samples to the bank's sample rate and channel count."""
+        if rate != self.sample_rate:
+            samples = resample(samples, rate / self.sample_rate)
+        data = samples.astype(np.float32) * (1.0 / 32768.0)
+        if data.shape[1] != self.channels:
+            mono = data.mean(axis=1, keepdims=True)
+            data = np.repeat(mono, self.channels, axis=1)
+        return np.ascontiguousarray(data)
@@ -0,0 +1,119 @@
+import logging
+import time
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class StartupPhases:
+    """Runs named startup phases on a thread pool and times each one.
+
+    ``submit`` starts a phase right away and ``result`` waits for it, so
+    phases that do not depend on each other (opening the camera, decoding
+    samples, loading the hand model) overlap. ``run`` times a phase on the
+    calling thread. ``report`` gives every phase's start and end relative to
+    the creation of this object.
+    """
+
+    def __init__(
+        self, workers: int = 4, clock: Callable[[], float] = time.perf_counter
+    ):
+        self.clock = clock
+        self.started = clock()
+        self.phases: Dict[str, Tuple[float, float]] = {}  # name -> (start, end)
+        self._futures: Dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="startup")
+
+    def submit(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """Start phase ``name`` on the pool."""
+        future = self._executor.submit(self._timed, name, func, *args, **kwargs)
+        self._futures[name] = future
+        return future
+
+    def run(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run phase ``name`` on the calling thread."""
+        return self._timed(name, func, *args, **kwargs)
+
+    def result(self, name: str) -> Any:
+        """Wait for a submitted phase and return its result (or raise)."""
+        return self._futures[name].result()
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to ``timeout``; True once every phase ended or one failed."""
+        _, pending = wait(self._futures.values(), timeout, FIRST_EXCEPTION)
+        return not pending or any(
+            f.done() and f.exception() is not None for f in self._futures.values()
+        )
+
+    def join(
+        self,
+        on_progress: Optional[Callable[[Dict[str, str]], None]] = None,
+        interval: float = 0.05,
+    ) -> None:
+        """Wait for every phase, calling ``on_progress(status)`` meanwhile.
+
+        Re-raises the exception of the first phase that failed.
+        """
+        while True:
+            if on_progress:
+                on_progress(self.status())
+            if self.wait(interval):
+                break
+        for name, future in self._futures.items():
+            if future.done() and future.exception() is not None:
+                logger.error(f"Startup phase {name} failed: {future.exception()}")
+                raise future.exception()
+
+    def status(self) -> Dict[str, str]:
+        """State of every submitted phase: loading, done or failed."""
+        status = {}
+        for name, future in self._futures.items():
+            if not future.done():
+                status[name] = "loading"
+            else:
+                status[name] = "failed" if future.exception() else "done"
+        return status
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Start, end and duration (s) of every finished phase."""
+        return {
+            name: {"start": start, "end": end, "seconds": end - start}
+            for name, (start, end) in sorted(self.phases.items(), key=lambda p: p[1])
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _timed(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        start = self.clock() - self.started
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.phases[name] = (start, self.clock() - self.started)
+
+
+def loading_screen(
+    status: Dict[str, str], size: Tuple[int, int] = (640, 360)
+) -> np.ndarray:
+    """Frame listing the startup phases, shown until the camera is ready."""
+    w, h = size
+    frame = np.full((h, w, 3), 30, dtype=np.uint8)
+    cv2.putText(
+        frame, "Loading...", (20, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 255), 2
+    )
+    colors = {"loading": (0, 200, 255), "done": (0, 255, 0), "failed": (0, 0, 255)}
+    for i, (name, state) in enumerate(status.items()):
+        cv2.putText(
+            frame,
+            f"{name}: {state}",
+            (20, 100 + 35 * i),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.8,
+            colors.get(state, (255, 255, 255)),
+            2,
+        )
+    return frame
@@ -0,0 +1,237 @@
+"""Several piano stations sharing one sample bank, audio engine and inference.
+
+Each entry of ``CONFIG["stations"]`` is a camera with its own keyboard: it
+gets its own capture, hand tracking and key layout, while the decoded
+samples, the audio output and the inference workers are created once for
+all of them. Several stations use ``CONFIG["pipeline"]["station_backend"]``,
+by default the "process" backend: with "thread" every station's inference
+competes for the GIL, and per-station throughput drops as stations are
+added. Run from the repository root::
+
+    python -m playground.stations
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import cv2
+
+from config.config import CONFIG
+from config.store import STORE, ConfigSnapshot
+from playground.audio_engine import AudioEngine
+from playground.display import BufferedDisplay, FrameRateCap
+from playground.frame_scheduler import FrameScheduler
+from playground.inference_pool import InferencePool
+from playground.sound_bank import SoundBank
+from playground.virtual_piano import VirtualPiano, create_engine
+
+logger = logging.getLogger(__name__)
+
+
+class StationRunner:
+    """Drives several ``VirtualPiano`` stations over shared resources.
+
+    Every station runs ``setup``, ``update_loop`` and ``cleanup`` on its own
+    thread, so one station's camera read or hand inference does not hold up
+    the others. ``step`` advances all stations by one frame concurrently;
+    windows of stations with a ``BufferedDisplay`` are then shown from the
+    calling thread, and keys go to the first station. The shared engine's
+    sample bank must hold the keys of every station; ``setup`` preloads them.
+
+    Give each station its own ``STORE.local_copy()``: calibration, recording
+    and playback are then modes of that station only, while changes to the
+    volume and sensitivity in ``STORE`` are forwarded to every station.
+    """
+
+    def __init__(
+        self,
+        stations: List[VirtualPiano],
+        engine: AudioEngine,
+        pool: Optional[InferencePool] = None,
+        audio_output: bool = True,
+    ):
+        self.stations = stations
+        self.engine = engine
+        self.pool = pool
+        self.audio_output = audio_output
+        self.frames = [0] * len(stations)
+        self.preview = CONFIG["display"]["preview"]
+        self.display_cap = FrameRateCap(CONFIG["display"]["max_fps"])
+        self._executors = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"station-{i}")
+            for i in range(len(stations))
+        ]
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._started = 0.0
+
+    @classmethod
+    def from_config(cls, station_configs: List[Dict[str, Any]]) -> "StationRunner":
+        """One station per entry: ``name``, ``source`` and optionally ``keys``."""
+        # Own copies, so manual calibration of one station stays local
+        station_keys = [
+            [
+                dict(key_config)
+                for key_config in station_config.get("keys") or CONFIG["keys"]
+            ]
+            for station_config in station_configs
+        ]
+        engine = create_engine(
+            sound_bank=SoundBank.from_config(
+                CONFIG, [key_config for keys in station_keys for key_config in keys]
+            )
+        )
+        pipeline = CONFIG["pipeline"]
+        backend = (
+            pipeline["station_backend"]
+            if len(station_configs) > 1
+            else pipeline["backend"]
+        )
+        pool = None
+        if pipeline["enabled"] and backend == "process":
+            pool = InferencePool(
+                CONFIG["pipeline"]["workers"],
+                hands_kwargs=CONFIG["hands_config"],
+                reply_timeout=CONFIG["pipeline"]["reply_timeout"],
+            )
+        stations = [
+            VirtualPiano(
+                source=cv2.VideoCapture(station_config["source"]),
+                display=BufferedDisplay(station_config["name"]),
+                engine=engine,
+                pool=pool,
+                key_configs=keys,
+                store=STORE.local_copy(),
+            )
+            for station_config, keys in zip(station_configs, station_keys, strict=True)
+        ]
+        return cls(stations, engine, pool)
+
+    def setup(self) -> None:
+        """Start the shared audio output and set every station up in parallel,
+        while the samples of all their keys are decoded."""
+        if self.audio_output:
+            self.engine.start()
+        self._unsubscribe = STORE.subscribe(self.apply_settings)
+        futures = [
+            executor.submit(station.setup)
+            for station, executor in zip(self.stations, self._executors, strict=True)
+        ]
+        notes = {
+            key_config["name"]
+            for station in self.stations
+            for key_config in station.key_configs
+        }
+        self.engine.sound_bank.preload(sorted(notes))
+        for future in futures:
+            future.result()
+        self._started = time.monotonic()
+        logger.info(f"{len(self.stations)} stations ready.")
+
+    async def step(self, render: bool = True) -> None:
+        """Process one frame on every station, then show their windows.
+
+        Windows are drawn and shown at most ``CONFIG["display"]["max_fps"]``
+        times a second, and never without preview.
+        """
+        render = render and self.preview and self.display_cap.due()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, station.update_loop, render)
+                for station, executor in zip(
+                    self.stations, self._executors, strict=True
+                )
+            )
+        )
+        for i in range(len(self.stations)):
+            self.frames[i] += 1
+        if render:
+            self.display_cap.shown()
+            self.show()
+
+    def show(self) -> None:
+        """Show buffered station frames and hand the pressed key to station 0."""
+        displays = [
+            station.display
+            for station in self.stations
+            if isinstance(station.display, BufferedDisplay)
+        ]
+        shown = False
+        for display in displays:
+            if display.frame is not None:
+                cv2.imshow(display.window_name, display.frame)
+                shown = True
+        if shown:
+            displays[0].push_key(cv2.waitKey(1) & 0xFF)
+
+    def apply_settings(self, settings: ConfigSnapshot) -> None:
+        self.engine.volume = settings.volume
+        for station in self.stations:
+            station.store.update(
+                volume=settings.volume,
+                sensitivity=settings.sensitivity,
+                hit_velocity_threshold=settings.hit_velocity_threshold,
+            )
+
+    def report(self) -> List[Dict[str, float]]:
+        """Frames processed and frame rate of every station so far."""
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        return [
+            {
+                "frames": frames,
+                "fps": frames / elapsed if elapsed > 0 else 0.0,
+            }
+            for frames in self.frames
+        ]
+
+    def cleanup(self) -> None:
+        """Clean up every station, then stop the shared engine and pool."""
+        if self._unsubscribe:
+            self._unsubscribe()
+        for station, executor in zip(self.stations, self._executors, strict=True):
+            try:
+                executor.submit(station.cleanup).result()
+            except (OSError, RuntimeError, BufferError, cv2.error) as e:
+                # Releasing one station's camera, threads or shared memory
+                # failed; the others are still cleaned up
+                logger.error(f"Failed to clean up station: {e}", exc_info=True)
+            executor.shutdown()
+        cv2.destroyAllWindows()
+        if self.pool:
+            self.pool.close()
+        stats = self.engine.latency_stats()
+        if stats:
+            logger.info(f"Hit-to-output latency: {stats}")
+        self.engine.stop()
+        logger.info("Stations stopped.")
+
+
+async def main() -> None:
+    runner = StationRunner.from_config(CONFIG["stations"])
+    pacing = CONFIG["frame_pacing"]
+    scheduler = FrameScheduler(CONFIG["fps"], pacing["max_lag_frames"])
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, runner.setup)
+        while True:
+            render = not (pacing["skip_render_when_behind"] and scheduler.behind())
+            await runner.step(render)
+            await scheduler.wait()
+    except SystemExit:
+        pass
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+    finally:
+        runner.cleanup()
+        for i, stats in enumerate(runner.report()):
+            logger.info(f"Station {i}: {stats['fps']:.1f} fps.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    asyncio.run(main())
@@ -1,16 +1,28 @@
-import asyncio
 import logging
 import threading
-from typing import Optional, Dict, Tuple
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import cv2
 import numpy as np
-from pygame import mixer
-from mediapipe.python.solutions.hands import Hands, HAND_CONNECTIONS
-from mediapipe.python.solutions.drawing_utils import draw_landmarks
+from playground.audio_engine import AudioEngine
+from playground.auto_calibration import AutoCalibrator, calibrator_from_config
+from playground.display import display_from_config
+from playground.frame_buffers import FrameBuffers
+from playground.hand_tracker import HandTracker
+from playground.inference_pool import InferenceClient, InferencePool
+from playground.instrumentation import Instrumentation
+from playground.landmarks import draw_skeleton, fingertips, landmarks_to_array
+from playground.motion_gate import MotionGate
+from playground.note_output import NoteOutputs, NoteSender
 from playground.piano import Piano
+from playground.pipeline import FramePipeline
+from playground.quality_governor import AdaptiveHands, QualityGovernor, level_kwargs
 from playground.recorder import Recorder
-from playground.settings import SettingsMenu
+from playground.roi import InferenceROI
+from playground.sound_bank import SoundBank
+from playground.startup import StartupPhases, loading_screen
 from config.config import CONFIG
+from config.store import STORE, ConfigSnapshot, ConfigStore
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -19,93 +31,373 @@ logger = logging.getLogger(__name__)
 class VirtualPiano:
     """Main class for the virtual piano application."""
 
-    def __init__(self):
-        self.hands: Optional[Hands] = None
-        self.cap: Optional[cv2.VideoCapture] = None
+    def __init__(
+        self,
+        source: Optional[Any] = None,
+        display: Optional[Any] = None,
+        hands: Optional[Any] = None,
+        audio_output: bool = True,
+        clock: Optional[Callable[[], float]] = None,
+        pipelined: Optional[bool] = None,
+        engine: Optional[AudioEngine] = None,
+        pool: Optional[InferencePool] = None,
+        key_configs: Optional[List[dict]] = None,
+        store: Optional[ConfigStore] = None,
+    ):
+        # Everything below can be injected for headless runs; by default the
+        # camera, an OpenCV window, MediaPipe and the event loop clock are used.
+        # A given engine or pool is shared with other stations: its owner
+        # starts and stops it, this instance only uses it. A station passes
+        # its own store, so its calibration, recording and playback modes do
+        # not affect the others.
+        self.hands: Optional[Any] = hands
+        self.cap: Optional[cv2.VideoCapture] = source
+        self.display = display or display_from_config(CONFIG)
+        self.audio_output = audio_output
+        self.store = store or STORE
+        self.clock = clock or time.monotonic
+        self.pipelined = (
+            CONFIG["pipeline"]["enabled"] if pipelined is None else pipelined
+        )
         self.piano: Optional[Piano] = None
         self.recorder: Optional[Recorder] = None
-        self.settings: Optional[SettingsMenu] = None
-        self.prev_positions: Dict[int, Tuple[int, int, float]] = {}
+        self.settings: Optional[Any] = None  # SettingsMenu, created when opened
+        self.startup: Optional[StartupPhases] = None
+        self.pipeline: Optional[FramePipeline] = None
+        self.pool: Optional[InferencePool] = pool
+        self.inference: Optional[InferenceClient] = None
+        self.engine: Optional[AudioEngine] = engine
+        self._owns_pool = pool is None
+        self._owns_engine = engine is None
+        self.note_output: Optional[NoteSender] = None
+        self.key_configs = CONFIG["keys"] if key_configs is None else key_configs
+        self.roi: Optional[InferenceROI] = None
+        self.gate: Optional[MotionGate] = None
+        self.governor: Optional[QualityGovernor] = None
+        self.buffers = FrameBuffers()  # reused by the sequential frame loop
+        self._last_result: Any = None  # landmarks of the last inferred frame
+        self.instrumentation = Instrumentation(
+            CONFIG["instrumentation"]["enabled"],
+            CONFIG["instrumentation"]["capacity"],
+        )
+        self.instrumentation.hud = CONFIG["instrumentation"]["hud"]
+        tracking_config = CONFIG["tracking"]
+        self.tracker = HandTracker(
+            tracking_config["max_distance"],
+            tracking_config["timeout"],
+            tracking_config["min_cutoff"],
+            tracking_config["beta"],
+            tracking_config["d_cutoff"],
+        )
+        self._unsubscribe: Optional[Callable[[], None]] = None
         self.calibration_key: int = 0
         self.calibration_start_pos: Optional[Tuple[int, int]] = None
+        self.calibration_tip: Optional[Tuple[int, int]] = None
+        self.calibration_frame_size: Tuple[int, int] = (0, 0)
+        self.calibrator: Optional[AutoCalibrator] = None
 
-    def setup(self) -> None:
-        """Initialize pygame, MediaPipe, camera, recorder, and settings."""
-        try:
-            mixer.init()
-            mixer.music.set_volume(CONFIG["volume"])
-        except Exception as e:
-            logger.error(f"Failed to initialize pygame mixer: {e}")
-            raise
+    def setup(
+        self, on_progress: Optional[Callable[[Dict[str, str]], None]] = None
+    ) -> None:
+        """Initialize audio, MediaPipe, camera, recorder, and settings.
 
+        The slow steps do not depend on each other and run at the same time:
+        opening the camera, decoding the key samples, opening the audio
+        output, and loading MediaPipe with a warm-up inference (or starting
+        the inference workers). ``on_progress(status)`` is called every 50 ms
+        until they are done, which the app uses to draw the loading screen.
+        Phase timings are kept in ``self.startup``.
+        """
+        use_pool = self.pipelined and (
+            self.pool is not None or CONFIG["pipeline"]["backend"] == "process"
+        )
+        hands_kwargs = CONFIG["hands_config"]
+        governor_config = CONFIG["quality_governor"]
+        if governor_config["enabled"]:
+            if use_pool:
+                logger.warning("Quality governor unavailable with inference workers.")
+            else:
+                start = governor_config["levels"][governor_config["start_level"]]
+                hands_kwargs = level_kwargs(hands_kwargs, start)
+        phases = self.startup = StartupPhases()
         try:
-            self.hands = Hands(**CONFIG["hands_config"])
-        except Exception as e:
-            logger.error(f"Failed to initialize MediaPipe Hands: {e}")
-            raise
+            phases.submit("camera", self._first_frame)
+            if self._owns_engine:
+                sound_bank = SoundBank.from_config(CONFIG)
+                self.engine = create_engine(self.instrumentation, sound_bank)
+                notes = [key_config["name"] for key_config in self.key_configs]
+                phases.submit("samples", sound_bank.preload, notes)
+                if self.audio_output:
+                    phases.submit("audio", self.engine.start)
+                self._unsubscribe = self.store.subscribe(self.apply_settings)
+            if use_pool:
+                if self.pool is None:
+                    phases.submit(
+                        "inference",
+                        InferencePool,
+                        CONFIG["pipeline"]["workers"],
+                        hands_kwargs=CONFIG["hands_config"],
+                        reply_timeout=CONFIG["pipeline"]["reply_timeout"],
+                    )
+            elif self.hands is None:
+                phases.submit("hands", load_hands, hands_kwargs)
+            phases.join(on_progress)
+        finally:
+            phases.close()
 
-        try:
-            from playground.recorder import Recorder
-            from playground.settings import SettingsMenu
+        frame = phases.result("camera")
+        submitted = phases.status()
+        if "hands" in submitted:
+            self.hands = phases.result("hands")
+            if governor_config["enabled"]:
+                self.hands = AdaptiveHands(self.hands, hands_kwargs, load_hands)
+                self.governor = QualityGovernor.from_config(self.hands, CONFIG)
+        if "inference" in submitted:
+            self.pool = phases.result("inference")
+        h, w = frame.shape[:2]
+        self.recorder = Recorder(self.store)
+        outputs = self.engine
+        note_config = CONFIG["note_output"]
+        if note_config["enabled"]:
+            # Key presses and recording playback both go through Key.play,
+            # so both reach the external synth
+            self.note_output = NoteSender.from_config(CONFIG)
+            self.note_output.start()
+            outputs = NoteOutputs(
+                [self.engine, self.note_output]
+                if note_config["local_audio"]
+                else [self.note_output]
+            )
+        self.piano = Piano((w, h), outputs, self.key_configs)
 
-            self.recorder = Recorder()
-            self.settings = SettingsMenu()
-            self.cap = cv2.VideoCapture(CONFIG["camera_index"])
-            ret, frame = self.cap.read()
-            if not ret:
-                raise RuntimeError("Could not read from camera.")
-            h, w = frame.shape[:2]
-            self.piano = Piano((w, h))
-        except Exception as e:
-            logger.error(
-                f"Failed to initialize camera, piano, recorder, or settings: {e}"
+        roi_config = CONFIG["roi"]
+        if roi_config["enabled"]:
+            self.roi = InferenceROI(
+                self.piano.layout,
+                roi_config["margin"],
+                roi_config["max_side"],
+                roi_config["full_frame_interval"],
+                self.store,
             )
-            raise
 
-    def update_loop(self) -> None:
-        """Process one frame of the video feed."""
-        if not self.cap or not self.cap.isOpened() or not self.hands or not self.piano:
-            logger.error("Camera, hands, or piano not initialized or closed.")
-            return
+        if CONFIG["auto_calibration"]["enabled"]:
+            self.calibrator = calibrator_from_config(CONFIG, self.key_configs)
+            if CONFIG["auto_calibration"]["on_start"]:
+                self.calibrator.start()
+
+        if use_pool:
+            self.inference = self.pool.client(frame.shape)
 
+        gate_config = CONFIG["motion_gate"]
+        if gate_config["enabled"]:
+            self.gate = MotionGate(
+                self.piano.layout,
+                gate_config["margin"],
+                gate_config["size"],
+                gate_config["pixel_threshold"],
+                gate_config["min_pixels"],
+                gate_config["max_skip"],
+                self.store,
+            )
+
+        if self.pipelined:
+            self.pipeline = FramePipeline(
+                self.cap,
+                self.hands,
+                self.instrumentation,
+                self.roi,
+                self.inference,
+                self.gate,
+                self.governor,
+                self.clock,
+                CONFIG["pipeline"]["source_timeout"],
+            )
+            self.pipeline.start()
+
+    def _first_frame(self) -> np.ndarray:
+        if self.cap is None:
+            self.cap = cv2.VideoCapture(CONFIG["camera_index"])
         ret, frame = self.cap.read()
         if not ret:
-            logger.warning("Failed to read frame from camera.")
+            raise RuntimeError("Could not read from camera.")
+        return frame
+
+    def show_loading(self, status: Dict[str, str]) -> None:
+        """Show the startup phases while ``setup`` runs."""
+        self.display.show(loading_screen(status))
+        self.display.poll_key()
+
+    def update_loop(self, render: bool = True) -> None:
+        """Process one frame of the video feed.
+
+        With ``render=False`` the frame is tracked and hit-tested as usual but
+        not drawn or shown, to catch up when the loop is behind schedule.
+        """
+        if (
+            not self.cap
+            or not self.cap.isOpened()
+            or not (self.hands or self.inference)
+            or not self.piano
+        ):
+            logger.error("Camera, hands, or piano not initialized or closed.")
             return
 
-        frame = cv2.flip(frame, 1)
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = self.hands.process(rgb)
+        stats = self.instrumentation
+        stats.mark()
+        frame_start = time.perf_counter()
+        # One immutable view of the runtime settings for the whole frame
+        settings = self.store.snapshot
+        if self.pipeline:
+            packet = self.pipeline.latest(CONFIG["pipeline"]["frame_timeout"])
+            stats.lap("frame_wait")
+            if packet is None:
+                if self.pipeline.source_lost:
+                    logger.error("Camera lost, exiting.")
+                    raise SystemExit
+                return
+            frame, result, gated = packet.frame, packet.result, packet.gated
+            # Motion is timed by capture, not by when inference delivered it
+            t = packet.timestamp
+        else:
+            ret, frame = self.buffers.read(self.cap)
+            stats.lap("camera_read")
+            if not ret:
+                logger.warning("Failed to read frame from camera.")
+                return
+
+            frame = self.buffers.mirror(frame)
+            gated = self.gate is not None and not self.gate.check(frame)
+            stats.lap("motion_gate")
+            result = None
+            if not gated:
+                rgb = self.buffers.rgb(frame)
+                stats.lap("preprocess")
+                if self.roi:
+                    result = self.roi.process(self.hands, rgb)
+                else:
+                    result = self.hands.process(rgb)
+                stats.lap("hands_process")
+            t = self.clock()
+
+        # Skipped frames reuse the last landmarks for drawing and tracking
+        if gated:
+            result = self._last_result
+        else:
+            self._last_result = result
 
         w, h = frame.shape[1], frame.shape[0]
+        if (w, h) != self.piano.frame_dim:
+            moved = self.piano.update_layout((w, h))
+            logger.info(f"Frame size changed to {w}x{h}: {moved} keys moved.")
+        # The display caps its own rate: frames it would not show are not drawn
+        render = (render or settings.calibration_mode) and self.display.due()
 
-        if CONFIG["calibration_mode"]:
+        if self.calibrator:
+            # Detection runs on the calibration thread; only a copy is made here
+            self.calibrator.submit(frame)
+            calibration = self.calibrator.poll()
+            if calibration:
+                self.piano.apply_calibration(calibration.quads, calibration.label_map)
+
+        if settings.calibration_mode:
             self.handle_calibration(frame, result)
-        elif not CONFIG["playback_mode"]:  # Disable interactions during playback
+        elif not settings.playback_mode:  # Disable interactions during playback
             multi_hand_landmarks = getattr(result, "multi_hand_landmarks", None)
             if multi_hand_landmarks:
-                for idx, hand_landmarks in enumerate(multi_hand_landmarks):
-                    lm = hand_landmarks.landmark[8]  # Index finger tip
-                    x, y = int(lm.x * w), int(lm.y * h)
-                    t = asyncio.get_event_loop().time()
-                    # Compute vertical velocity
-                    vel = 0.0
-                    if idx in self.prev_positions:
-                        _, py, pt = self.prev_positions[idx]
-                        dt = t - pt
-                        vel = (y - py) / dt if dt > 0 else 0.0
-                    self.prev_positions[idx] = (x, y, t)
-
-                    # Process interaction for this hand
-                    if hasattr(self.piano, "interact") and self.recorder:
-                        self.piano.interact((x, y), vel, self.recorder)
-
-                    # Draw hand landmarks
-                    draw_landmarks(frame, hand_landmarks, list(HAND_CONNECTIONS))
+                hand_arrays = [
+                    landmarks_to_array(hand) for hand in multi_hand_landmarks
+                ]
+                if gated:
+                    # Nothing moved over the keyboard: hold the tracks, no hits
+                    self.tracker.coast(t)
+                else:
+                    handedness = getattr(result, "multi_handedness", None) or []
+                    tips = CONFIG["tracking"]["fingertips"]
+                    detections = []
+                    for idx, hand in enumerate(hand_arrays):
+                        label = (
+                            handedness[idx].classification[0].label
+                            if idx < len(handedness)
+                            else None
+                        )
+                        detections.append((label, fingertips(hand, w, h, tips)))
+                    # Stable ids, filtered fingertip positions and vertical velocities
+                    hands = self.tracker.update(detections, t)
+                    points = np.concatenate([hand.positions for hand in hands])
+                    velocities = np.concatenate(
+                        [hand.velocities[:, 1] for hand in hands]
+                    )
+                    predicted = None
+                    if CONFIG["tracking"]["predictive_onset"]:
+                        predicted = np.concatenate(
+                            [hand.predict(hand.frame_interval) for hand in hands]
+                        )
 
+                    # Process interaction for all hands in one batch
+                    if self.recorder:
+                        self.piano.interact_many(
+                            points,
+                            velocities,
+                            self.recorder,
+                            t,
+                            predicted,
+                            settings.sensitivity,
+                        )
+                stats.lap("interact")
+
+                # Draw hand landmarks
+                if render:
+                    draw_skeleton(frame, hand_arrays)
+                    stats.lap("draw_skeleton")
+
+        if render:
+            self.render(frame, settings)
+        else:
+            stats.lap("render_skipped")
+
+        # Check for keys
+        key = self.display.poll_key()
+        stats.lap("imshow_waitkey")
+        if self.governor and not self.pipeline:
+            # Sequential: the whole frame has to fit the budget
+            self.governor.observe(time.perf_counter() - frame_start)
+        if settings.calibration_mode and key in (ord("c"), ord("n")):
+            self.handle_calibration_key(key)
+        elif key == ord("q"):
+            logger.info("Exit requested by user.")
+            raise SystemExit
+        elif key == ord("r"):
+            self.store.update(calibration_mode=True)
+            self.calibration_key = 0
+            logger.info("Calibration mode activated.")
+        elif key == ord("a"):
+            if self.calibrator:
+                self.calibrator.start()
+        elif key == ord("g"):
+            if self.recorder:
+                if settings.recording_mode:
+                    self.recorder.stop_recording()
+                else:
+                    self.recorder.start_recording()
+        elif key == ord("p"):
+            if self.recorder:
+                if settings.playback_mode:
+                    self.recorder.stop_playback()
+                else:
+                    self.recorder.start_playback(self.piano.keys_dict)
+        elif key == ord("h"):
+            stats.hud = not stats.hud
+        elif key == ord("s"):
+            settings_thread = threading.Thread(target=self.run_settings_menu)
+            settings_thread.start()
+
+    def render(self, frame: np.ndarray, settings: ConfigSnapshot) -> None:
+        """Draw the keyboard and status overlays and show the frame."""
+        stats = self.instrumentation
         if hasattr(self.piano, "draw"):
-            self.piano.draw(frame)
-        if CONFIG["calibration_mode"]:
+            self.piano.draw(frame, self.clock())
+        stats.lap("piano_draw")
+        if settings.calibration_mode:
             cv2.putText(
                 frame,
                 "Calibration Mode: Press 'c' to confirm, 'n' for next key",
@@ -115,7 +407,7 @@ class VirtualPiano:
                 (0, 255, 0),
                 2,
             )
-        if CONFIG["recording_mode"]:
+        if settings.recording_mode:
             cv2.putText(
                 frame,
                 "Recording...",
@@ -125,7 +417,7 @@ class VirtualPiano:
                 (255, 0, 0),
                 2,
             )
-        if CONFIG["playback_mode"]:
+        if settings.playback_mode:
             cv2.putText(
                 frame,
                 "Playing back...",
@@ -135,36 +427,22 @@ class VirtualPiano:
                 (0, 255, 0),
                 2,
             )
-        cv2.imshow("Virtual Piano", frame)
+        stats.draw_hud(frame)
+        self.display.show(frame)
 
-        # Check for keys
-        key = cv2.waitKey(1) & 0xFF
-        if key == ord("q"):
-            logger.info("Exit requested by user.")
-            raise SystemExit
-        elif key == ord("r"):
-            CONFIG["calibration_mode"] = True
-            self.calibration_key = 0
-            logger.info("Calibration mode activated.")
-        elif key == ord("g"):
-            if self.recorder:
-                if CONFIG["recording_mode"]:
-                    self.recorder.stop_recording()
-                else:
-                    self.recorder.start_recording()
-        elif key == ord("p"):
-            if self.recorder:
-                if CONFIG["playback_mode"]:
-                    self.recorder.stop_playback()
-                else:
-                    self.recorder.start_playback(self.piano.keys_dict)
-        elif key == ord("s"):
-            if self.settings:
-                settings_thread = threading.Thread(target=self.run_settings_menu)
-                settings_thread.start()
+    def apply_settings(self, settings: ConfigSnapshot) -> None:
+        """Push changed runtime settings into the components that cache them."""
+        if self.engine:
+            # Master gain of the mixer, so it applies to every sound at once
+            self.engine.volume = settings.volume
 
     def run_settings_menu(self) -> None:
         """Executa o menu de configurações em uma thread separada."""
+        if self.settings is None:
+            # pygame's display is only needed once the menu is opened
+            from playground.settings import SettingsMenu
+
+            self.settings = SettingsMenu()
         if self.settings:
             self.settings.init()
             while self.settings.run():
@@ -172,14 +450,16 @@ class VirtualPiano:
             self.settings.cleanup()
 
     def handle_calibration(self, frame: np.ndarray, result: Optional[object]) -> None:
-        """Handle key position calibration."""
-        if self.calibration_key is None or self.calibration_key >= len(CONFIG["keys"]):
-            CONFIG["calibration_mode"] = False
+        """Draw the manual calibration guide for the current key."""
+        if self.calibration_key is None or self.calibration_key >= len(
+            self.key_configs
+        ):
+            self.store.update(calibration_mode=False)
             logger.info("Calibration completed or no keys to calibrate.")
             return
 
         w, h = frame.shape[1], frame.shape[0]
-        key_config = CONFIG["keys"][self.calibration_key]
+        key_config = self.key_configs[self.calibration_key]
         cv2.putText(
             frame,
             f"Calibrating {key_config['name']}: Move hand to top-left corner",
@@ -196,41 +476,104 @@ class VirtualPiano:
             lm = hand_landmarks.landmark[8]  # Index finger tip
             x, y = int(lm.x * w), int(lm.y * h)
 
+            self.calibration_tip = (x, y)
             if self.calibration_start_pos is None:
                 self.calibration_start_pos = (x, y)
             else:
                 cv2.rectangle(frame, self.calibration_start_pos, (x, y), (0, 255, 0), 2)
+        else:
+            self.calibration_tip = None
+        self.calibration_frame_size = (w, h)
 
-        key = cv2.waitKey(1) & 0xFF
+    def handle_calibration_key(self, key: int) -> None:
+        """Confirm ('c') or skip ('n') the key being calibrated by hand."""
+        if self.calibration_key >= len(self.key_configs):
+            return
+        key_config = self.key_configs[self.calibration_key]
         if key == ord("c") and self.calibration_start_pos is not None:
+            w, h = self.calibration_frame_size
             x, y = self.calibration_start_pos
             key_config["pos"] = (x / w, y / h)
             # Update size based on rectangle drawn
-            curr_x, curr_y = x, y
-            if multi_hand_landmarks:
-                lm = multi_hand_landmarks[0].landmark[8]
-                curr_x, curr_y = int(lm.x * w), int(lm.y * h)
+            curr_x, curr_y = self.calibration_tip or (x, y)
             key_config["size"] = (abs(curr_x - x), abs(curr_y - y))
+            # Applied right away: only this key's rect and overlay are redone
+            self.piano.update_layout(indices=[self.calibration_key])
             self.calibration_key += 1
             self.calibration_start_pos = None
-            if self.calibration_key >= len(CONFIG["keys"]):
-                CONFIG["calibration_mode"] = False
+            if self.calibration_key >= len(self.key_configs):
+                self.store.update(calibration_mode=False)
                 logger.info("Calibration completed.")
         elif key == ord("n"):
             self.calibration_key += 1
             self.calibration_start_pos = None
-            if self.calibration_key >= len(CONFIG["keys"]):
-                CONFIG["calibration_mode"] = False
+            if self.calibration_key >= len(self.key_configs):
+                self.store.update(calibration_mode=False)
                 logger.info("Calibration completed.")
 
     def cleanup(self) -> None:
         """Release resources."""
+        if self._unsubscribe:
+            self._unsubscribe()
         if self.recorder:
             self.recorder.stop_playback()
+            self.recorder.stop_recording()
+        if self.calibrator:
+            self.calibrator.close()
+        if self.gate:
+            logger.info(
+                f"Motion gate skipped inference on {self.gate.frames_skipped} "
+                f"of {self.gate.frames_checked} frames."
+            )
+        if self.pipeline:
+            self.pipeline.stop()
+        if self.governor:
+            logger.info(f"Quality governor: {self.governor.report()}")
+        if self.note_output:
+            self.note_output.close()
+        if self.inference:
+            self.inference.close()
+        if self.pool and self._owns_pool:
+            self.pool.close()
         if self.cap:
             self.cap.release()
-        cv2.destroyAllWindows()
+        self.display.close()
         if self.hands:
             self.hands.close()
-        mixer.quit()
+        if self.engine and self._owns_engine:
+            stats = self.engine.latency_stats()
+            if stats:
+                logger.info(f"Hit-to-output latency: {stats}")
+            self.engine.stop()
+        export_path = CONFIG["instrumentation"]["export_path"]
+        if CONFIG["instrumentation"]["enabled"] and export_path:
+            try:
+                self.instrumentation.export(export_path)
+            except OSError as e:
+                logger.error(f"Failed to export instrumentation stats: {e}")
         logger.info("Resources cleaned up.")
+
+
+def create_engine(
+    instrumentation: Optional[Instrumentation] = None,
+    sound_bank: Optional[SoundBank] = None,
+) -> AudioEngine:
+    """Build the audio engine (and its sample bank, if not given) from ``CONFIG``."""
+    audio_config = CONFIG["audio"]
+    return AudioEngine(
+        sound_bank or SoundBank.from_config(CONFIG),
+        voices=audio_config["voices"],
+        buffer_size=audio_config["buffer_size"],
+        steal=audio_config["steal"],
+        volume=STORE.snapshot.volume,
+        instrumentation=instrumentation,
+    )
+
+
+def load_hands(hands_kwargs: dict) -> Any:
+    """Create MediaPipe Hands and run one inference to build its graph."""
+    from mediapipe.python.solutions.hands import Hands
+
+    hands = Hands(**hands_kwargs)
+    hands.process(np.zeros((240, 320, 3), dtype=np.uint8))
+    return hands
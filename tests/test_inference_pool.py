@@ -0,0 +1,82 @@
+import os
+import queue
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from playground.inference_pool import InferenceClient, InferencePool, _worker
+
+SHAPE = (8, 8, 3)
+
+
+class NoHands:
+    """Finds no hands; exits the worker on an all-white frame."""
+
+    def process(self, rgb: np.ndarray):
+        if rgb.min() == 255:
+            time.sleep(0.2)  # let the previous reply go out first
+            os._exit(1)
+        return SimpleNamespace(multi_hand_landmarks=None)
+
+
+def collect(client: InferenceClient, count: int, timeout: float = 10.0) -> list:
+    replies = []
+    deadline = time.monotonic() + timeout
+    while len(replies) < count and time.monotonic() < deadline:
+        replies += client.results(0.05)
+    return replies
+
+
+def test_worker_replies_when_the_frame_ring_is_gone():
+    tasks, replies = queue.Queue(), queue.Queue()
+    tasks.put((0, "no-such-ring", SHAPE, 1, 7, 0, None, 0))
+    tasks.put(None)
+    _worker(tasks, replies, NoHands, {})
+    assert replies.get_nowait() == (None, None)
+    assert replies.get_nowait() == (0, (7, 0, None, [], 0.0))
+
+
+def test_client_skips_a_lost_reply_and_ignores_it_later():
+    pool = SimpleNamespace(_tasks=queue.Queue(), _clients={})
+    client = InferenceClient(pool, 0, SHAPE, slots=3, reply_timeout=0.1)
+    try:
+        for seq in (1, 2, 3):
+            client.submit(seq, client.acquire())
+        client._replies.put((2, 1, None, [], 0.01))
+        client._replies.put((3, 0, None, [], 0.01))
+        assert client.results(0.01) == []
+        time.sleep(0.15)
+        assert [reply[0] for reply in client.results(0.01)] == [1, 2, 3]
+        assert client.in_flight == 0
+        assert client.replies_lost == 1
+        # The reply for the skipped frame turns up after all
+        client._replies.put((1, 2, None, [], 0.01))
+        assert client.results(0.01) == []
+    finally:
+        client.close()
+
+
+def test_pool_restarts_a_dead_worker_and_keeps_frames_flowing():
+    pool = InferencePool(workers=1, hands_factory=NoHands, reply_timeout=0.5)
+    try:
+        assert pool.wait_ready(30.0)
+        client = pool.client(SHAPE)
+
+        def submit(seq: int, value: int) -> None:
+            slot = client.acquire()
+            client.frame(slot)[:] = value
+            client.submit(seq, slot)
+
+        submit(1, 0)
+        submit(2, 255)  # the worker dies on this one
+        assert [reply[0] for reply in collect(client, 2)] == [1, 2]
+        assert client.replies_lost == 1
+        with pool._ready_cond:
+            assert pool._ready_cond.wait_for(lambda: pool._ready == 2, 30.0)
+        submit(3, 0)
+        submit(4, 0)
+        assert [reply[0] for reply in collect(client, 2)] == [3, 4]
+        assert client.replies_lost == 1
+    finally:
+        pool.close()
@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+
+from playground.auto_calibration import label_map
+from playground.key_layout import KeyLayout
+
+THRESHOLD = 1.0
+FAST = np.array([5.0])
+
+# Two white keys side by side with a black key over their shared edge
+KEY_TYPES = ["white", "white", "black"]
+RECTS = [((0, 0), (40, 100)), ((40, 0), (40, 100)), ((30, 0), (20, 60))]
+
+
+@pytest.fixture(autouse=True, params=["loop", "numpy"])
+def hit_path(request, monkeypatch):
+    """Run every test on both the small-layout loop and the numpy path."""
+    if request.param == "numpy":
+        monkeypatch.setattr(KeyLayout, "SMALL_LAYOUT", 0)
+    return request.param
+
+
+def make_layout(cooldown: float = 0.5) -> KeyLayout:
+    layout = KeyLayout()
+    for (pos, size), key_type in zip(RECTS, KEY_TYPES, strict=True):
+        layout.add(pos, size, key_type, cooldown)
+    return layout
+
+
+def calibrate(layout: KeyLayout) -> None:
+    quads = layout.quads[: layout.count].copy()
+    layout.set_quads(quads, label_map(quads, KEY_TYPES, (120, 100)))
+
+
+def hit(layout: KeyLayout, point, current_time: float):
+    return layout.hit_test(np.array([point]), FAST, current_time, THRESHOLD)
+
+
+def test_label_map_black_key_in_cooldown_falls_through_to_white():
+    layout = make_layout()
+    calibrate(layout)
+    assert hit(layout, (35, 30), 1.0) == [(0, 2)]
+    # The black key is cooling down, so the white key underneath takes it
+    assert hit(layout, (35, 30), 1.1) == [(0, 0)]
+
+
+def test_label_map_matches_rect_hits():
+    rect_layout = make_layout()
+    quad_layout = make_layout()
+    calibrate(quad_layout)
+    for i, point in enumerate([(35, 30), (35, 30), (10, 80), (45, 70), (90, 110)]):
+        current_time = 1.0 + 0.1 * i
+        assert hit(quad_layout, point, current_time) == hit(
+            rect_layout, point, current_time
+        )
+
+
+def test_manual_edit_after_calibration_keeps_other_keys_calibrated():
+    layout = make_layout(cooldown=0.0)
+    # Calibrate with the black key seen at a slant
+    quads = layout.quads[: layout.count].copy()
+    quads[2] = ((20, 0), (38, 0), (48, 60), (30, 60))
+    layout.set_quads(quads, label_map(quads, KEY_TYPES, (120, 100)))
+
+    # Move the first white key by hand
+    layout.set_rect(0, (0, 0), (30, 100))
+    assert layout.warped[: layout.count].tolist() == [False, True, True]
+    # Still calibrated: the black key's bounding box is not used
+    assert hit(layout, (44, 10), 1.0) == [(0, 1)]
+    assert hit(layout, (30, 30), 2.0) == [(0, 2)]
+    # The edited key hits on its new rect and no longer past it
+    assert hit(layout, (10, 80), 3.0) == [(0, 0)]
+    assert hit(layout, (35, 80), 4.0) == []
+
+
+def test_editing_every_key_drops_the_calibration():
+    layout = make_layout()
+    calibrate(layout)
+    for index, (pos, size) in enumerate(RECTS):
+        layout.set_rect(index, pos, size)
+    assert layout.label_map is None
+
+
+def test_black_key_wins_over_white_key():
+    layout = make_layout()
+    assert hit(layout, (35, 30), 1.0) == [(0, 2)]
+    # Below the black key only the white key is there
+    assert hit(layout, (35, 80), 1.0) == [(0, 0)]
+
+
+def test_earlier_key_wins_between_keys_of_the_same_priority():
+    layout = make_layout()
+    # On the shared edge of the two white keys, below the black key
+    assert hit(layout, (40, 80), 1.0) == [(0, 0)]
+
+
+def test_slow_points_hit_nothing():
+    layout = make_layout()
+    hits = layout.hit_test(np.array([(10, 80)]), np.array([0.5]), 1.0, THRESHOLD)
+    assert hits == []
+    assert layout.last_hit[0] == 0.0
+
+
+def test_key_in_cooldown_is_not_hit_again():
+    layout = make_layout(cooldown=0.5)
+    assert hit(layout, (10, 80), 1.0) == [(0, 0)]
+    assert hit(layout, (10, 80), 1.3) == []
+    assert hit(layout, (10, 80), 1.6) == [(0, 0)]
+
+
+def test_key_wanted_by_several_points_is_hit_once_by_the_first():
+    layout = make_layout()
+    points = np.array([(60, 80), (10, 80), (20, 90), (35, 30)])
+    hits = layout.hit_test(points, np.full(4, 5.0), 1.0, THRESHOLD)
+    # Point 2 loses key 0 to point 1 and hits nothing else
+    assert hits == [(0, 1), (1, 0), (3, 2)]
+
+
+def test_loop_and_numpy_paths_agree():
+    rng = np.random.default_rng(0)
+    layouts = [KeyLayout(), KeyLayout()]
+    for layout in layouts:
+        for i in range(12):
+            black = i % 3 == 1
+            pos = (20 * i - (5 if black else 0), 0)
+            size = (12, 60) if black else (20, 100)
+            layout.add(pos, size, "black" if black else "white", 0.3)
+    layouts[0].SMALL_LAYOUT, layouts[1].SMALL_LAYOUT = 16, 0
+    hits = 0
+    for step in range(300):
+        count = int(rng.integers(1, 11))
+        points = rng.uniform((-10, -10), (250, 110), (count, 2))
+        velocities = rng.uniform(0.0, 2.0, count)
+        current_time = 0.1 * step
+        loop, numpy = (
+            layout.hit_test(points, velocities, current_time, THRESHOLD)
+            for layout in layouts
+        )
+        assert loop == numpy
+        hits += len(loop)
+    assert hits > 100
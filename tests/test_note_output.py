@@ -0,0 +1,76 @@
+import socket
+
+import pytest
+
+from playground.note_output import NoteSender, decode_midi, decode_osc
+
+
+@pytest.fixture
+def receiver():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2.0)
+    yield sock
+    sock.close()
+
+
+def sender_to(receiver, protocol: str) -> NoteSender:
+    port = receiver.getsockname()[1]
+    sender = NoteSender(
+        "127.0.0.1", port, protocol, "/piano", channel=3, note_length=0.05
+    )
+    sender.start()
+    return sender
+
+
+def receive(receiver, decode, count: int) -> list:
+    messages = []
+    while len(messages) < count:
+        data, _ = receiver.recvfrom(65536)
+        messages += decode(data)
+    return messages
+
+
+def test_osc_note_on_and_off_over_loopback(receiver):
+    sender = sender_to(receiver, "osc")
+    try:
+        sender.note_on("C4", 0.5)
+        sender.note_on("E4", 1.0)
+        messages = receive(receiver, decode_osc, 4)
+    finally:
+        sender.close()
+    assert messages[:2] == [
+        ("/piano/note_on", [60, 64]),
+        ("/piano/note_on", [64, 127]),
+    ]
+    assert sorted(messages[2:]) == [
+        ("/piano/note_off", [60, 0]),
+        ("/piano/note_off", [64, 0]),
+    ]
+
+
+def test_midi_note_on_and_off_over_loopback(receiver):
+    sender = sender_to(receiver, "midi")
+    try:
+        sender.note_on("A4", 0.1)
+        messages = receive(receiver, decode_midi, 2)
+    finally:
+        sender.close()
+    assert messages == [("note_on", 3, 69, 13), ("note_off", 3, 69, 0)]
+
+
+def test_restruck_note_is_turned_off_first(receiver):
+    sender = sender_to(receiver, "midi")
+    sender.note_length = 1.0
+    try:
+        sender.note_on("C4", 1.0)
+        assert receive(receiver, decode_midi, 1) == [("note_on", 3, 60, 127)]
+        sender.note_on("C4", 0.5)
+        assert receive(receiver, decode_midi, 2) == [
+            ("note_off", 3, 60, 0),
+            ("note_on", 3, 60, 64),
+        ]
+    finally:
+        sender.close()
+    # close() turns off the note still sounding
+    assert receive(receiver, decode_midi, 1) == [("note_off", 3, 60, 0)]
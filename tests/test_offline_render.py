@@ -0,0 +1,51 @@
+import wave
+
+import numpy as np
+
+from playground.offline_render import render_wav
+from playground.recording_file import RecordingReader, RecordingWriter
+from playground.sound_bank import SoundBank
+
+
+def write_wav(path, frames: int, rate: int = 44100) -> str:
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(np.full((frames, 2), 8192, dtype=np.int16).tobytes())
+    return str(path)
+
+
+def test_frames_matches_the_decoded_buffer(tmp_path):
+    bank = SoundBank(max_bytes=1 << 20)
+    bank.register("C4", write_wav(tmp_path / "c4.wav", 1000))
+    bank.register("G4", write_wav(tmp_path / "g4.wav", 999, rate=22050))
+    for note in ("C4", "D4", "G4", "A4", "C3"):
+        assert bank.frames(note) == len(bank.buffer(note))
+
+
+def test_render_decodes_notes_only_to_mix_them(tmp_path, monkeypatch):
+    bank = SoundBank(max_bytes=1)  # keeps only the last buffer
+    bank.register("C4", write_wav(tmp_path / "c4.wav", 4410))
+    writer = RecordingWriter(str(tmp_path / "take.vprec"))
+    for i, note in enumerate([60, 62, 60, 62, 64]):
+        writer.write(note, 0.05 * i, 127)
+    writer.close()
+
+    decoded = []
+    samples = bank.samples
+    monkeypatch.setattr(
+        bank, "samples", lambda note: decoded.append(note) or samples(note)
+    )
+    report = render_wav(
+        RecordingReader(str(tmp_path / "take.vprec")),
+        bank,
+        str(tmp_path / "take.wav"),
+        chunk_frames=1024,
+    )
+    assert decoded == ["C4", "D4", "C4", "D4", "E4"]
+    with wave.open(str(tmp_path / "take.wav"), "rb") as f:
+        frames = f.getnframes()
+    # The C4 at 0.1 s is longer, but the E4 at 0.2 s ends last
+    assert frames == round(0.2 * 44100) + bank.frames("E4")
+    assert report["notes"] == 5
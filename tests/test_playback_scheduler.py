@@ -0,0 +1,26 @@
+import time
+
+from playground.playback_scheduler import PlaybackScheduler
+from playground.recording_file import RecordingReader, RecordingWriter
+
+
+def record(path, events) -> RecordingReader:
+    writer = RecordingWriter(str(path))
+    for timestamp, note, velocity in events:
+        writer.write(note, timestamp, velocity)
+    writer.close()
+    return RecordingReader(str(path))
+
+
+def test_looping_a_single_chord_waits_for_the_loop_gap(tmp_path):
+    reader = record(tmp_path / "chord.vprec", [(0.0, 60, 100), (0.0, 64, 100)])
+    played = []
+    scheduler = PlaybackScheduler(
+        reader, lambda *event: played.append(event), loop=True, loop_gap=0.1
+    )
+    scheduler.start()
+    time.sleep(0.25)
+    scheduler.stop()
+    # Passes at 0, 0.1 and 0.2 s
+    assert 4 <= len(played) <= 8
+    assert [note for note, _, _ in played[:2]] == [60, 64]
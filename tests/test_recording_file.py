@@ -0,0 +1,77 @@
+import struct
+import threading
+
+import pytest
+
+from playground.recording_file import (
+    HEADER,
+    RecordingReader,
+    RecordingWriter,
+    export_midi,
+)
+
+EVENTS = [(0.0, 60, 100), (0.25, 64, 90), (0.5, 60, 127)]
+
+
+def write(path, events=EVENTS) -> str:
+    with RecordingWriter(str(path), flush_interval=0.01) as writer:
+        for timestamp, note, velocity in events:
+            writer.write(note, timestamp, velocity)
+    return str(path)
+
+
+def test_recording_round_trip(tmp_path):
+    reader = RecordingReader(write(tmp_path / "take.vprec"))
+    assert len(reader) == 3
+    assert list(reader) == EVENTS
+    assert reader.duration == 0.5
+
+
+def test_empty_recording(tmp_path):
+    reader = RecordingReader(write(tmp_path / "empty.vprec", []))
+    assert len(reader) == 0
+    assert reader.duration == 0.0
+
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / "other.vprec"
+    path.write_bytes(b"RIFF" + bytes(HEADER.size))
+    with pytest.raises(ValueError):
+        RecordingReader(str(path))
+
+
+def test_writer_closes_its_file_if_it_cannot_start(tmp_path, monkeypatch):
+    opened = []
+
+    def tracked_open(*args):
+        opened.append(open(*args))  # noqa: SIM115 - the writer closes it
+        return opened[-1]
+
+    def fail(self):
+        raise RuntimeError("no threads")
+
+    monkeypatch.setattr("playground.recording_file.open", tracked_open, raising=False)
+    monkeypatch.setattr(threading.Thread, "start", fail)
+    with pytest.raises(RuntimeError):
+        RecordingWriter(str(tmp_path / "take.vprec"))
+    assert opened[0].closed
+
+
+def test_midi_export_header_and_track(tmp_path):
+    reader = RecordingReader(write(tmp_path / "take.vprec"))
+    midi_path = tmp_path / "take.mid"
+    export_midi(reader, str(midi_path), note_length=0.1, ticks_per_beat=480)
+    data = midi_path.read_bytes()
+
+    assert data[:4] == b"MThd"
+    assert struct.unpack(">IHHH", data[4:14]) == (6, 0, 1, 480)
+    assert data[14:18] == b"MTrk"
+    (track_length,) = struct.unpack(">I", data[18:22])
+    track = data[22:]
+    assert len(track) == track_length
+    assert track.endswith(b"\x00\xff\x2f\x00")
+    # Note-ons with their velocities, in order
+    note_ons = [
+        (track[i + 1], track[i + 2]) for i in range(len(track) - 2) if track[i] == 0x90
+    ]
+    assert note_ons == [(60, 100), (64, 90), (60, 127)]
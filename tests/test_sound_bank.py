@@ -0,0 +1,41 @@
+import wave
+
+import numpy as np
+
+from playground.audio_engine import AudioEngine
+from playground.sound_bank import SoundBank
+
+
+def write_wav(path, frames: int = 4410, value: int = 8192) -> str:
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(44100)
+        f.writeframes(np.full((frames, 2), value, dtype=np.int16).tobytes())
+    return str(path)
+
+
+def test_preloaded_buffers_survive_eviction(tmp_path):
+    bank = SoundBank(max_bytes=1)
+    bank.register("C4", write_wav(tmp_path / "c4.wav"))
+    assert bank.preload(["C4"]) == 1
+    pinned = bank.buffer("C4")
+    for note in ("D4", "E4", "F4"):
+        bank.buffer(note)  # pitch-shifted, each one evicts the last
+    assert bank.buffer("C4") is pinned
+
+
+def test_note_on_does_not_decode_a_preloaded_note(tmp_path, monkeypatch):
+    bank = SoundBank(max_bytes=1)
+    bank.register("C4", write_wav(tmp_path / "c4.wav"))
+    bank.preload(["C4"])
+    bank.buffer("D4")
+
+    def decode(note):
+        raise AssertionError(f"{note} decoded")
+
+    monkeypatch.setattr(bank, "samples", decode)
+    engine = AudioEngine(bank, voices=2)
+    engine.note_on("C4", 0.5)
+    assert engine.render().any()
+    assert engine.notes_started == 1